@@ -0,0 +1,176 @@
+import atexit
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from pysatochip.JCconstants import JCconstants
+
+from constants import INS_DIC, RES_DIC
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+class ApduTracer:
+    """
+    Opt-in instrumentation of a CardConnector (see --trace-apdu).
+
+    Every APDU sent through CardConnector.card_transmit() and every VERIFY PIN sent by
+    CardConnector.card_verify_PIN_simple() is recorded with its INS, payload size, status word and wall time,
+    and appended as a json line to the trace file. When card_transmit() verifies the PIN again after a 9C06
+    status word, the VERIFY PIN is recorded on its own and its time is not counted in the triggering command.
+    Per-INS latency histograms are written at the end of the trace when the tracer is closed.
+    Note: other APDUs sent directly on the connection by pysatochip (applet selection, secure channel
+    initialization) are not traced.
+    """
+
+    # upper bounds of the histogram buckets, in milliseconds (last bucket is unbounded)
+    BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self, path: str, loglevel=logging.DEBUG):
+        logger.setLevel(loglevel)
+        self.path = path
+        self.lock = threading.Lock()
+        self.histograms: Dict[int, Dict[str, Any]] = {}
+        # time spent in VERIFY PIN during the current card_transmit() call of each thread
+        self._local = threading.local()
+        self._file = open(path, 'a', encoding='utf-8')
+        self._closed = False
+        self._write({'type': 'start', 'time': time.time()})
+        atexit.register(self.close)
+        logger.info(f"APDU trace enabled, writing to {path}")
+
+    def attach(self, cc):
+        """Wrap cc.card_transmit and cc.card_verify_PIN_simple so that each call is recorded
+        (card_transmit() calls card_verify_PIN_simple() through the instance, so both wrappers are used)"""
+        card_transmit = cc.card_transmit
+        card_verify_pin = cc.card_verify_PIN_simple
+
+        def traced_card_transmit(plain_apdu):
+            self._local.verify_pin_time = 0.0
+            start = time.perf_counter()
+            try:
+                response, sw1, sw2 = card_transmit(plain_apdu)
+            except Exception as ex:
+                self.record(plain_apdu, None, None, self._get_transmit_time(start), error=type(ex).__name__)
+                raise
+            self.record(plain_apdu, response, (sw1 << 8) | sw2, self._get_transmit_time(start))
+            return response, sw1, sw2
+
+        def traced_card_verify_pin(pin=None):
+            # the PIN is not recorded, only its size
+            if pin is None:
+                pin_size = len(cc.pin) if cc.pin is not None else 0
+            else:
+                pin_size = len(pin.encode('utf-8') if isinstance(pin, str) else pin)
+            apdu = [JCconstants.CardEdge_CLA, JCconstants.INS_VERIFY_PIN, 0x00, 0x00]
+            start = time.perf_counter()
+            try:
+                response, sw1, sw2 = card_verify_pin(pin)
+            except Exception as ex:
+                self.record(apdu, None, None, self._add_verify_pin_time(start), error=type(ex).__name__,
+                            lc=pin_size)
+                raise
+            self.record(apdu, response, (sw1 << 8) | sw2, self._add_verify_pin_time(start), lc=pin_size)
+            return response, sw1, sw2
+
+        cc.card_transmit = traced_card_transmit
+        cc.card_verify_PIN_simple = traced_card_verify_pin
+        return cc
+
+    def _get_transmit_time(self, start: float) -> float:
+        duration = time.perf_counter() - start - self._local.verify_pin_time
+        self._local.verify_pin_time = None
+        return duration
+
+    def _add_verify_pin_time(self, start: float) -> float:
+        duration = time.perf_counter() - start
+        if getattr(self._local, 'verify_pin_time', None) is not None:
+            # sent by card_transmit() after 9C06
+            self._local.verify_pin_time += duration
+        return duration
+
+    def record(self, apdu: List[int], response: Optional[List[int]], sw: Optional[int], duration: float,
+               error: Optional[str] = None, lc: Optional[int] = None):
+        """lc is the payload size, computed from apdu by default"""
+        ins = apdu[1]
+        if lc is None:
+            lc = len(apdu) - 5 if len(apdu) > 5 else 0
+        duration_ms = duration * 1000
+        entry = {
+            'type': 'apdu',
+            'time': time.time(),
+            'ins': f"0x{ins:02X}",
+            'ins_name': INS_DIC.get(ins, ""),
+            'p1': apdu[2],
+            'p2': apdu[3],
+            'lc': lc,
+            'response_size': len(response) if response is not None else 0,
+            'sw': f"{sw:04X}" if sw is not None else None,
+            'sw_name': RES_DIC.get(sw, "") if sw is not None else "",
+            'ms': round(duration_ms, 3),
+        }
+        if error is not None:
+            entry['error'] = error
+
+        with self.lock:
+            histogram = self.histograms.get(ins)
+            if histogram is None:
+                histogram = {
+                    'count': 0, 'total_ms': 0.0, 'min_ms': duration_ms, 'max_ms': duration_ms,
+                    'buckets': [0] * (len(self.BUCKETS_MS) + 1),
+                }
+                self.histograms[ins] = histogram
+            histogram['count'] += 1
+            histogram['total_ms'] += duration_ms
+            histogram['min_ms'] = min(histogram['min_ms'], duration_ms)
+            histogram['max_ms'] = max(histogram['max_ms'], duration_ms)
+            histogram['buckets'][self._bucket_index(duration_ms)] += 1
+            self._write(entry)
+
+    def _bucket_index(self, duration_ms: float) -> int:
+        for index, bound in enumerate(self.BUCKETS_MS):
+            if duration_ms <= bound:
+                return index
+        return len(self.BUCKETS_MS)
+
+    def _write(self, entry: Dict[str, Any]):
+        if self._closed:
+            return
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def get_summary(self) -> List[Dict[str, Any]]:
+        """Per-INS latency histograms, sorted by total time spent"""
+        summary = []
+        with self.lock:
+            for ins, histogram in self.histograms.items():
+                summary.append({
+                    'type': 'histogram',
+                    'ins': f"0x{ins:02X}",
+                    'ins_name': INS_DIC.get(ins, ""),
+                    'count': histogram['count'],
+                    'total_ms': round(histogram['total_ms'], 3),
+                    'mean_ms': round(histogram['total_ms'] / histogram['count'], 3),
+                    'min_ms': round(histogram['min_ms'], 3),
+                    'max_ms': round(histogram['max_ms'], 3),
+                    'bucket_bounds_ms': list(self.BUCKETS_MS),
+                    'buckets': list(histogram['buckets']),
+                })
+        summary.sort(key=lambda h: h['total_ms'], reverse=True)
+        return summary
+
+    def close(self):
+        if self._closed:
+            return
+        summary = self.get_summary()
+        with self.lock:
+            for histogram in summary:
+                self._write(histogram)
+                logger.info(f"APDU {histogram['ins']} {histogram['ins_name']}: {histogram['count']} calls, "
+                            f"mean {histogram['mean_ms']}ms, max {histogram['max_ms']}ms")
+            self._write({'type': 'end', 'time': time.time()})
+            self._closed = True
+            self._file.close()
@@ -0,0 +1,278 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import OpenSSL
+import pysatochip
+from pysatochip import certificate_validator
+from pysatochip.CardConnector import CardError, CardNotPresentError, UnexpectedSW12Error
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+# same certificates as pysatochip.certificate_validator.CertificateValidator
+CERT_DIR = os.path.join(os.path.dirname(pysatochip.__file__), "cert")
+SUBCA_FILES = {
+    "SeedKeeper": "subca-seedkeeper.cert",
+    "Satochip": "subca-satochip.cert",
+    "Satodime": "subca-satodime.cert",
+}
+# pysatochip only falls back to the test CA if USE_TEST_CA is set (currently hardcoded to True in
+# CertificateValidator.validate_certificate_chain(), read from the module if it is ever exposed there)
+USE_TEST_CA = getattr(certificate_validator, "USE_TEST_CA", True)
+
+
+class CertificateChains:
+    """
+    CA and sub-CA certificates, parsed and validated once per process.
+    For each card type, holds an X509Store containing the root CA and the sub-CA,
+    ready to validate device certificates.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "CertificateChains":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = CertificateChains()
+            return cls._instance
+
+    def __init__(self, cert_dir: str = CERT_DIR):
+        self.cert_dir = cert_dir
+        self.lock = threading.Lock()
+        # (card_type, use_test) => (store, txt_ca, txt_subca, txt_error)
+        self._chains: Dict[Tuple[str, bool], Tuple[Any, str, str, str]] = {}
+
+    def _load_pem(self, filename: str):
+        with open(os.path.join(self.cert_dir, filename), 'r', encoding='utf-8') as f:
+            pem = f.read()
+        parsed = OpenSSL.crypto.load_certificate(OpenSSL.crypto.FILETYPE_PEM, pem)
+        txt = OpenSSL.crypto.dump_certificate(OpenSSL.crypto.FILETYPE_TEXT, parsed).decode("utf-8")
+        return parsed, txt
+
+    def get_chain(self, card_type: str, use_test: bool = False):
+        """Return (store, txt_ca, txt_subca, txt_error), store is None if the chain is not valid"""
+        key = (card_type, use_test)
+        with self.lock:
+            if key in self._chains:
+                return self._chains[key]
+
+            store = None
+            txt_ca = txt_subca = txt_error = ""
+            prefix = "test-" if use_test else ""
+            if card_type not in SUBCA_FILES:
+                txt_error = f"Unknown card_type: {card_type}"
+            else:
+                try:
+                    parsed_ca, txt_ca = self._load_pem(f"{prefix}ca.cert")
+                    parsed_subca, txt_subca = self._load_pem(prefix + SUBCA_FILES[card_type])
+                    store = OpenSSL.crypto.X509Store()
+                    store.add_cert(parsed_ca)
+                    # check the sub-CA before adding it to the store
+                    OpenSSL.crypto.X509StoreContext(store, parsed_subca).verify_certificate()
+                    store.add_cert(parsed_subca)
+                    logger.debug(f"Loaded certificate chain for {card_type} (test: {use_test})")
+                except (OSError, OpenSSL.crypto.Error) as ex:
+                    store = None
+                    txt_error = f"Exception during pem certificates parsing: {ex}"
+                except OpenSSL.crypto.X509StoreContextError as ex:
+                    store = None
+                    txt_error = f"Exception during subca validation: {ex}"
+
+            self._chains[key] = (store, txt_ca, txt_subca, txt_error)
+            return self._chains[key]
+
+    def validate_device_certificate(self, parsed_device, card_type: str, use_test: bool = False):
+        """Return (is_valid, txt_ca, txt_subca, txt_error)"""
+        store, txt_ca, txt_subca, txt_error = self.get_chain(card_type, use_test)
+        if store is None:
+            return False, txt_ca, txt_subca, txt_error
+        try:
+            OpenSSL.crypto.X509StoreContext(store, parsed_device).verify_certificate()
+        except OpenSSL.crypto.X509StoreContextError as ex:
+            return False, txt_ca, txt_subca, f"Exception during device certificate validation: {ex}"
+        return True, txt_ca, txt_subca, ""
+
+
+class AuthenticityCache:
+    """
+    Cache of the cards whose certificate chain was validated, keyed by card id (authentikey, see
+    CardSession.get_card_id()).
+
+    Entries hold the fingerprint (sha256) of the device certificate and the time of the validation, never a verdict
+    or a key. On a hit, the certificate just exported from the card must match the fingerprint: the X509 chain
+    validation is skipped, but the certificate subject is still checked against the card serial number, the device
+    pubkey is read from that certificate and the challenge-response is always performed, so that a certificate only
+    counts if the card holds its private key.
+    Entries are kept for ttl seconds (forever if ttl is None) and saved in a json file if path is set.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, path: Optional[str] = None, loglevel=logging.DEBUG):
+        logger.setLevel(loglevel)
+        self.ttl = ttl
+        self.path = path
+        self.lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = self.misses = 0
+        self._load()
+
+    ####################################################################################################################
+    """ STORE """
+
+    def _load(self):
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            # entries written by older versions (without fingerprint) are dropped
+            self._entries = {
+                card_id: {'fingerprint': str(entry['fingerprint']), 'timestamp': float(entry['timestamp'])}
+                for card_id, entry in entries.items() if 'fingerprint' in entry
+            }
+            logger.debug(f"Loaded {len(self._entries)} authenticity results from {self.path}")
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as ex:
+            logger.warning(f"Failed to load authenticity cache from {self.path}: {ex}")
+            self._entries = {}
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as ex:
+            logger.warning(f"Failed to save authenticity cache to {self.path}: {ex}")
+
+    @staticmethod
+    def get_fingerprint(cert_pem: str) -> str:
+        return hashlib.sha256(cert_pem.encode('utf-8')).hexdigest()
+
+    def lookup(self, card_id: str, fingerprint: str) -> bool:
+        """True if the chain of the certificate with this fingerprint was validated for this card"""
+        with self.lock:
+            entry = self._entries.get(card_id)
+            if entry is None:
+                return False
+            if self.ttl is not None and time.time() - entry['timestamp'] > self.ttl:
+                del self._entries[card_id]
+                return False
+            return entry['fingerprint'] == fingerprint
+
+    def store(self, card_id: str, fingerprint: str):
+        """Record a successful verification"""
+        with self.lock:
+            self._entries[card_id] = {'fingerprint': fingerprint, 'timestamp': time.time()}
+            # purge expired entries before saving
+            if self.ttl is not None:
+                now = time.time()
+                self._entries = {k: v for k, v in self._entries.items() if now - v['timestamp'] <= self.ttl}
+            self._save()
+
+    def clear(self):
+        with self.lock:
+            self._entries = {}
+            self._save()
+
+    ####################################################################################################################
+    """ VERIFICATION """
+
+    def verify_card(self, cc, card_id: str):
+        """Same as CardConnector.card_verify_authenticity(), using cached results and certificate chains.
+        Returns (is_authentic, txt_ca, txt_subca, txt_device, txt_error)"""
+        txt_ca = txt_subca = txt_device = "(empty)"
+        cert_pem = txt_error = ""
+        try:
+            cert_pem = cc.card_export_perso_certificate()
+        except CardError:
+            txt_error = ''.join(["Unable to get device certificate: feature unsupported! \n",
+                                 "Authenticity validation is only available starting with Satochip v0.12 and higher"])
+        except CardNotPresentError:
+            txt_error = "No card found! Please insert card."
+        except UnexpectedSW12Error as ex:
+            txt_error = "Exception during device certificate export: " + str(ex)
+
+        if cert_pem == "(empty)":
+            txt_error = "Device certificate is empty: the card has not been personalized!"
+        if txt_error != "":
+            return False, txt_ca, txt_subca, txt_device, txt_error
+
+        try:
+            parsed_device = OpenSSL.crypto.load_certificate(OpenSSL.crypto.FILETYPE_PEM, cert_pem)
+            txt_device = OpenSSL.crypto.dump_certificate(OpenSSL.crypto.FILETYPE_TEXT, parsed_device).decode("utf-8")
+        except OpenSSL.crypto.Error as ex:
+            return False, txt_ca, txt_subca, txt_device, f"Exception during pem certificates parsing: {ex}"
+
+        fingerprint = self.get_fingerprint(cert_pem)
+        is_cached = self.lookup(card_id, fingerprint)
+        if is_cached:
+            self.hits += 1
+            logger.debug(f"Certificate chain of card {card_id[:16]} already validated "
+                         f"({self.hits} hits, {self.misses} misses)")
+            is_valid_chain, device_pubkey, txt_ca, txt_subca, txt_error = self._get_validated_chain(cc, parsed_device)
+        else:
+            self.misses += 1
+            is_valid_chain, device_pubkey, txt_ca, txt_subca, txt_error = self._validate_chain(cc, parsed_device)
+        if not is_valid_chain:
+            return False, txt_ca, txt_subca, txt_device, txt_error
+
+        # always performed: ensure that the certified key is loaded in the device
+        is_valid_chalresp, txt_error = cc.card_challenge_response_pki(device_pubkey)
+        if not is_valid_chalresp:
+            return False, txt_ca, txt_subca, txt_device, txt_error
+
+        if not is_cached:
+            self.store(card_id, fingerprint)
+        return True, txt_ca, txt_subca, txt_device, txt_error
+
+    @staticmethod
+    def _get_device_pubkey(cc, parsed_device) -> Tuple[Optional[bytes], str]:
+        """Returns (device_pubkey, txt_error), device_pubkey is None if the certificate is not the one of this card"""
+        # check that the certificate subject matches the device serial number
+        subject = dict(parsed_device.get_subject().get_components()).get(b'CN', b'').decode('utf-8')
+        if subject.lower() != cc.UID_SHA1.lower():
+            return None, f"Certificate subject {subject} does not match the card serial number {cc.UID_SHA1}!"
+
+        # extract pubkey from device certificate
+        device_pkey_asn1 = OpenSSL.crypto.dump_publickey(OpenSSL.crypto.FILETYPE_ASN1, parsed_device.get_pubkey())
+        return device_pkey_asn1[-65:], ""
+
+    def _get_validated_chain(self, cc, parsed_device):
+        """Same as _validate_chain() for a certificate whose chain was already validated"""
+        _, txt_ca, txt_subca, _ = CertificateChains.get().get_chain(cc.card_type)
+        device_pubkey, txt_error = self._get_device_pubkey(cc, parsed_device)
+        if device_pubkey is None:
+            return False, b"", txt_ca, txt_subca, txt_error
+        return True, device_pubkey, txt_ca, txt_subca, txt_error
+
+    def _validate_chain(self, cc, parsed_device):
+        """Same as CertificateValidator.validate_certificate_chain() with the cached CertificateChains.
+        Returns (is_valid_chain, device_pubkey, txt_ca, txt_subca, txt_error)"""
+        chains = CertificateChains.get()
+        _, txt_ca, txt_subca, _ = chains.get_chain(cc.card_type)
+
+        device_pubkey, txt_error = self._get_device_pubkey(cc, parsed_device)
+        if device_pubkey is None:
+            return False, b"", txt_ca, txt_subca, txt_error
+
+        # check the certificate chain from root CA to device, then with test CA
+        is_valid, txt_ca, txt_subca, txt_error = chains.validate_device_certificate(parsed_device, cc.card_type)
+        if is_valid:
+            return True, device_pubkey, txt_ca, txt_subca, txt_error
+        logger.warning("Certificate chains NOT VALID for production PKI")
+        if USE_TEST_CA:
+            is_valid_test, txt_ca_test, txt_subca_test, _ = chains.validate_device_certificate(
+                parsed_device, cc.card_type, use_test=True)
+            if is_valid_test:
+                txt_error = "WARNING: Chain certificate validated with TEST CA! NOT FOR PRODUCTION!"
+                return False, device_pubkey, txt_ca_test, txt_subca_test, txt_error
+        return False, device_pubkey, txt_ca, txt_subca, txt_error
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks of secretCodec against the previous decoders and encoders of Controller.
+
+Usage: python benchmarks/bench_secret_codec.py [--number N] [--repeat N]
+
+The previous implementations (binascii.unhexlify, byte slices, repeated utf-8 encoding) are kept below
+as reference, without logging, so that only parsing and encoding are compared.
+"""
+import argparse
+import binascii
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import secretCodec  # noqa: E402
+
+
+####################################################################################################################
+""" PREVIOUS IMPLEMENTATIONS """
+
+
+def legacy_decode_password(secret_dict):
+    result = secret_dict
+    result['password'] = ''
+    result['login'] = ''
+    result['url'] = ''
+    secret_bytes = binascii.unhexlify(secret_dict['secret'])
+    offset = 0
+    password_size = secret_bytes[offset]
+    offset += 1
+    password_bytes = secret_bytes[offset:offset + password_size]
+    result['password_bytes'] = password_bytes
+    result['password'] = result['secret_decoded'] = password_bytes.decode('utf-8')
+    offset += password_size
+    if offset < len(secret_bytes):
+        login_size = secret_bytes[offset]
+        offset += 1
+        if login_size > 0 and (offset + login_size) <= len(secret_bytes):
+            result['login'] = secret_bytes[offset:offset + login_size].decode('utf-8')
+            offset += login_size
+    if offset < len(secret_bytes):
+        url_size = secret_bytes[offset]
+        offset += 1
+        if url_size > 0 and (offset + url_size) <= len(secret_bytes):
+            result['url'] = secret_bytes[offset:offset + url_size].decode('utf-8')
+    return result
+
+
+def legacy_decode_masterseed_mnemonic(secret_dict):
+    result = secret_dict
+    secret_bytes = binascii.unhexlify(secret_dict['secret'])
+    offset = 0
+    masterseed_size = secret_bytes[offset]
+    offset += 1
+    masterseed_bytes = secret_bytes[offset:offset + masterseed_size]
+    result['masterseed_bytes'] = masterseed_bytes
+    result['masterseed'] = result['secret_decoded'] = masterseed_bytes.hex()
+    offset += masterseed_size
+    result['wordlist_selector'] = secret_bytes[offset]
+    offset += 1
+    entropy_size = secret_bytes[offset]
+    offset += 1
+    result['entropy'] = secret_bytes[offset:offset + entropy_size]
+    offset += entropy_size
+    passphrase_size = secret_bytes[offset]
+    offset += 1
+    result['passphrase'] = secret_bytes[offset:offset + passphrase_size].decode('utf-8')
+    offset += passphrase_size
+    descriptor_size = int.from_bytes(secret_bytes[offset:offset + 2], byteorder='big')
+    offset += 2
+    result['descriptor'] = secret_bytes[offset:offset + descriptor_size].decode('utf-8')
+    return result
+
+
+def legacy_decode_2bytes_secret(secret_dict):
+    result = secret_dict
+    secret_bytes = binascii.unhexlify(secret_dict['secret'])
+    secret_size = int.from_bytes(secret_bytes[:2], byteorder='big')
+    result['secret_decoded'] = secret_bytes[2:2 + secret_size].decode('utf-8')
+    return result
+
+
+def legacy_encode_password(password, login, url):
+    secret_encoded = bytes([len(password.encode('utf-8'))]) + password.encode('utf-8')
+    if login != "":
+        secret_encoded += bytes([len(login.encode('utf-8'))]) + login.encode('utf-8')
+    if url != "":
+        secret_encoded += bytes([len(url.encode('utf-8'))]) + url.encode('utf-8')
+    return secret_encoded
+
+
+def legacy_encode_masterseed_mnemonic(seed, wordlist_selector, entropy, passphrase, descriptor):
+    seed_list = list(seed)
+    entropy_list = list(entropy)
+    passphrase_list = list(passphrase.encode('utf-8')) if passphrase else []
+    descriptor_list = list(descriptor.encode('utf-8')) if descriptor else []
+    return (
+        [len(seed_list)] + seed_list + [wordlist_selector] + [len(entropy_list)] + entropy_list +
+        [len(passphrase_list)] + passphrase_list +
+        list(len(descriptor_list).to_bytes(2, byteorder='big')) + descriptor_list
+    )
+
+
+####################################################################################################################
+""" CODEC """
+
+
+def codec_encode_password(password, login, url):
+    # strings are encoded once by the caller, see Controller.import_password()
+    return secretCodec.encode_password(password.encode('utf-8'), login.encode('utf-8'), url.encode('utf-8'))
+
+
+def codec_encode_masterseed_mnemonic(seed, wordlist_selector, entropy, passphrase, descriptor):
+    return secretCodec.encode_masterseed_mnemonic(
+        seed, wordlist_selector, entropy, passphrase.encode('utf-8'), descriptor.encode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="calls per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements, the best one is reported")
+    args = parser.parse_args()
+
+    password, login, url = "correct horse battery staple", "satoshi@example.com", "https://example.com/login"
+    seed, entropy = os.urandom(64), os.urandom(16)
+    passphrase, descriptor = "passphrase", "wpkh([73c5da0a/84h/0h/0h]xpub6CatWdiZiodmUeTDp8LT5or8nmbKNcuyvz7WyksVFkKB4RHwCD3XyuvPEbvqAQY3rAPshWcMLoP2fMFMKHPJ4ZeZXYVUhLv1VMrjPC7PW6V/0/*)"
+    secrets = {
+        'password': codec_encode_password(password, login, url).hex(),
+        'masterseed_mnemonic': codec_encode_masterseed_mnemonic(seed, 0, entropy, passphrase, descriptor).hex(),
+        'data': secretCodec.encode_2bytes_secret(os.urandom(64).hex().encode('utf-8')).hex(),
+    }
+    # decoders are called as SecretType.decode() does, see secretTypes
+    password_hex, masterseed_hex, data_hex = secrets['password'], secrets['masterseed_mnemonic'], secrets['data']
+    benchmarks = [
+        ("decode password",
+         lambda: legacy_decode_password({'secret': password_hex}),
+         lambda: secretCodec.decode_password(secretCodec.to_bytes(password_hex), {'secret': password_hex})),
+        ("decode masterseed",
+         lambda: legacy_decode_masterseed_mnemonic({'secret': masterseed_hex}),
+         lambda: secretCodec.decode_masterseed_mnemonic(
+             secretCodec.to_bytes(masterseed_hex), {'secret': masterseed_hex})),
+        ("decode data",
+         lambda: legacy_decode_2bytes_secret({'secret': data_hex}),
+         lambda: secretCodec.decode_2bytes_secret(secretCodec.to_bytes(data_hex), {'secret': data_hex})),
+        ("encode password",
+         lambda: legacy_encode_password(password, login, url),
+         lambda: codec_encode_password(password, login, url)),
+        ("encode masterseed",
+         lambda: legacy_encode_masterseed_mnemonic(seed, 0, entropy, passphrase, descriptor),
+         lambda: codec_encode_masterseed_mnemonic(seed, 0, entropy, passphrase, descriptor)),
+    ]
+
+    # both implementations must agree
+    assert bytes(codec_encode_password(password, login, url)) == legacy_encode_password(password, login, url)
+    assert list(codec_encode_masterseed_mnemonic(seed, 0, entropy, passphrase, descriptor)) == \
+        legacy_encode_masterseed_mnemonic(seed, 0, entropy, passphrase, descriptor)
+
+    print(f"{'benchmark':<20} {'previous (us)':>14} {'codec (us)':>12} {'speedup':>8}")
+    for name, legacy, codec in benchmarks:
+        # measurements alternate between both implementations, so that load changes affect both alike
+        legacy_times, codec_times = [], []
+        for _ in range(args.repeat):
+            legacy_times.append(timeit.timeit(legacy, number=args.number))
+            codec_times.append(timeit.timeit(codec, number=args.number))
+        legacy_us = min(legacy_times) / args.number * 1e6
+        codec_us = min(codec_times) / args.number * 1e6
+        print(f"{name:<20} {legacy_us:>14.3f} {codec_us:>12.3f} {legacy_us / codec_us:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
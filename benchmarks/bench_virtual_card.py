@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmarks for listing, backup and bulk import, using virtual SeedKeeper cards.
+
+Usage: python benchmarks/bench_virtual_card.py [--secrets N] [--latency MS] [--latency-per-byte US] [--repeat N]
+
+The card latency is simulated (see virtualCard.VirtualCard), so results only depend on the
+number and size of the APDUs sent by the host, which is what these benchmarks compare.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import TYPE_PASSWORD, TYPE_PUBKEY  # noqa: E402
+from virtualCard import VirtualCard, VirtualCardConnector  # noqa: E402
+
+PIN = "123456"
+
+
+def setup_card(cc: VirtualCardConnector, card: VirtualCard):
+    cc.insert_card(card)
+    # same parameters as Controller.card_setup_native_pin()
+    cc.card_setup(0x05, 0x01, list(PIN.encode('utf-8')), list(os.urandom(16)),
+                  0x01, 0x01, list(os.urandom(16)), list(os.urandom(16)),
+                  32, 0x0000, 0x01, 0x01, 0x01)
+
+
+def make_password_secret(cc: VirtualCardConnector, index: int, size: int):
+    password = f"password-{index:05d}-".encode('utf-8').ljust(size, b"x")
+    return {
+        'header': cc.make_header(TYPE_PASSWORD, 0x01, f"benchmark password #{index}"),
+        'secret_list': list(bytes([len(password)]) + password),
+    }
+
+
+def bench_bulk_import(cc: VirtualCardConnector, card: VirtualCard, nb_secrets: int, secret_size: int):
+    cc.insert_card(card)
+    cc.card_verify_PIN_simple(PIN)
+    for index in range(nb_secrets):
+        cc.seedkeeper_import_secret(make_password_secret(cc, index, secret_size))
+
+
+def bench_listing(cc: VirtualCardConnector, card: VirtualCard, nb_secrets: int):
+    cc.insert_card(card)
+    cc.card_verify_PIN_simple(PIN)
+    headers = cc.seedkeeper_list_secret_headers()
+    assert len(headers) >= nb_secrets, f"expected {nb_secrets} headers, got {len(headers)}"
+
+
+def bench_backup(cc: VirtualCardConnector, master: VirtualCard, backup: VirtualCard):
+    """Same sequence as FrameSeedkeeperBackupCard: pairing, export from master, import to backup"""
+    # pair master
+    cc.insert_card(master)
+    cc.card_verify_PIN_simple(PIN)
+    master_authentikey = cc.card_bip32_get_authentikey().get_public_key_bytes(compressed=False)
+    master_headers = cc.seedkeeper_list_secret_headers()
+
+    # pair backup, import the master authentikey if needed
+    cc.insert_card(backup)
+    cc.card_verify_PIN_simple(PIN)
+    backup_authentikey = cc.card_bip32_get_authentikey().get_public_key_bytes(compressed=False)
+    backup_headers = cc.seedkeeper_list_secret_headers()
+    master_authentikey_id = import_authentikey(cc, master_authentikey, backup_headers, "master")
+
+    # export from master
+    cc.insert_card(master)
+    cc.card_verify_PIN_simple(PIN)
+    backup_authentikey_id = import_authentikey(cc, backup_authentikey, master_headers, "backup")
+    secrets = []
+    for header in master_headers:
+        if header['type'] == TYPE_PUBKEY:
+            continue
+        secrets.append(cc.seedkeeper_export_secret(header['id'], sid_pubkey=backup_authentikey_id))
+
+    # import to backup
+    cc.insert_card(backup)
+    cc.card_verify_PIN_simple(PIN)
+    for secret in secrets:
+        sid, fingerprint = cc.seedkeeper_import_secret(secret, sid_pubkey=master_authentikey_id)
+        assert fingerprint == secret['fingerprint'], f"fingerprint mismatch for secret {sid}"
+
+
+def import_authentikey(cc: VirtualCardConnector, authentikey: bytes, headers, name: str) -> int:
+    # same as utils.get_fingerprint_from_authentikey_bytes(), without the GUI dependencies
+    fingerprint = hashlib.sha256(bytes([len(authentikey)]) + authentikey).hexdigest()[0:8]
+    found = next((item for item in headers if item['fingerprint'] == fingerprint), None)
+    if found is not None:
+        return found['id']
+    sid, _ = cc.seedkeeper_import_secret({
+        'header': cc.make_header(TYPE_PUBKEY, 0x01, f"{name} authentikey #{fingerprint}"),
+        'secret_list': list(bytes([len(authentikey)]) + authentikey),
+    })
+    return sid
+
+
+def run(name: str, cards, func, *args) -> float:
+    apdus = sum(card.apdu_count for card in cards)
+    start = time.perf_counter()
+    func(*args)
+    duration = time.perf_counter() - start
+    apdus = sum(card.apdu_count for card in cards) - apdus
+    print(f"{name:<12} {apdus:>8} {duration:>10.3f} {1000 * duration / max(apdus, 1):>10.3f}")
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--secrets", type=int, default=50, help="number of secrets imported in the master card")
+    parser.add_argument("--secret-size", type=int, default=64, help="size of each password, in bytes")
+    parser.add_argument("--latency", type=float, default=5.0, help="latency per APDU, in ms")
+    parser.add_argument("--latency-per-byte", type=float, default=10.0, help="transfer time per byte, in us")
+    parser.add_argument("--memory", type=int, default=32768, help="card memory for secrets, in bytes")
+    parser.add_argument("--repeat", type=int, default=3, help="number of listing runs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    card_args = dict(latency=args.latency / 1000, latency_per_byte=args.latency_per_byte / 1e6,
+                     memory_size=args.memory, loglevel=logging.WARNING)
+    master = VirtualCard(seed=b"benchmark master", **card_args)
+    backup = VirtualCard(seed=b"benchmark backup", **card_args)
+    cc = VirtualCardConnector(loglevel=logging.WARNING)
+    setup_card(cc, master)
+    setup_card(cc, backup)
+
+    print(f"{args.secrets} secrets of {args.secret_size} bytes, latency {args.latency}ms "
+          f"+ {args.latency_per_byte}us/byte")
+    print(f"{'benchmark':<12} {'APDUs':>8} {'total (s)':>10} {'ms/APDU':>10}")
+    run("bulk import", [master], bench_bulk_import, cc, master, args.secrets, args.secret_size)
+    for index in range(args.repeat):
+        run(f"listing #{index + 1}", [master], bench_listing, cc, master, args.secrets)
+    run("backup", [master, backup], bench_backup, cc, master, backup)
+    cc.remove_card()
+
+
+if __name__ == '__main__':
+    main()
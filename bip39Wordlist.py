@@ -0,0 +1,265 @@
+import hashlib
+import logging
+import os
+import secrets
+import sys
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Sequence, Union
+
+from mnemonic import Mnemonic
+
+from constants import BIP39_WORDLIST_DIC
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+MNEMONIC_LENGTHS = (12, 15, 18, 21, 24)  # number of words
+ENTROPY_STRENGTHS = (128, 160, 192, 224, 256)  # in bits, same order as MNEMONIC_LENGTHS
+WORDLIST_SIZE = 2048
+
+
+def get_wordlist_dirs() -> List[str]:
+    """Wordlists shipped with the application (all languages of constants.BIP39_WORDLIST_DIC, bundled by
+    package/satochip_utils.spec), then those of python-mnemonic"""
+    if getattr(sys, 'frozen', False):
+        application_path = sys._MEIPASS
+    else:
+        application_path = os.path.dirname(os.path.abspath(__file__))
+    return [os.path.join(application_path, 'wordlist'), Mnemonic._get_directory()]
+
+
+def get_strength(mnemonic_length: int) -> int:
+    """Entropy strength (bits) of a mnemonic of mnemonic_length words"""
+    if mnemonic_length not in MNEMONIC_LENGTHS:
+        raise ValueError(f"Number of words must be one of the following: {list(MNEMONIC_LENGTHS)}.")
+    return ENTROPY_STRENGTHS[MNEMONIC_LENGTHS.index(mnemonic_length)]
+
+
+def normalize_string(txt: Union[str, bytes]) -> str:
+    if isinstance(txt, bytes):
+        utxt = txt.decode("utf8")
+    elif isinstance(txt, str):
+        utxt = txt
+    else:
+        raise TypeError("String value expected")
+    return unicodedata.normalize("NFKD", utxt)
+
+
+class WordTrie:
+    """
+    Prefix trie of a wordlist, to complete and validate a word while it is typed (see mnemonicValidator).
+    Each node holds its children by character, the word ending at this node (if any) and the number of words
+    below it, so that a unique completion is found by walking down a single branch.
+    """
+
+    __slots__ = ('children', 'word', 'count')
+
+    def __init__(self, words: Sequence[str] = ()):
+        self.children: Dict[str, "WordTrie"] = {}
+        self.word: Optional[str] = None
+        self.count = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        node = self
+        node.count += 1
+        for char in word:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = WordTrie()
+            node = child
+            node.count += 1
+        node.word = word
+
+    def find(self, prefix: str) -> Optional["WordTrie"]:
+        node = self
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def is_prefix(self, prefix: str) -> bool:
+        return self.find(prefix) is not None
+
+    def complete(self, prefix: str) -> Optional[str]:
+        """The only word starting with prefix, None if there is none or several"""
+        node = self.find(prefix)
+        if node is None or node.count != 1:
+            return None
+        while node.word is None:
+            node = next(iter(node.children.values()))
+        return node.word
+
+
+class Bip39Wordlist:
+    """
+    BIP39 wordlist of a language, loaded once per process on first use (see get()).
+    Holds the index => word array and a word => index dict, so that each word of a mnemonic is
+    looked up in O(1) (instead of list.index() or a binary search on each call).
+    Languages are identified by name, or by the wordlist_selector byte of Masterseed secrets (see get_by_selector()).
+    """
+
+    _instances: Dict[str, "Bip39Wordlist"] = {}
+    _instances_lock = threading.Lock()
+    _missing = set()  # languages without wordlist file
+
+    @classmethod
+    def get(cls, language: str = "english") -> "Bip39Wordlist":
+        with cls._instances_lock:
+            wordlist = cls._instances.get(language)
+            if wordlist is None:
+                if language in cls._missing:
+                    raise ValueError(f"Wordlist not found for language: {language}")
+                try:
+                    wordlist = cls._instances[language] = cls.load(language)
+                except ValueError:
+                    cls._missing.add(language)
+                    raise
+            return wordlist
+
+    @classmethod
+    def get_by_selector(cls, wordlist_selector: int) -> "Bip39Wordlist":
+        language = BIP39_WORDLIST_DIC.get(wordlist_selector)
+        if language is None:
+            raise ValueError(f"Unknown wordlist selector: {wordlist_selector}")
+        return cls.get(language)
+
+    @classmethod
+    def detect(cls, mnemonic: Union[str, List[str]]) -> "Bip39Wordlist":
+        """Wordlist of a valid mnemonic, english first: other wordlists are only loaded if needed.
+        Raises ValueError if the mnemonic is not valid in any available language."""
+        words = cls.split(mnemonic)
+        for language in BIP39_WORDLIST_DIC.values():
+            try:
+                wordlist = cls.get(language)
+            except ValueError:
+                continue
+            if all(word in wordlist for word in words) and wordlist.check(words):
+                return wordlist
+        raise ValueError("Invalid mnemonic")
+
+    @property
+    def selector(self) -> int:
+        """wordlist_selector byte of Masterseed secrets"""
+        for wordlist_selector, language in BIP39_WORDLIST_DIC.items():
+            if language == self.language:
+                return wordlist_selector
+        raise ValueError(f"No wordlist selector for language: {self.language}")
+
+    @classmethod
+    def load(cls, language: str) -> "Bip39Wordlist":
+        for wordlist_dir in get_wordlist_dirs():
+            wordlist_path = os.path.join(wordlist_dir, f"{language}.txt")
+            if os.path.isfile(wordlist_path):
+                with open(wordlist_path, "r", encoding="utf-8") as f:
+                    words = [w.strip() for w in f.readlines()]
+                logger.debug(f"Loaded {language} wordlist from {wordlist_path}")
+                return cls(language, words)
+        raise ValueError(f"Wordlist not found for language: {language}")
+
+    def __init__(self, language: str, words: Sequence[str]):
+        if len(words) != WORDLIST_SIZE:
+            raise ValueError(f"Wordlist should contain {WORDLIST_SIZE} words, but it contains {len(words)} words.")
+        self.language = language
+        self.words = tuple(words)
+        self.indexes: Dict[str, int] = {word: index for index, word in enumerate(self.words)}
+        # words are also found in NFKD form (as normalized by BIP39)
+        for index, word in enumerate(self.words):
+            self.indexes.setdefault(normalize_string(word), index)
+        self.delimiter = "\u3000" if language == "japanese" else " "
+        self._trie: Optional[WordTrie] = None
+
+    @property
+    def trie(self) -> WordTrie:
+        """Prefix trie of the NFKD forms of the words, built on first use"""
+        if self._trie is None:
+            self._trie = WordTrie(normalize_string(word) for word in self.words)
+        return self._trie
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.indexes
+
+    def index(self, word: str) -> int:
+        index = self.indexes.get(word)
+        if index is None:
+            index = self.indexes.get(normalize_string(word))
+            if index is None:
+                raise LookupError(f'Unable to find "{word}" in word list.')
+        return index
+
+    @staticmethod
+    def split(mnemonic: Union[str, List[str]]) -> List[str]:
+        if isinstance(mnemonic, list):
+            return mnemonic
+        if isinstance(mnemonic, str):
+            # single spaces only, like python-mnemonic (the seed is derived from the mnemonic string as is)
+            return normalize_string(mnemonic).split(" ")
+        raise ValueError("Mnemonic should be a string or a list")
+
+    def to_indexes(self, mnemonic: Union[str, List[str]]) -> List[int]:
+        words = self.split(mnemonic)
+        if len(words) not in MNEMONIC_LENGTHS:
+            raise ValueError(
+                f"Number of words must be one of the following: {list(MNEMONIC_LENGTHS)}, but it is not ({len(words)}).")
+        return [self.index(word) for word in words]
+
+    def to_entropy(self, mnemonic: Union[str, List[str]]) -> bytes:
+        """Entropy of a mnemonic, raises ValueError if the checksum is wrong (LookupError for unknown words)"""
+        indexes = self.to_indexes(mnemonic)
+        value = 0
+        for index in indexes:
+            value = (value << 11) | index
+        checksum_bits = len(indexes) // 3
+        entropy = (value >> checksum_bits).to_bytes((len(indexes) * 11 - checksum_bits) // 8, byteorder='big')
+        if value & ((1 << checksum_bits) - 1) != hashlib.sha256(entropy).digest()[0] >> (8 - checksum_bits):
+            raise ValueError("Failed checksum.")
+        return entropy
+
+    def check(self, mnemonic: Union[str, List[str]]) -> bool:
+        try:
+            self.to_entropy(mnemonic)
+            return True
+        except (ValueError, LookupError):
+            return False
+
+    def to_mnemonic(self, entropy: bytes) -> str:
+        if len(entropy) * 8 not in ENTROPY_STRENGTHS:
+            raise ValueError(f"Data length should be one of the following: {[s // 8 for s in ENTROPY_STRENGTHS]}, "
+                             f"but it is not ({len(entropy)}).")
+        checksum_bits = len(entropy) * 8 // 32
+        value = (int.from_bytes(entropy, byteorder='big') << checksum_bits) | \
+            (hashlib.sha256(entropy).digest()[0] >> (8 - checksum_bits))
+        nb_words = (len(entropy) * 8 + checksum_bits) // 11
+        return self.delimiter.join(
+            self.words[(value >> (11 * (nb_words - 1 - i))) & 0x7FF] for i in range(nb_words))
+
+    def generate(self, strength: int = 128) -> str:
+        if strength not in ENTROPY_STRENGTHS:
+            raise ValueError(f"Invalid strength value. Allowed values are {list(ENTROPY_STRENGTHS)}.")
+        return self.to_mnemonic(secrets.token_bytes(strength // 8))
+
+    def generate_batch(self, count: int, strength: int = 128) -> List[str]:
+        """count mnemonics from a single read of the entropy source, each one is checked before being returned"""
+        if strength not in ENTROPY_STRENGTHS:
+            raise ValueError(f"Invalid strength value. Allowed values are {list(ENTROPY_STRENGTHS)}.")
+        if count < 1:
+            raise ValueError("The number of mnemonics must be at least 1.")
+        size = strength // 8
+        entropy = secrets.token_bytes(count * size)
+        mnemonics = []
+        for offset in range(0, count * size, size):
+            mnemonic = self.to_mnemonic(entropy[offset:offset + size])
+            if self.to_entropy(mnemonic) != entropy[offset:offset + size]:
+                raise ValueError("Generated mnemonic failed verification.")
+            mnemonics.append(mnemonic)
+        return mnemonics
+
+    def to_seedqr(self, mnemonic: Union[str, List[str]]) -> str:
+        """Standard SeedQR digits: 4-digit index of each word"""
+        return "".join(str(index).zfill(4) for index in self.to_indexes(mnemonic))
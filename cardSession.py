@@ -0,0 +1,279 @@
+import logging
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+@dataclass(frozen=True)
+class CardSnapshot:
+    """Immutable view of the card state, used by frames to render without card access"""
+    card_present: bool = False
+    card_type: Optional[str] = None
+    setup_done: bool = False
+    is_seeded: bool = False
+    needs_2FA: bool = False
+    nfc_policy: Optional[int] = None
+    card_status: Optional[Mapping[str, Any]] = None
+    # values below require the PIN (is_unlocked)
+    is_unlocked: bool = False
+    label: Optional[str] = None
+    is_authentic: Optional[bool] = None
+    seedkeeper_status: Optional[Mapping[str, Any]] = None
+
+    @property
+    def protocol_version(self) -> int:
+        return self.card_status['protocol_version'] if self.card_status else 0
+
+    @property
+    def applet_version_string(self) -> str:
+        if not self.card_status:
+            return ""
+        return (f"{self.card_status['protocol_major_version']}.{self.card_status['protocol_minor_version']}-"
+                f"{self.card_status['applet_major_version']}.{self.card_status['applet_minor_version']}")
+
+    @property
+    def pin_tries_remaining(self) -> Optional[int]:
+        return self.card_status.get('PIN0_remaining_tries') if self.card_status else None
+
+
+class CardSession:
+    """
+    Cache of the state of the currently inserted card.
+
+    Each value is fetched from the card at most once per insertion. The cache is cleared by the
+    connector insert/remove callbacks (see Controller.request) and the relevant entries are
+    invalidated by the operations that modify them (label edit, PIN change, secret import...).
+
+    The session also remembers whether the PIN has been verified on the inserted card, so that
+    VERIFY PIN is only sent once per insertion. Should the card lose its verified state anyway,
+    the CardConnector transparently verifies the cached PIN again on SW 9C06.
+    """
+
+    CARD_STATUS = 'card_status'
+    LABEL = 'label'
+    AUTHENTIKEY = 'authentikey'
+    SEEDKEEPER_STATUS = 'seedkeeper_status'
+    AUTHENTICITY = 'authenticity'
+    SNAPSHOT = 'snapshot'
+
+    def __init__(self, cc=None, authenticity_cache=None, loglevel=logging.DEBUG):
+        logger.setLevel(loglevel)
+        self.cc = cc
+        self.authenticity_cache = authenticity_cache
+        self.lock = threading.RLock()
+        self._cache: Dict[str, Any] = {}
+        # incremented on each clear(), so that a fetch started before an insertion/removal is not cached
+        self.generation = 0
+        # PIN verification memo
+        self.pin_verified = False
+        self.saved_apdus = 0  # number of VERIFY PIN commands skipped thanks to the memo
+
+    ####################################################################################################################
+    """ INVALIDATION """
+
+    def clear(self):
+        with self.lock:
+            self._cache.clear()
+            self.pin_verified = False
+            self.generation += 1
+        logger.debug(f"CardSession cleared (generation {self.generation})")
+
+    def invalidate(self, *keys: str):
+        with self.lock:
+            for key in keys:
+                self._cache.pop(key, None)
+            # snapshot is derived from the other values
+            self._cache.pop(self.SNAPSHOT, None)
+        logger.debug(f"CardSession invalidated: {keys}")
+
+    def on_card_event(self, is_connected: Optional[bool]):
+        """Called by the connector (from the card monitor thread) when a card is inserted or removed"""
+        self.clear()
+
+    ####################################################################################################################
+    """ PIN """
+
+    def verify_pin(self, pin: Optional[bytes] = None):
+        """Verify the PIN (cached in the CardConnector if pin is None), unless already done for this insertion.
+        Can throw PinRequiredError, WrongPinError or PinBlockedError."""
+        if self.cc.card_type == "Satodime":
+            return
+        with self.lock:
+            if self.pin_verified:
+                self.saved_apdus += 1
+                logger.debug(f"CardSession PIN already verified ({self.saved_apdus} VERIFY PIN saved)")
+                return
+            generation = self.generation
+        try:
+            self.cc.card_verify_PIN_simple(pin)
+        except Exception:
+            self.reset_pin_verified()
+            raise
+        with self.lock:
+            if generation == self.generation:
+                self.pin_verified = True
+
+    def set_pin_verified(self):
+        """To be called after a successful VERIFY PIN sent outside of verify_pin()"""
+        with self.lock:
+            self.pin_verified = True
+
+    def reset_pin_verified(self):
+        """To be called on wrong PIN, PIN change or logout"""
+        with self.lock:
+            self.pin_verified = False
+
+    ####################################################################################################################
+    """ CACHED VALUES """
+
+    def _get(self, key: str, fetch: Callable[[], Any], refresh: bool = False):
+        if self.cc is None or not self.cc.card_present:
+            return None
+        with self.lock:
+            if not refresh and key in self._cache:
+                return self._cache[key]
+            generation = self.generation
+        value = fetch()
+        with self.lock:
+            if generation == self.generation:
+                self._cache[key] = value
+        return value
+
+    def is_cached(self, key: str) -> bool:
+        with self.lock:
+            return key in self._cache
+
+    def peek(self, key: str, default=None):
+        """Return the cached value without any card access"""
+        with self.lock:
+            return self._cache.get(key, default)
+
+    def get_card_status(self, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        def fetch():
+            response, sw1, sw2, card_status = self.cc.card_get_status()
+            return card_status
+        return self._get(self.CARD_STATUS, fetch, refresh)
+
+    def get_label(self, refresh: bool = False) -> Optional[str]:
+        # requires PIN
+        def fetch():
+            response, sw1, sw2, label = self.cc.card_get_label()
+            return label
+        return self._get(self.LABEL, fetch, refresh)
+
+    def get_authentikey(self, refresh: bool = False):
+        # requires PIN
+        return self._get(self.AUTHENTIKEY, self.cc.card_bip32_get_authentikey, refresh)
+
+    def get_seedkeeper_status(self, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        # Seedkeeper v0.2+ only, requires PIN
+        def fetch():
+            response, sw1, sw2, seedkeeper_status = self.cc.seedkeeper_get_status()
+            return seedkeeper_status
+        return self._get(self.SEEDKEEPER_STATUS, fetch, refresh)
+
+    def get_card_id(self) -> str:
+        """Identifier of the card used by the authenticity cache: authentikey if available, else card UID"""
+        if self.cc.card_type != "Satodime":
+            try:
+                return self.get_authentikey().get_public_key_hex(compressed=False)
+            except Exception as ex:  # e.g. unseeded Satochip
+                logger.debug(f"CardSession no authentikey available: {ex}")
+        return f"uid:{self.cc.UID_SHA1}"
+
+    def get_authenticity(self, refresh: bool = False):
+        """Return (is_authentic, txt_ca, txt_subca, txt_device, txt_error), requires PIN"""
+        def fetch():
+            if self.authenticity_cache is None:
+                return self.cc.card_verify_authenticity()
+            return self.authenticity_cache.verify_card(self.cc, self.get_card_id())
+        return self._get(self.AUTHENTICITY, fetch, refresh)
+
+    ####################################################################################################################
+    """ SNAPSHOT """
+
+    def cached_snapshot(self) -> Optional[CardSnapshot]:
+        """Return the last snapshot if still valid, None otherwise"""
+        cc = self.cc
+        if cc is None or not cc.card_present:
+            return None
+        snapshot = self.peek(self.SNAPSHOT)
+        # a snapshot taken before the PIN was entered must be refreshed
+        if snapshot is not None and snapshot.is_unlocked == (cc.card_type == "Satodime" or cc.is_pin_set()):
+            return snapshot
+        return None
+
+    def fetch_snapshot(self) -> CardSnapshot:
+        """Build a snapshot of the card, sending only the APDUs for values not cached yet.
+        The PIN is verified at most once, and only if it is cached and needed."""
+        cc = self.cc
+        if cc is None or not cc.card_present:
+            return CardSnapshot()
+
+        snapshot = self.cached_snapshot()
+        if snapshot is not None:
+            return snapshot
+
+        with self.lock:
+            generation = self.generation
+
+        card_status = self.get_card_status()
+        is_satodime = (cc.card_type == "Satodime")
+        is_unlocked = is_satodime or cc.is_pin_set()
+        needs_seedkeeper_status = (cc.card_type == "SeedKeeper" and card_status['protocol_version'] >= 2)
+
+        label = is_authentic = seedkeeper_status = None
+        if is_unlocked:
+            missing = [key for key in (self.LABEL, self.AUTHENTICITY) if not self.is_cached(key)]
+            if needs_seedkeeper_status and not self.is_cached(self.SEEDKEEPER_STATUS):
+                missing.append(self.SEEDKEEPER_STATUS)
+            if missing:
+                self.verify_pin()
+                logger.debug(f"CardSession PIN verified for {missing}")
+
+            label = self.get_label()
+            is_authentic = self.get_authenticity()[0]
+            if needs_seedkeeper_status:
+                seedkeeper_status = MappingProxyType(dict(self.get_seedkeeper_status()))
+
+        snapshot = CardSnapshot(
+            card_present=True,
+            card_type=cc.card_type,
+            setup_done=cc.setup_done,
+            is_seeded=cc.is_seeded,
+            needs_2FA=cc.needs_2FA,
+            nfc_policy=cc.nfc_policy,
+            card_status=MappingProxyType(dict(card_status)),
+            is_unlocked=is_unlocked,
+            label=label,
+            is_authentic=is_authentic,
+            seedkeeper_status=seedkeeper_status,
+        )
+        with self.lock:
+            if generation == self.generation:
+                self._cache[self.SNAPSHOT] = snapshot
+        return snapshot
+
+    def peek_snapshot(self) -> CardSnapshot:
+        """Return the last snapshot, or a partial one built from the connector state (no card access)"""
+        snapshot = self.cached_snapshot()
+        if snapshot is not None:
+            return snapshot
+        cc = self.cc
+        if cc is None or not cc.card_present:
+            return CardSnapshot()
+        card_status = self.peek(self.CARD_STATUS)
+        return CardSnapshot(
+            card_present=True,
+            card_type=cc.card_type,
+            setup_done=cc.setup_done,
+            is_seeded=cc.is_seeded,
+            needs_2FA=cc.needs_2FA,
+            nfc_policy=cc.nfc_policy,
+            card_status=MappingProxyType(dict(card_status)) if card_status else None,
+            is_unlocked=(cc.card_type == "Satodime" or cc.is_pin_set()),
+        )
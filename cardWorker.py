@@ -0,0 +1,133 @@
+import logging
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+class CardWorker:
+    """
+    Runs card operations on a dedicated thread so that the Tk mainloop never blocks on APDUs.
+
+    Jobs are executed one at a time, in submission order, so that multi-APDU sequences
+    (export, listing, import...) never interleave on the card.
+    Results and errors are handed back to the Tk thread by polling a result queue with after().
+    """
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, root, loglevel=logging.DEBUG):
+        logger.setLevel(loglevel)
+        self.root = root
+
+        # serializes access to the CardConnector between the worker and other threads
+        self.lock = threading.RLock()
+
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = 0
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._run, name="card-worker", daemon=True)
+        self._thread.start()
+        self._poll_id = self.root.after(self.POLL_INTERVAL_MS, self._poll)
+        logger.debug("CardWorker started")
+
+    def submit(
+            self,
+            func: Callable,
+            *args,
+            on_success: Optional[Callable[[Any], None]] = None,
+            on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        """Queue func(*args) for execution on the card thread.
+        on_success(result) or on_error(exception) is then called on the Tk thread."""
+        if self._stopped:
+            logger.warning(f"CardWorker stopped, job {getattr(func, '__name__', func)} ignored")
+            return
+        self._pending += 1
+        self._jobs.put((func, args, on_success, on_error))
+
+    def post(self, func: Callable, *args):
+        """Schedule func(*args) on the Tk thread. Can be called from any thread."""
+        self._results.put((func, args))
+
+    def run_sync(self, func: Callable, *args):
+        """Run func(*args) in the calling thread, without interleaving with a running job."""
+        with self.lock:
+            return func(*args)
+
+    def is_busy(self) -> bool:
+        return self._pending > 0
+
+    def stop(self):
+        self._stopped = True
+        self._jobs.put(None)
+        if self._poll_id is not None:
+            try:
+                self.root.after_cancel(self._poll_id)
+            except Exception as ex:
+                logger.debug(f"CardWorker failed to cancel polling: {ex}")
+            self._poll_id = None
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                logger.debug("CardWorker stopped")
+                return
+            func, args, on_success, on_error = job
+            try:
+                with self.lock:
+                    result = func(*args)
+            except Exception as ex:
+                logger.error(f"CardWorker job {getattr(func, '__name__', func)} failed: {ex}", exc_info=True)
+                self.post(self._job_done, on_error, ex)
+            else:
+                self.post(self._job_done, on_success, result)
+
+    def _job_done(self, callback, value):
+        self._pending -= 1
+        if callback is not None:
+            callback(value)
+
+    def _poll(self):
+        try:
+            while True:
+                func, args = self._results.get_nowait()
+                try:
+                    func(*args)
+                except Exception as ex:
+                    logger.error(f"CardWorker callback failed: {ex}", exc_info=True)
+        except queue.Empty:
+            pass
+        if not self._stopped:
+            self._poll_id = self.root.after(self.POLL_INTERVAL_MS, self._poll)
+
+
+class LockedCardObserver:
+    """
+    Card monitor observer that forwards card events to another observer (pysatochip's RemovalObserver)
+    while holding the card worker lock.
+
+    On insertion, RemovalObserver connects to the card and sends select, status and secure channel APDUs
+    from the PC/SC monitor thread: holding the lock ensures they never interleave with a card job.
+    If reader is set, events of cards from other readers are ignored (see readerManager.ReaderCardConnector).
+    """
+
+    def __init__(self, observer, lock, reader: Optional[str] = None):
+        self.observer = observer
+        self.lock = lock
+        self.reader = reader
+
+    def update(self, observable, actions):
+        (addedcards, removedcards) = actions
+        if self.reader is not None:
+            addedcards = [card for card in addedcards if card.reader == self.reader]
+            removedcards = [card for card in removedcards if card.reader == self.reader]
+        if not addedcards and not removedcards:
+            return
+        with self.lock:
+            self.observer.update(observable, (addedcards, removedcards))
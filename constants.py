@@ -1,4 +1,6 @@
 
+import os
+
 # Constants
 BG_MAIN_MENU = "#21283b"
 BG_BUTTON = "#e1e1e0"
@@ -13,13 +15,27 @@ TEXT_COLOR = "black"
 
 ICON_PATH = "./pictures_db/"
 
+"""Local data"""
+
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".satochip-utils")
+AUTHENTICITY_CACHE_PATH = os.path.join(DATA_DIR, "authenticity_cache.json")
+AUTHENTICITY_CACHE_TTL = 30 * 24 * 3600  # in seconds, None means no expiry
+HEADER_CACHE_DIR = os.path.join(DATA_DIR, "header_cache")  # see --cache-headers
+SECRET_CACHE_TTL = 60  # in seconds, see --cache-secrets
+SECRET_CACHE_MAX_ENTRIES = 8
+
 """Seedkeeper"""
 
 TYPE_MASTERSEED = 0x10
 TYPE_BIP39_MNEMONIC = 0x30
 TYPE_ELECTRUM_MNEMONIC = 0x40
+TYPE_SHAMIR_SECRET_SHARE = 0x50
+TYPE_PRIVKEY = 0x60
 TYPE_PUBKEY = 0x70
+TYPE_SYMMETRIC_KEY = 0x80
 TYPE_PASSWORD = 0x90
+TYPE_MASTER_PASSWORD = 0x91
+TYPE_CERTIFICATE = 0xA0
 TYPE_2FA_SECRET = 0xB0
 TYPE_DATA = 0xC0
 TYPE_DESCRIPTOR = 0xC1
@@ -41,6 +57,26 @@ TYPE_DIC = {
     0xC1: 'Wallet descriptor'
 }
 
+# wordlist_selector of Masterseed secrets with a BIP39 mnemonic (same as pysatochip.JCconstants.BIP39_WORDLIST_DIC),
+# restricted to the wordlists shipped in wordlist/: 0x08 (czech) and 0x09 (portuguese) are not supported, the entropy
+# of such secrets is shown instead of the mnemonic
+BIP39_WORDLIST_DIC = {
+    0x00: 'english',
+    0x01: 'japanese',
+    0x02: 'korean',
+    0x03: 'spanish',
+    0x04: 'chinese_simplified',
+    0x05: 'chinese_traditional',
+    0x06: 'french',
+    0x07: 'italian',
+}
+
+EXPORT_RIGHTS_DIC = {
+    0x00: 'Export not allowed',
+    0x01: 'Plaintext export allowed',
+    0x02: 'Encrypted export only',
+}
+
 INS_DIC = {
     0x40: 'Create PIN',
     0x42: 'Verify PIN',
@@ -1,28 +1,103 @@
-import binascii
-import hashlib
 import json
 import logging
+import threading
+from concurrent.futures import Future
 from os import urandom
-from typing import Dict, Any, Optional
-from mnemonic import Mnemonic
-from pysatochip.CardConnector import (CardConnector, UninitializedSeedError, UnexpectedSW12Error, PinBlockedError)
-
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from pysatochip.CardConnector import (CardConnector, UninitializedSeedError, UnexpectedSW12Error, PinBlockedError,
+                                      CardNotPresentError)
+from pysatochip.JCconstants import JCconstants
+
+from bip39Wordlist import Bip39Wordlist, get_strength
+from seedDerivation import SeedDerivationPool
+import secretTypes
+from secretTypes import DecodedSecret
+from apduTracer import ApduTracer
+from authenticityCache import AuthenticityCache
+from cardSession import CardSession, CardSnapshot
+from cardWorker import CardWorker, LockedCardObserver
+from secretHeaderStore import SecretHeaderStore, SecretHeaderCache, HeaderSync
+from headerDiskCache import HeaderDiskCache
+from secretCache import SecretCache
+from controllerEvents import (EventBus, ControllerError, InvalidInputError, CardOperationError, SecretNotFoundError,
+                              CardSetupDone, PinChanged, LabelChanged, SeedImported, SecretImported, SecretDeleted)
 from constants import INS_DIC, RES_DIC, TYPE_PASSWORD, TYPE_MASTERSEED, TYPE_DATA, TYPE_DESCRIPTOR, TYPE_PUBKEY, \
-    TYPE_BIP39_MNEMONIC, TYPE_ELECTRUM_MNEMONIC, TYPE_2FA_SECRET, TYPE_DIC
+    AUTHENTICITY_CACHE_PATH, AUTHENTICITY_CACHE_TTL, SECRET_CACHE_MAX_ENTRIES
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 
+class WorkerCardConnector(CardConnector):
+    """
+    CardConnector whose card monitor events are handled under the card worker lock of its client
+    (see cardWorker.LockedCardObserver), so that the APDUs sent on card insertion never interleave with a card job.
+    """
+
+    reader: Optional[str] = None  # only report the cards of this reader (see readerManager.ReaderCardConnector)
+
+    @property
+    def cardobserver(self):
+        return self._cardobserver
+
+    @cardobserver.setter
+    def cardobserver(self, observer):
+        # set by CardConnector.__init__(), before the observer is added to the card monitor
+        worker = getattr(self.client, 'worker', None)
+        lock = worker.lock if worker is not None else threading.RLock()
+        self._cardobserver = LockedCardObserver(observer, lock, reader=self.reader)
+
+    def close(self):
+        """Stop monitoring the reader"""
+        self.cardmonitor.deleteObserver(self.cardobserver)
+
+
 class Controller:
 
-    def __init__(self, view, loglevel=logging.DEBUG):
+    def __init__(self, view, loglevel=logging.DEBUG, trace_apdu: Optional[str] = None,
+                 connector_class=WorkerCardConnector, reader: Optional[str] = None,
+                 header_cache_dir: Optional[str] = None, secret_cache_ttl: Optional[float] = None):
         logger.setLevel(loglevel)
         self.view = view
-        self.view.controller = self
+        # in multi-reader mode (see readerManager.ReaderManager), the view selects the active controller
+        self.reader = reader
+        if reader is None:
+            self.view.controller = self
+
+        # results of card operations are also published here (see controllerEvents)
+        self.events = EventBus()
+
+        # card I/O thread, must exist before the CardConnector starts monitoring the reader
+        self.worker = CardWorker(self.view, loglevel=loglevel)
+        # cached card state, cleared on each card insertion/removal
+        self.authenticity_cache = AuthenticityCache(
+            ttl=AUTHENTICITY_CACHE_TTL, path=AUTHENTICITY_CACHE_PATH, loglevel=loglevel)
+        self.session = CardSession(authenticity_cache=self.authenticity_cache, loglevel=loglevel)
+        # Seedkeeper secret headers per card, reused when the same card is inserted again
+        self.header_cache = SecretHeaderCache()
+        # optional encrypted copy of the headers on disk (--cache-headers), shown before listing the card
+        self.header_disk_cache = None
+        if header_cache_dir:
+            if HeaderDiskCache.is_available():
+                self.header_disk_cache = HeaderDiskCache(header_cache_dir, loglevel=loglevel)
+            else:
+                logger.warning("--cache-headers requires the keyring package, secret headers are not saved on disk")
+        # optional cache of secrets exported in plaintext (--cache-secrets), cleared on each card insertion/removal
+        self.secret_cache = None
+        if secret_cache_ttl:
+            self.secret_cache = SecretCache(
+                ttl=secret_cache_ttl, max_entries=SECRET_CACHE_MAX_ENTRIES, loglevel=loglevel)
+            self.events.subscribe(SecretDeleted, lambda event: self.secret_cache.remove(event.sid))
 
         try:
-            self.cc = CardConnector(self, loglevel=loglevel)
+            # connector_class can be virtualCard.VirtualCardConnector to run without a reader
+            self.cc = connector_class(self, loglevel=loglevel)
+            self.session.cc = self.cc
+            # optional APDU tracing (--trace-apdu)
+            self.apdu_tracer = None
+            if trace_apdu:
+                self.apdu_tracer = ApduTracer(trace_apdu, loglevel=loglevel)
+                self.apdu_tracer.attach(self.cc)
             logger.info("CardConnector initialized successfully.")
         except Exception as ex:
             logger.error(f"Failed to initialize CardConnector {ex}", exc_info=True)
@@ -36,7 +111,7 @@ class Controller:
         if self.cc.card_present:
             logger.info("In get_card_status")
             try:
-                response, sw1, sw2, self.card_status = self.cc.card_get_status()
+                self.card_status = self.session.get_card_status()
                 logger.debug(f"Card satus: {self.card_status}")
             except Exception as e:
                 logger.error(f"Failed to retrieve card status: {e}")
@@ -45,131 +120,122 @@ class Controller:
             self.card_status = None
         return self.card_status
 
+    def fetch_card_snapshot(self) -> CardSnapshot:
+        """Collect status, label, authenticity and Seedkeeper status in one go (card worker thread).
+        Only values not cached in the session are fetched, with a single PIN verification."""
+        logger.info("In fetch_card_snapshot")
+        snapshot = self.session.fetch_snapshot()
+        self.card_status = snapshot.card_status
+        return snapshot
+
+    def get_card_snapshot(self) -> CardSnapshot:
+        """Last fetched snapshot, or the state known without card access"""
+        return self.session.peek_snapshot()
+
     def request(self, request_type, *args):
+        """Called by the CardConnector, usually from the card monitor thread: the request is forwarded to the
+        Tk thread instead of touching widgets here. The view method runs later, so its reply is not available
+        and None is always returned (pysatochip only sends 'update_status' and 'show_error', without reply)."""
         logger.info(str(request_type))
 
+        if request_type == 'update_status':
+            # card inserted or removed: cached card state is no longer valid
+            self.session.on_card_event(*args)
+            if self.secret_cache is not None:
+                self.secret_cache.clear()
+            if self.header_disk_cache is not None and args and args[0] is False:
+                self.header_disk_cache.forget_keys()
+            if self.reader is not None:
+                self.worker.post(self.view.update_reader_status, self, *args)
+                return
+
         method_to_call = getattr(self.view, request_type)
-        reply = method_to_call(*args)
-        return reply
+        self.worker.post(method_to_call, *args)
 
     # def disconnect_the_card(self):
     #     self.cc.card_disconnect()
 
-    def setup_card_pin(self, pin, pin_confirm):
-        if pin:
-            if 4 <= len(pin) <= 16:
-                if pin == pin_confirm:
-                    logger.info("Setup my card PIN: PINs match and are valid.")
-                    self.card_setup_native_pin(pin)
-                else:
-                    logger.warning("Setup my card PIN: PINs do not match.")
-                    self.view.show('ERROR', "Pin and pin confirm do not match!", 'Ok',
-                                   None, "./pictures_db/change_pin_popup.jpg")
-            else:
-                logger.warning("Setup my card PIN: wrong PIN size.")
-                self.view.show("ERROR",
-                               "Pin must contain between 4 and 16 characters",
-                               'Ok', None,
-                               "./pictures_db/change_pin_popup.jpg")
-        else:
-            self.view.show("ERROR", "You have to set up a PIN to continue.", 'Ok',
-                           None, "./pictures_db/change_pin_popup.jpg")
-
-    def change_card_pin(self, current_pin, new_pin, new_pin_confirm):
-        try:
-            if self.cc.card_present and self.cc.card_type != "Satodime":
-
-                if len(new_pin) < 4:
-                    logger.warning("New PIN is too short.")
-                    self.view.show("ERROR",
-                                   "Pin must contain at least 4 characters", 'Ok',
-                                   None, "./pictures_db/change_pin_popup.jpg")
-
-                if new_pin != new_pin_confirm:
-                    logger.warning("New PINs do not match.")
-                    self.view.show("WARNING",
-                                   "The PIN values do not match! Please type PIN again!",
-                                   "Ok", None,
-                                   "./pictures_db/change_pin_popup.jpg")
-                else:
-                    current_pin = list(current_pin.encode('utf8'))
-                    new_pin = list(new_pin.encode('utf8'))
-                    (response, sw1, sw2) = self.cc.card_change_PIN(0, current_pin, new_pin)
-                    if sw1 == 0x90 and sw2 == 0x00:
-                        logger.info("PIN changed successfully.")
-                        msg = "PIN changed successfully!"
-                        self.view.show("SUCCESS", msg, 'Ok',
-                                       None, "./pictures_db/change_pin_popup.jpg")
-                        self.view.show_start_frame()
-                    else:
-                        logger.error(f"Failed to change PIN with error code: {hex(sw1)}{hex(sw2)}")
-                        msg = f"Failed to change PIN with error code: {hex(sw1)}{hex(sw2)}"
-                        self.view.show("ERROR", f"{msg}\n Probably too long", 'Ok',
-                                       None, "./pictures_db/change_pin_popup.jpg")
-        except Exception as e:
-            logger.error(f"Error changing PIN: {e}")
-            self.view.show("ERROR", "Failed to change PIN.", "Ok",
-                           None, "./pictures_db/change_pin_popup.jpg")
-
-    def import_seed(self, mnemonic, passphrase=None):
-        """Import a seed (and optional passphrase) into a Satochip"""
-        try:
-            MNEMONIC = Mnemonic(language="english")
-            if MNEMONIC.check(mnemonic):  # check that seed is valid
-                logger.info("Imported seed is valid.")
-                if passphrase is not None:
-                    if passphrase in ["", " ", "Type your passphrase here"]:  # todo?
-                        logger.error("Passphrase is blank or empy")
-                        self.view.show('WARNING',
-                                       'Wrong passphrase: incorrect or blank',
-                                       'Ok', None,
-                                       "./pictures_db/seed_popup.jpg")
-                    else:
-                        seed = Mnemonic.to_seed(mnemonic, passphrase)
-                        self.card_setup_native_seed(seed)
-                else:
-                    seed = Mnemonic.to_seed(mnemonic)
-                    self.card_setup_native_seed(seed)
-            else:
-                logger.warning("Imported seed is invalid!")
-                self.view.show('WARNING',
-                               "Warning!\nInvalid BIP39 seedphrase, please retry.",
-                               'Ok', None,
-                               "./pictures_db/seed_popup.jpg")
-
-        except Exception as e:
-            logger.error(f"Error while importing seed: {e}")
-            self.view.show("ERROR", "Failed to import seed.", "Ok", None,
-                           "./pictures_db/seed_popup.jpg")
-
-    def edit_label(self, label):
+    def setup_card_pin(self, pin, pin_confirm) -> CardSetupDone:
+        if not pin:
+            raise InvalidInputError("You have to set up a PIN to continue.")
+        if not 4 <= len(pin) <= 16:
+            logger.warning("Setup my card PIN: wrong PIN size.")
+            raise InvalidInputError("Pin must contain between 4 and 16 characters")
+        if pin != pin_confirm:
+            logger.warning("Setup my card PIN: PINs do not match.")
+            raise InvalidInputError("Pin and pin confirm do not match!")
+        logger.info("Setup my card PIN: PINs match and are valid.")
+        return self.card_setup_native_pin(pin)
+
+    def change_card_pin(self, current_pin, new_pin, new_pin_confirm) -> PinChanged:
+        if not self.cc.card_present:
+            raise CardNotPresentError("No card found! Please insert card.")
+        if self.cc.card_type == "Satodime":
+            raise ControllerError("Satodime has no PIN!")
+        if len(new_pin) < 4:
+            logger.warning("New PIN is too short.")
+            raise InvalidInputError("Pin must contain at least 4 characters")
+        if new_pin != new_pin_confirm:
+            logger.warning("New PINs do not match.")
+            raise InvalidInputError("The PIN values do not match! Please type PIN again!")
+
+        current_pin = list(current_pin.encode('utf8'))
+        new_pin = list(new_pin.encode('utf8'))
         try:
-            logger.info(f"New label to set: {label}")
-
-            if len(label.encode('utf8')) > 64:
-                raise ValueError("Label should be max 64 bytes")
-
-            (response, sw1, sw2) = self.cc.card_set_label(label)
-            if sw1 == 0x90 and sw2 == 0x00:
-                logger.info(f"New label set successfully: {label}")
-                self.view.show("SUCCESS",
-                               f"New label set successfully",
-                               "Ok", self.view.show_start_frame(),
-                               "./pictures_db/edit_label_popup.jpg")
-            else:
-                logger.warning("Failed to set new label.")
-                self.view.show("ERROR", f"Failed to set label (code {hex(sw1*256+sw2)})", "oK",
-                               None, "./pictures_db/edit_label_popup.jpg")
-
-        except Exception as e:
-            logger.error(f"Failed to edit label: {e}")
-            self.view.show("ERROR", f"Failed to edit label: {e}", "Ok", None,
-                           "./pictures_db/edit_label_popup.jpg")
+            (response, sw1, sw2) = self.cc.card_change_PIN(0, current_pin, new_pin)
+        finally:
+            self.session.invalidate(CardSession.CARD_STATUS)  # PIN counter
+            self.session.reset_pin_verified()
+        if sw1 != 0x90 or sw2 != 0x00:
+            logger.error(f"Failed to change PIN with error code: {hex(sw1)}{hex(sw2)}")
+            raise CardOperationError(
+                f"Failed to change PIN with error code: {hex(sw1)}{hex(sw2)}\n Probably too long", 256 * sw1 + sw2)
+
+        logger.info("PIN changed successfully.")
+        event = PinChanged()
+        self.events.publish(event)
+        return event
+
+    def import_seed(self, mnemonic, passphrase=None, seed_future: Optional[Future] = None) -> SeedImported:
+        """Import a seed (and optional passphrase) into a Satochip.
+        seed_future: optional derivation of the seed started beforehand, see SeedDerivationPool.submit()"""
+        try:  # check that seed is valid (in any BIP39 language)
+            Bip39Wordlist.detect(mnemonic)
+        except ValueError:
+            logger.warning("Imported seed is invalid!")
+            raise InvalidInputError("Warning!\nInvalid BIP39 seedphrase, please retry.")
+        logger.info("Imported seed is valid.")
+        if passphrase is not None:
+            if passphrase in ["", " ", "Type your passphrase here"]:  # todo?
+                logger.error("Passphrase is blank or empy")
+                raise InvalidInputError('Wrong passphrase: incorrect or blank')
+        seed = SeedDerivationPool.result(seed_future, mnemonic, passphrase)
+        return self.card_setup_native_seed(seed)
+
+    def edit_label(self, label) -> LabelChanged:
+        logger.info(f"New label to set: {label}")
+
+        if len(label.encode('utf8')) > 64:
+            raise InvalidInputError("Label should be max 64 bytes")
+
+        # verify PIN (must have been requested beforehand, see View.ensure_pin())
+        self.verify_cached_pin()
+
+        (response, sw1, sw2) = self.cc.card_set_label(label)
+        self.session.invalidate(CardSession.LABEL)
+        if sw1 != 0x90 or sw2 != 0x00:
+            logger.warning("Failed to set new label.")
+            raise CardOperationError(f"Failed to set label (code {hex(sw1*256+sw2)})", 256 * sw1 + sw2)
+
+        logger.info(f"New label set successfully: {label}")
+        event = LabelChanged(label)
+        self.events.publish(event)
+        return event
 
     def get_card_label_infos(self):
         """Get label info"""
         if self.cc.card_present:
-            response, sw1, sw2, label = self.cc.card_get_label()
+            label = self.session.get_label()
             if label is None:
                 logger.info("Label is None")
                 return None
@@ -216,11 +282,14 @@ class Controller:
 
                 # verify pin (can throw PinBlockedError or WrongPinError)
                 pin = pin.encode('utf8')
-                self.cc.card_verify_PIN_simple(pin)
+                self.worker.run_sync(self.cc.card_verify_PIN_simple, pin)
+                self.session.set_pin_verified()
                 return
 
             except PinBlockedError as e:
                 logger.error(f"Critical error: Pin blocked: {e}")
+                self.session.invalidate(CardSession.CARD_STATUS)  # PIN counter
+                self.session.reset_pin_verified()
                 self.view.show(
                     'ERROR',
                     "Too many wrong PIN! \nYour card has been blocked.",
@@ -231,82 +300,90 @@ class Controller:
 
             except Exception as e:
                 logger.info(f"Exception from PIN dialog: {e}")
+                self.session.invalidate(CardSession.CARD_STATUS)  # PIN counter
+                self.session.reset_pin_verified()
                 self.view.show(
                     'ERROR', str(e), 'Ok',
                     lambda: None,
                     "./pictures_db/change_pin_popup.jpg"
                 )
 
+    def verify_cached_pin(self):
+        """Verify PIN using the cached value, never prompts the user (safe to call from the card worker).
+        VERIFY PIN is only sent once per card insertion, see CardSession.verify_pin().
+        Raises PinRequiredError if no PIN has been provided yet."""
+        self.session.verify_pin()
+
+    def card_logout(self):
+        """Log out from the card, the PIN must be verified again afterwards"""
+        self.session.reset_pin_verified()
+        if self.header_disk_cache is not None:
+            self.header_disk_cache.forget_keys()
+        if self.cc.card_present and self.cc.card_type != "Satodime":
+            try:
+                self.cc.card_logout_all()
+            except Exception as ex:
+                logger.warning(f"Failed to logout from card: {ex}")
+
     # only for satochip and seedkeeper
-    def card_setup_native_pin(self, pin):
-        try:
-            logger.info("In card_setup_native_pin")
-            logger.info("Setting up card pin and applet references")
-
-            pin_0 = list(pin.encode('utf8'))
-            pin_tries_0 = 0x05
-            ublk_tries_0 = 0x01
-            ublk_0 = list(urandom(16))  # PUK code
-            pin_tries_1 = 0x01
-            ublk_tries_1 = 0x01
-            pin_1 = list(urandom(16))  # Second pin
-            ublk_1 = list(urandom(16))
-            secmemsize = 32  # Number of slots reserved in memory cache
-            memsize = 0x0000  # RFU
-            create_object_ACL = 0x01  # RFU
-            create_key_ACL = 0x01  # RFU
-            create_pin_ACL = 0x01  # RFU
-
-            logger.info("Sending setup native pin command to card")
-            (response, sw1, sw2) = self.cc.card_setup(pin_tries_0, ublk_tries_0, pin_0, ublk_0,
-                                                      pin_tries_1, ublk_tries_1, pin_1, ublk_1,
-                                                      secmemsize, memsize,
-                                                      create_object_ACL, create_key_ACL, create_pin_ACL)
-            logger.info(f"Response from card: {response}, sw1: {hex(sw1)}, sw2: {hex(sw2)}")
-
-            if sw1 != 0x90 or sw2 != 0x00:
-                logger.warning(f"Unable to set up applet! sw12={hex(sw1)} {hex(sw2)}")
-                self.view.show('ERROR', f"Unable to set up applet! sw12={hex(sw1)} {hex(sw2)}")
-                return False
-            else:
-                logger.info("Applet setup successfully")
-                self.view.update_status()
-                self.view.show_start_frame()
-                self.view.show_menu_frame()
-                self.view.show(
-                    'SUCCESS', 'Your card is now setup!', 'Ok',
-                    lambda: None,
-                    "./pictures_db/home_popup.jpg"
-                )
-        except Exception as e:
-            logger.error(f"An error occurred in card_setup_native_pin: {e}", exc_info=True)
+    def card_setup_native_pin(self, pin) -> CardSetupDone:
+        logger.info("In card_setup_native_pin")
+        logger.info("Setting up card pin and applet references")
+
+        pin_0 = list(pin.encode('utf8'))
+        pin_tries_0 = 0x05
+        ublk_tries_0 = 0x01
+        ublk_0 = list(urandom(16))  # PUK code
+        pin_tries_1 = 0x01
+        ublk_tries_1 = 0x01
+        pin_1 = list(urandom(16))  # Second pin
+        ublk_1 = list(urandom(16))
+        secmemsize = 32  # Number of slots reserved in memory cache
+        memsize = 0x0000  # RFU
+        create_object_ACL = 0x01  # RFU
+        create_key_ACL = 0x01  # RFU
+        create_pin_ACL = 0x01  # RFU
+
+        logger.info("Sending setup native pin command to card")
+        (response, sw1, sw2) = self.cc.card_setup(pin_tries_0, ublk_tries_0, pin_0, ublk_0,
+                                                  pin_tries_1, ublk_tries_1, pin_1, ublk_1,
+                                                  secmemsize, memsize,
+                                                  create_object_ACL, create_key_ACL, create_pin_ACL)
+        logger.info(f"Response from card: {response}, sw1: {hex(sw1)}, sw2: {hex(sw2)}")
+
+        if sw1 != 0x90 or sw2 != 0x00:
+            logger.warning(f"Unable to set up applet! sw12={hex(sw1)} {hex(sw2)}")
+            raise CardOperationError(f"Unable to set up applet! sw12={hex(sw1)} {hex(sw2)}", 256 * sw1 + sw2)
+
+        logger.info("Applet setup successfully")
+        self.session.clear()
+        event = CardSetupDone()
+        self.events.publish(event)
+        return event
 
     # only for satochip
-    def card_setup_native_seed(self, seed):
-        # verify pin
-        self.view.update_verify_pin()
+    def card_setup_native_seed(self, seed) -> SeedImported:
+        # verify PIN (must have been requested beforehand, see View.ensure_pin())
+        self.verify_cached_pin()
         # get authentikey
         try:
-            authentikey = self.cc.card_bip32_get_authentikey()
+            self.session.get_authentikey()
         except UninitializedSeedError:
-            # seed dialog...
-            authentikey = self.cc.card_bip32_import_seed(seed)
-            logger.info(f"authentikey: {authentikey}")
-            if authentikey:
-                self.view.show('SUCCESS',
-                               'Your card is now seeded!',
-                               'Ok',
-                               lambda: None,
-                               "./pictures_db/seed_popup.jpg")
-                self.view.update_status()
-                self.view.show_start_frame()
-                self.view.show_menu_frame()
-
-                hex_authentikey = authentikey.get_public_key_hex()
-                logger.info(f"Authentikey={hex_authentikey}")
-            else:
-                self.view.show('ERROR', 'Error when importing seed to Satochip!', 'Ok', None,
-                               "./pictures_db/seed_popup.jpg")
+            pass
+        else:
+            raise ControllerError("Your card is already seeded!")
+
+        authentikey = self.cc.card_bip32_import_seed(seed)
+        self.session.clear()
+        logger.info(f"authentikey: {authentikey}")
+        if not authentikey:
+            raise CardOperationError('Error when importing seed to Satochip!')
+
+        hex_authentikey = authentikey.get_public_key_hex()
+        logger.info(f"Authentikey={hex_authentikey}")
+        event = SeedImported(hex_authentikey)
+        self.events.publish(event)
+        return event
 
     ####################################################################################################################
     """MY SECRETS MANAGEMENT"""
@@ -359,503 +436,334 @@ class Controller:
 
         return nbtotal_logs, nbavail_logs, json_logs
 
-    def seedkeeper_reset_secret(self, sid):
-        logger.debug(f"delete secret with id: {sid}")
-        try:
+    def export_secret(self, sid: int) -> Dict[str, Any]:
+        """Export a secret in plaintext (card worker thread), kept in the secret cache if enabled"""
+        secret = self.cc.seedkeeper_export_secret(sid)
+        if self.secret_cache is not None:
+            self.secret_cache.put(secret)
+        return secret
 
-            # for v1, secret deletion is not supported
-            if self.card_status.get('protocol_version') < 2:
-                raise ValueError("Secret deletion is not supported on Seedkeeper v0.1!")
+    def get_cached_secret(self, secret_header: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Secret exported recently (see export_secret()), or None. No card access, can be called from the Tk thread"""
+        if self.secret_cache is None:
+            return None
+        return self.secret_cache.get(secret_header['id'], secret_header.get('fingerprint'))
 
-            # no need to verify PIN, it has already been done previously
-            response, sw1, sw2, dic = self.cc.seedkeeper_reset_secret(sid)
-            if sw1 == 0x90 and sw2 == 0x00:
-                # remove secret from secret_headers
-                if self.view.secret_headers is not None:
-                    self.view.secret_headers = [d for d in self.view.secret_headers if d.get('id') != sid]
-                    self.view.seedkeeper_secret_headers_need_update = True
+    def seedkeeper_reset_secret(self, sid) -> SecretDeleted:
+        logger.debug(f"delete secret with id: {sid}")
 
-                self.view.show(
-                    "SUCCESS",
-                    f"Secret deleted successfully\nID: {sid}",
-                    "Ok",
-                    self.view.show_seedkeeper_list_secrets(),
-                    "./pictures_db/generate_popup.png"  # todo change icon
-                )
-            elif sw1 == 0x9C and sw2 == 0x08:
-                self.view.show(
-                    "ERROR",
-                    f"Secret not found (code 0x9C08)",
-                    "Ok",
-                    self.view.show_seedkeeper_list_secrets(),
-                    "./pictures_db/generate_popup.png"  # todo change icon
-                )
-            else:
-                raise UnexpectedSW12Error(
-                    f"Unexpected error during object deletion (error code {hex(256 * sw1 + sw2)})")
+        # for v1, secret deletion is not supported
+        if self.card_status.get('protocol_version') < 2:
+            raise ControllerError("Secret deletion is not supported on Seedkeeper v0.1!")
+
+        # no need to verify PIN, it has already been done previously
+        response, sw1, sw2, dic = self.cc.seedkeeper_reset_secret(sid)
+        self.session.invalidate(CardSession.SEEDKEEPER_STATUS)
+        if sw1 == 0x9C and sw2 == 0x08:
+            raise SecretNotFoundError(f"Secret not found (code 0x9C08)", 0x9C08)
+        if sw1 != 0x90 or sw2 != 0x00:
+            raise CardOperationError(
+                f"Unexpected error during object deletion (error code {hex(256 * sw1 + sw2)})", 256 * sw1 + sw2)
+
+        event = SecretDeleted(sid, *self._read_changed_seedkeeper_status())
+        self.events.publish(event)
+        return event
+
+    def list_secret_headers(self, on_header: Optional[Callable[[Dict[str, Any]], None]] = None) -> SecretHeaderStore:
+        """Seedkeeper secret headers (card worker thread, PIN must have been requested beforehand).
+        If this card was already listed and its number of secrets and free memory did not change since,
+        the cached headers are returned instead of listing all secrets again.
+        Otherwise on_header(header) is called (card worker thread) as soon as each header is received,
+        so that the list can be rendered progressively."""
+        self.verify_cached_pin()
+
+        # Seedkeeper status is only available from v0.2
+        seedkeeper_status = None
+        card_id = None
+        if self.session.get_card_status().get('protocol_version') >= 2:
+            seedkeeper_status = self.session.get_seedkeeper_status()
+            card_id = self.session.get_card_id()
+            store = self.header_cache.get(card_id, seedkeeper_status)
+            if store is not None:
+                logger.debug(f"Reusing {len(store)} cached headers")
+                return store
+
+        headers = []
+        limit = seedkeeper_status['nb_secrets'] if seedkeeper_status else None
+        for header in self.iter_secret_headers(limit=limit):
+            headers.append(header)
+            if on_header is not None:
+                on_header(header)
+        store = SecretHeaderStore(headers, seedkeeper_status=seedkeeper_status)
+        if card_id is not None:
+            self.header_cache.put(card_id, store, seedkeeper_status)
+            self._save_secret_headers(store)
+        return store
+
+    def load_saved_secret_headers(self) -> Optional[SecretHeaderStore]:
+        """Headers saved on disk for this card (--cache-headers), not validated against the card yet:
+        the caller shows them immediately, then calls sync_headers() (card worker thread).
+        Return None if there is no usable copy."""
+        if self.header_disk_cache is None:
+            return None
+        self.verify_cached_pin()  # headers are only shown once the PIN is verified, as when listed from the card
+        if self.session.get_card_status().get('protocol_version') < 2:
+            return None
+        saved = self.header_disk_cache.load(self._get_authentikey_bytes())
+        if saved is None:
+            return None
+        headers, seedkeeper_status = saved
+        return SecretHeaderStore(headers, seedkeeper_status=seedkeeper_status)
+
+    def sync_headers(self, store: SecretHeaderStore) -> HeaderSync:
+        """Changes needed to bring store up to date with the card (card worker thread), to be applied with
+        store.apply_sync() on the Tk thread, then cached with cache_secret_headers(). The Seedkeeper status is always
+        read, and headers are only listed if it does not match the store. The applet can only list headers
+        sequentially: the listing stops as soon as nb_secrets headers were received, and only the unknown or changed
+        headers and the ids not seen are returned."""
+        self.verify_cached_pin()
+        generation = self.session.generation
+        known = store.snapshot()  # the store may be modified by the Tk thread meanwhile
+
+        # Seedkeeper status is only available from v0.2
+        if self.session.get_card_status().get('protocol_version') < 2:
+            return store.diff(self.cc.seedkeeper_list_secret_headers())
+
+        seedkeeper_status = self.session.get_seedkeeper_status(refresh=True)
+        key = SecretHeaderCache.get_key(seedkeeper_status)
+        if store.is_loaded and store.seedkeeper_status is not None:
+            # secrets imported or deleted since the last sync (even by this application) change the status:
+            # the number of secrets alone cannot tell an external delete followed by an import
+            if key == SecretHeaderCache.get_key(store.seedkeeper_status):
+                return HeaderSync(seedkeeper_status=seedkeeper_status, generation=generation)
+
+        sync = HeaderSync(seedkeeper_status=seedkeeper_status, generation=generation)
+        for header in self.iter_secret_headers(limit=seedkeeper_status['nb_secrets']):
+            current = known.pop(header['id'], None)
+            if current is None:
+                sync.added.append(header)
+            elif current != header:
+                sync.updated.append(header)
+        sync.removed.extend(known)
+        logger.debug(f"Synced headers: {len(sync.added)} added, {len(sync.updated)} updated, "
+                     f"{len(sync.removed)} removed")
+        return sync
+
+    def iter_secret_headers(self, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the secret headers in card order as each APDU response arrives (card worker thread),
+        unlike cc.seedkeeper_list_secret_headers() that returns once all headers are read.
+        Stops after limit headers if provided (e.g. nb_secrets from the Seedkeeper status)."""
+        apdu = [JCconstants.CardEdge_CLA, 0xA6, 0x00, 0x01]  # p2=0x01: first header, 0x02: next
+        count = 0
+        while limit is None or count < limit:
+            response, sw1, sw2 = self.cc.card_transmit(apdu)
+            if (sw1, sw2) == (0x9C, 0x12):  # no more object
+                return
+            if (sw1, sw2) == (0x9C, 0x04):
+                raise UninitializedSeedError("SeedKeeper is not initialized!")
+            if (sw1, sw2) != (0x90, 0x00):
+                raise UnexpectedSW12Error(f"Unexpected error during object listing (error code {hex(256*sw1+sw2)})")
+            yield self.cc.parser.parse_seedkeeper_header(response)
+            count += 1
+            apdu[3] = 0x02
+
+    def cache_secret_headers(self, store: SecretHeaderStore, headers: List[Dict[str, Any]],
+                             seedkeeper_status: Dict[str, Any], generation: int):
+        """Cache store (card worker thread) once it was brought up to date on the Tk thread, by apply_sync() or after
+        a secret was imported or deleted. headers is the content of store and seedkeeper_status the status it matches,
+        read during generation of the session: nothing is cached if the card was removed or replaced since."""
+        if generation != self.session.generation:
+            logger.debug(f"Secret headers not cached, card changed since generation {generation}")
+            return
+        self.header_cache.put(self.session.get_card_id(), store, seedkeeper_status)
+        self._save_secret_headers(SecretHeaderStore(headers, seedkeeper_status=seedkeeper_status))
+
+    def _read_changed_seedkeeper_status(self) -> Tuple[Optional[Dict[str, Any]], int]:
+        # Seedkeeper status after a secret was imported or deleted (None before v0.2) and session generation
+        generation = self.session.generation
+        if self.session.get_card_status().get('protocol_version') < 2:
+            return None, generation
+        return self.session.get_seedkeeper_status(refresh=True), generation
+
+    def _save_secret_headers(self, store: SecretHeaderStore):
+        if self.header_disk_cache is None:
+            return
+        try:
+            self.header_disk_cache.save(
+                self._get_authentikey_bytes(), store.to_list(), store.seedkeeper_status)
         except Exception as ex:
-            logger.error(f"failed to delete secret with sid {sid}: {str(ex)}")
-            self.view.show(
-                "ERROR",
-                f"Failed to delete secret with sid {sid}.\n{str(ex)}",
-                "Ok",
-                self.view.show_seedkeeper_list_secrets(),
-                "./pictures_db/generate_popup.png"  # todo change icon
-            )
+            logger.warning(f"Failed to save secret headers: {ex}")
+
+    def delete_saved_headers(self):
+        """Delete the on-disk copy of the headers of the card and its key (see HeaderDiskCache), e.g. before a
+        factory reset. The copy is found with the authentikey, so only if it was read since the card was inserted;
+        otherwise the copy stays until it is overwritten."""
+        if self.header_disk_cache is None:
+            return
+        if not self.session.is_cached(CardSession.AUTHENTIKEY):
+            logger.debug("Authentikey unknown, saved secret headers not deleted")
+            return
+        try:
+            self.header_disk_cache.delete(self._get_authentikey_bytes())
+        except Exception as ex:
+            logger.warning(f"Failed to delete saved secret headers: {ex}")
+
+    def _get_authentikey_bytes(self) -> bytes:
+        return self.session.get_authentikey().get_public_key_bytes(compressed=False)
 
     ####################################################################################################################
     """ DECODING SECRETS """
     ####################################################################################################################
 
-    # generic method
+    # generic method, the decoder is selected according to type and subtype (see secretTypes)
     def decode_secret(self, secret: Dict[str, Any]) -> Dict[str, Any]:
-        logger.debug(f"Secret type: {TYPE_DIC.get(secret['type'], 'Unknown type')} and subtype: {secret['subtype']}")
-        if secret['type'] == TYPE_PASSWORD:
-            return self.decode_password(secret)
-        elif secret['type'] == TYPE_MASTERSEED:
-            if secret['subtype'] == 0x00:
-                return self.decode_masterseed(secret)
-            else:
-                return self.decode_masterseed_mnemonic(secret)
-        elif secret['type'] == TYPE_BIP39_MNEMONIC:
-            return self.decode_mnemonic(secret)
-        elif secret['type'] == TYPE_ELECTRUM_MNEMONIC:
-            return self.decode_mnemonic(secret)
-        elif secret['type'] == TYPE_DESCRIPTOR:
-            return self.decode_descriptor(secret)
-        elif secret['type'] == TYPE_DATA:
-            return self.decode_data(secret)
-        elif secret['type'] == TYPE_2FA_SECRET:
-            return self.decode_2fa(secret)
-        elif secret['type'] == TYPE_PUBKEY:
-            return self.decode_pubkey(secret)
-        else:
-            return self.decode_default(secret)
-
-    def decode_password(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
-        logger.info("Decoding password secret")
-        result = secret_dict
-        try:
-            # Initialiser les champs
-            result['password'] = ''
-            result['login'] = ''
-            result['url'] = ''
-
-            # raw secret field
-            # [password_size(1b) | password_bytes | login_size(1b) | login_bytes | url_size(1b) | url_bytes ]
-            secret_bytes = binascii.unhexlify(secret_dict['secret'])
-            offset = 0
-            password_size = secret_bytes[offset]
-            offset += 1
-            password_bytes = secret_bytes[offset:offset + password_size]
-            result['password_bytes'] = password_bytes
-            try:
-                result['password'] = result['secret_decoded'] = password_bytes.decode('utf-8')
-            except Exception as e:
-                logger.error(f"Error during password decoding: {str(e)}")
-                result['password'] = result['secret_decoded'] = f"error during utf8 decoding: {password_bytes.hex()}"
-            offset += password_size
-
-            # login
-            if offset < len(secret_bytes):
-                login_size = secret_bytes[offset]
-                offset += 1
-                if login_size > 0 and (offset + login_size) <= len(secret_bytes):
-                    login_bytes = secret_bytes[offset:offset + login_size]
-                    result['login'] = login_bytes.decode('utf-8')
-                    offset += login_size
-
-            # url
-            if offset < len(secret_bytes):
-                url_size = secret_bytes[offset]
-                offset += 1
-                if url_size > 0 and (offset + url_size) <= len(secret_bytes):
-                    url_bytes = secret_bytes[offset:offset + url_size]
-                    result['url'] = url_bytes.decode('utf-8')
-                else:
-                    result['url'] = ""
-                offset += url_size
-            else:
-                result['url'] = ""
-
-            return result
-
-        except Exception as e:
-            error_msg = f"Error decoding password secret: {str(e)}"
-            logger.error(error_msg)
-            return result
-
-    def decode_mnemonic(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
-        logger.info("Decoding mnemonic secret")
-        result = secret_dict
-        try:
-            # Initialiser les champs
-            secret_bytes = binascii.unhexlify(secret_dict['secret'])
-            offset = 0
-            mnemonic_size = secret_bytes[offset]
-            offset += 1
-            mnemonic_bytes = secret_bytes[offset:offset + mnemonic_size]
-            result['mnemonic'] = result['secret_decoded'] = mnemonic_bytes.decode('utf-8')
-            offset += mnemonic_size
-            passphrase_size = secret_bytes[offset] if offset < len(secret_bytes) else 0
-            offset += 1
-            if passphrase_size > 0 and (offset + passphrase_size) <= len(secret_bytes):
-                passphrase_bytes = secret_bytes[offset:offset + passphrase_size]
-                result['passphrase'] = passphrase_bytes.decode('utf-8')
-            else:
-                result['passphrase'] = ""
-
-            return result
-        except Exception as e:
-            error_msg = f"Error decoding password secret: {str(e)}"
-            logger.error(error_msg)
-            return result
-
-    def decode_masterseed_mnemonic(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
-        logger.info("Decoding masterseed mnemonic secret")
-        result = secret_dict
-        try:
-            # Initialiser les champs
-            secret_bytes = binascii.unhexlify(secret_dict['secret'])
-            offset = 0
-            masterseed_size = secret_bytes[offset]
-            offset += 1
-            masterseed_bytes = secret_bytes[offset:offset + masterseed_size]
-            result['masterseed_bytes'] = masterseed_bytes
-            result['masterseed'] = result['secret_decoded'] = masterseed_bytes.hex()
-            offset += masterseed_size
-
-            # wordlist selector
-            result['wordlist_selector'] = secret_bytes[offset]
-            offset += 1
-
-            # entropy
-            entropy_size = secret_bytes[offset]
-            offset += 1
-            result['entropy'] = secret_bytes[offset:offset + entropy_size]
-            offset += entropy_size
-
-            # Mnemonic recovery from entropy
-            if result['entropy']:
-                mnemonic_instance = Mnemonic("english")  # TODO use according to wordlist_selector!
-                result['mnemonic'] = mnemonic_instance.to_mnemonic(result['entropy'])
-
-            # passphrase
-            if offset < len(secret_bytes):
-                passphrase_size = secret_bytes[offset]
-                offset += 1
-                if passphrase_size > 0 and (offset + passphrase_size) <= len(secret_bytes):
-                    passphrase_bytes = secret_bytes[offset:offset + passphrase_size]
-                    result['passphrase'] = passphrase_bytes.decode('utf-8')
-                else:
-                    result['passphrase'] = ""
-                offset += passphrase_size
-            else:
-                result['passphrase'] = ""
-
-            # descriptor
-            # Extract the descriptor size (first 2 bytes)
-            if (offset + 2) <= len(secret_bytes):
-                descriptor_size = int.from_bytes(secret_bytes[offset:offset+2], byteorder='big')
-                logger.debug(f"Decoded descriptor size: {descriptor_size}")
-                offset += 2
-
-                # Extract and decode the raw descriptor bytes
-                if (offset + descriptor_size) <= len(secret_bytes):
-                    descriptor_bytes = secret_bytes[offset:offset+descriptor_size]
-                    try:
-                        result['descriptor'] = descriptor_bytes.decode('utf-8')
-                    except UnicodeDecodeError:
-                        result['descriptor'] = descriptor_bytes.hex()
-            else:
-                logger.debug(f"No descriptor field")
-                result['descriptor'] = ""
-
-            return result
-        except Exception as e:
-            error_msg = f"Error decoding password secret: {str(e)}"
-            logger.error(error_msg)
-            return result
-
-    def decode_masterseed(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
-        result = self.decode_1byte_secret(secret_dict)
-        result["masterseed"] = result["secret_decoded"]
-        return result
-
-    def decode_2fa(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
-        result = self.decode_1byte_secret(secret_dict)
-        result["secret2fa"] = result["secret_decoded"]
-        return result
-
-    def decode_pubkey(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
-        result = self.decode_1byte_secret(secret_dict)
-        result["pubkey"] = result["secret_decoded"]
-        return result
-
-    def decode_data(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
-        result = self.decode_2bytes_secret(secret_dict)
-        result["data"] = result["secret_decoded"]
-        return result
-
-    def decode_descriptor(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
-        result = self.decode_2bytes_secret(secret_dict)
-        result["descriptor"] = result["secret_decoded"]
-        return result
-
-    "Decoding simple secrets with 1bytes size, like Pubkey, Masterseed & 2FA"
-    def decode_1byte_secret(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
-        logger.info("decode_1byte_secret")
-        result = secret_dict
-        try:
-            # Initialiser les champs
-            secret_bytes = binascii.unhexlify(secret_dict['secret'])
-            offset = 0
-            secret_size = secret_bytes[offset]
-            offset += 1
-            secret1b_bytes = secret_bytes[offset:offset + secret_size]
-            result['secret_bytes'] = secret1b_bytes
-            result['secret_decoded'] = secret1b_bytes.hex()
-
-            return result
-        except Exception as e:
-            error_msg = f"Unexpected error during 1byte secret decoding: {str(e)}"
-            logger.error(error_msg)
-            result['secret_decoded'] = error_msg
-            return result
-
-    "Decoding secrets with 2bytes size, like Data & Descriptor"
-    def decode_2bytes_secret(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
-        logger.info("decode_2bytes_secret start")
-        result = secret_dict
-        try:
-            # Initialiser les champs
-            secret_bytes = binascii.unhexlify(secret_dict['secret'])
-
-            # Extract the text size (first 2 bytes)
-            if len(secret_bytes) < 2:
-                result["secret_decoded"] = "Failed to decode data (not enough bytes)"
-                return result
-
-            secret_size = int.from_bytes(secret_bytes[:2], byteorder='big')
-            logger.debug(f"Decoded text size: {secret_size}")
-
-            # Extract and decode the raw text bytes
-            secret2b_bytes = secret_bytes[2:2 + secret_size]
+        secret_type = secretTypes.get_secret_type(secret['type'], secret['subtype'])
+        logger.info(f"Decoding {secret_type.name} secret (type: {hex(secret['type'])}, subtype: {secret['subtype']})")
+        return secret_type.decode(secret)
+
+    def decode_secrets(self, secrets: Iterable[Dict[str, Any]]) -> Iterator[DecodedSecret]:
+        """Decode a stream of exported secrets in one pass (e.g. export all or verification after a backup).
+        Secrets are decoded lazily and yielded in order, the SecretType is resolved once per (type, subtype).
+        Errors are reported in the results and summarized in a single log once the stream is consumed."""
+        secret_types: Dict[Tuple[int, int], secretTypes.SecretType] = {}
+        counts: Dict[str, int] = {}
+        errors = 0
+        for secret in secrets:
+            key = (secret['type'], secret['subtype'])
+            secret_type = secret_types.get(key)
+            if secret_type is None:
+                secret_type = secret_types[key] = secretTypes.get_secret_type(*key)
+            counts[secret_type.name] = counts.get(secret_type.name, 0) + 1
             try:
-                result['secret_decoded'] = secret2b_bytes.decode('utf-8')
-            except UnicodeDecodeError:
-                result['secret_decoded'] = secret2b_bytes.hex()
-
-            return result
-
-        except Exception as e:
-            error_msg = f"Unexpected error during 2bytes secret decoding: {str(e)}"
-            logger.error(error_msg)
-            result['secret_decoded'] = error_msg
-            return result
-
-    "Decoding default for unsupported secret format"
-    def decode_default(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
-        logger.info("decode_default")
-        result = secret_dict
-        try:
-            # Initialiser les champs
-            secret_bytes = binascii.unhexlify(secret_dict['secret'])
-            result['secret_bytes'] = secret_bytes
-            result['secret_decoded'] = secret_bytes.hex()
-            return result
-        except Exception as e:
-            error_msg = f"Unexpected error during secret default decoding: {str(e)}"
-            logger.error(error_msg)
-            result['secret_decoded'] = error_msg
-            return result
+                fields, error = secret_type.decode_fields(secret['secret']), None
+            except Exception as ex:
+                fields, error = {}, secret_type.decode_error(ex)
+                errors += 1
+            yield DecodedSecret(secret.get('id'), secret.get('label'), secret.get('fingerprint'), secret_type,
+                                fields, error)
+        logger.info(f"Decoded {sum(counts.values())} secrets {counts} with {errors} errors")
 
     ##########################
     """ IMPORTING SECRETS """
     ##########################
 
-    def generate_random_seed(self, mnemonic_length):
+    def generate_random_seed(self, mnemonic_length, language: str = "english"):
         logger.info(f"generate_random_seed length {mnemonic_length}")
-        strength = 128 if mnemonic_length == 12 else 256
-        mnemonic = Mnemonic("english").generate(strength=strength)
+        mnemonic = Bip39Wordlist.get(language).generate(strength=get_strength(mnemonic_length))
         return mnemonic
 
-    def import_password(self, label: str, password: str, login: str, url: str = None):
-        logger.info("import_password start")
+    def generate_random_seeds(self, count: int, mnemonic_length: int = 12, language: str = "english") -> List[str]:
+        """Generate count mnemonics at once (single read of the entropy source, see Bip39Wordlist.generate_batch())"""
+        logger.info(f"generate_random_seeds {count} mnemonics of length {mnemonic_length}")
+        return Bip39Wordlist.get(language).generate_batch(count, strength=get_strength(mnemonic_length))
+
+    def import_secret(self, label: str, secret_type: int, *values, subtype: Optional[int] = None,
+                      export_rights: int = 0x01, verify_pin: bool = False):
+        """Encode and import a secret of any registered type (see secretTypes), values are the arguments of the
+        encoder of this type (bytes, already utf-8 encoded for text fields).
+        If verify_pin, the cached PIN is verified once the secret is encoded (see verify_cached_pin()).
+        Returns (sid, fingerprint), exceptions should be managed in the calling method."""
+        entry = secretTypes.get_secret_type(secret_type, subtype)
+        if subtype is None:
+            subtype = entry.subtype or 0x00  # SECRET_SUBTYPE_DEFAULT
+        logger.info(f"import_secret start ({entry.name})")
 
         # perform some checks
-        # exceptions should be managed in the calling method
         if not label:
             raise ValueError("The label field is mandatory.")
-        if not password:
-            raise ValueError("No password provided!")
-
         if len(label.encode('utf-8')) > 127:
-            logger.debug(f"Label is too long (max 127 bytes):  {len(label.encode('utf-8'))}")
             raise ValueError("Label is too long (max 127 bytes)!")
-
-        if len(password.encode('utf-8')) > 255:
-            raise ValueError("Password is too long (max 255 bytes)!")
-
-        if login:
-            if len(login.encode('utf-8')) > 255:
-                raise ValueError("Login is too long (max 255 bytes)!")
-
-        if url:
-            if len(url.encode('utf-8')) > 255:
-                raise ValueError("Url is too long (max 255 bytes)!")
-
-        # encode secret
-        secret_encoded = bytes([len(password.encode('utf-8'))]) + password.encode('utf-8')
-        if login != "":
-            secret_encoded += bytes([len(login.encode('utf-8'))]) + login.encode('utf-8')
-        if url != "":
-            secret_encoded += bytes([len(url.encode('utf-8'))]) + url.encode('utf-8')
+        secret_list = list(entry.encode(*values))
 
         # for v1, secret size is limited to 255 bytes
         if self.card_status.get('protocol_version') < 2:
-            if len(secret_encoded) > 255:
+            if len(secret_list) > 255:
                 raise ValueError("Payload is too long for Seedkeeper v1 (max 255 bytes)!")
 
-        # create dict object for import
-        secret_type = TYPE_PASSWORD  # password
-        export_rights = 0x01  # export in plaintext allowed by default
         secret_dic = {
-            'header': self.cc.make_header(secret_type, export_rights, label),
-            'secret_list': list(secret_encoded)
+            'header': self.cc.make_header(secret_type, export_rights, label, subtype=subtype),
+            'secret_list': secret_list
         }
 
-        # verify PIN
-        self.view.update_verify_pin()
+        # verify PIN (must have been requested beforehand, see View.ensure_pin())
+        if verify_pin:
+            self.verify_cached_pin()
 
         # import encoded secret into card
         try:
             sid, fingerprint = self.cc.seedkeeper_import_secret(secret_dic)
+            self.session.invalidate(CardSession.SEEDKEEPER_STATUS)
         except UnexpectedSW12Error as ex:
             if "0x9c01" in str(ex):  # no memory left
                 raise ValueError("Not enough memory available!")
             else:
                 raise
 
-        # update secret_headers if it is already populated and set flag
-        # if secret_headers is None, we will have to regenerate it completely
-        if self.view.secret_headers is not None:
-            secret_header = {
-                'label': label,
-                'type': secret_type,
-                'subtype': 0x00,
-                'export_rights': export_rights,
-                'id': sid,
-                'fingerprint': fingerprint
-            }
-            self.view.secret_headers = [secret_header] + self.view.secret_headers  # prepend
-            self.view.seedkeeper_secret_headers_need_update = True
-
-        logger.info(f"Password imported successfully with id: {sid} and fingerprint: {fingerprint}")
+        # the view prepends the header to its secret_headers (if populated) and records the new status,
+        # see View.on_controller_event()
+        secret_header = {
+            'label': label,
+            'type': secret_type,
+            'subtype': subtype,
+            'export_rights': export_rights,
+            'id': sid,
+            'fingerprint': fingerprint
+        }
+        self.events.publish(SecretImported(secret_header, *self._read_changed_seedkeeper_status()))
 
+        logger.info(f"{entry.name} imported successfully with id: {sid} and fingerprint: {fingerprint}")
         return sid, fingerprint
 
-    def import_masterseed_mnemonic(self, label: str, mnemonic: str, passphrase: Optional[str] = None, descriptor: Optional[str] = None):
-        logger.info("001 Starting masterseed import process")
+    def import_password(self, label: str, password: str, login: str, url: str = None):
+        logger.info("import_password start")
 
         # perform some checks
         # exceptions should be managed in the calling method
         if not label:
             raise ValueError("The label field is mandatory.")
-        if not mnemonic:
-            raise ValueError("No mnemonic provided!")
-
-        if len(label.encode('utf-8')) > 127:
-            raise ValueError("Label is too long (max 127 bytes)!")
-
-        if passphrase:
-            if len(passphrase.encode('utf-8')) > 255:
-                raise ValueError("Passphrase is too long (max 255 bytes)!")
-
-        if descriptor:
-            if len(descriptor.encode('utf-8')) > 65535:
-                raise ValueError("descriptor is too long (max 65535 bytes)!")
-
-        # Validate the mnemonic
-        # mnemonic = mnemonic.strip()
-        # word_count = len(mnemonic.split())
-        # if word_count not in [12, 24]:
-        #     raise ValueError(f"002 Invalid mnemonic word count: {word_count}. Must be 12 or 24.")
-
-        # Verify mnemonic validity
-        MNEMONIC = Mnemonic("english")
-        if not MNEMONIC.check(mnemonic):
-            raise ValueError("Invalid mnemonic")
+        if not password:
+            raise ValueError("No password provided!")
 
-        # Generate entropy from mnemonic
-        entropy = MNEMONIC.to_entropy(mnemonic)
-
-        # Generate seed
-        salt = "mnemonic" + (passphrase or "")
-        seed = hashlib.pbkdf2_hmac("sha512", mnemonic.encode("utf-8"), salt.encode("utf-8"), 2048)
-
-        # Prepare the secret data
-        wordlist_selector = 0x00  # english
-        entropy_list = list(entropy)
-        seed_list = list(seed)
-        passphrase_list = list(passphrase.encode('utf-8')) if passphrase else []
-        descriptor_list = list(descriptor.encode('utf-8')) if descriptor else []
-
-        secret_list = (
-                [len(seed_list)] +
-                seed_list +
-                [wordlist_selector] +
-                [len(entropy_list)] +
-                entropy_list +
-                [len(passphrase_list)] +
-                passphrase_list +
-                list(len(descriptor_list).to_bytes(2, byteorder='big')) +
-                descriptor_list
+        # each field is encoded once, for size checks and encoding
+        # (an empty login is kept if an url is provided, see secretCodec.encode_password())
+        return self.import_secret(
+            label, TYPE_PASSWORD, password.encode('utf-8'),
+            login.encode('utf-8') if login else b"", url.encode('utf-8') if url else b"",
+            verify_pin=True,
         )
 
-        # for v1, secret size is limited to 255 bytes
-        if self.card_status.get('protocol_version') < 2:
-            if len(secret_list) > 255:
-                raise ValueError("Payload is too long for Seedkeeper v1 (max 255 bytes)!")
-
-        # Prepare the header
-        secret_type = TYPE_MASTERSEED
-        export_rights = 0x01  # SECRET_EXPORT_ALLOWED
-        subtype = 0x01  # SECRET_SUBTYPE_BIP39
-
-        secret_dic = {
-            'header': self.cc.make_header(secret_type, export_rights, label, subtype=subtype),
-            'secret_list': secret_list
-        }
+    def import_masterseed_mnemonic(self, label: str, mnemonic: str, passphrase: Optional[str] = None,
+                                   descriptor: Optional[str] = None, language: Optional[str] = None,
+                                   seed_future: Optional[Future] = None):
+        """Import a BIP39 mnemonic with its masterseed, the wordlist is detected if language is None
+        (see constants.BIP39_WORDLIST_DIC for supported languages).
+        seed_future: optional derivation of the masterseed started beforehand, see SeedDerivationPool.submit()"""
+        logger.info("001 Starting masterseed import process")
 
-        # verify PIN
-        self.view.update_verify_pin()
+        # perform some checks
+        # exceptions should be managed in the calling method
+        if not label:
+            raise ValueError("The label field is mandatory.")
+        if not mnemonic:
+            raise ValueError("No mnemonic provided!")
 
-        # Import the secret
+        # Verify mnemonic validity and generate entropy from mnemonic
+        wordlist = Bip39Wordlist.detect(mnemonic) if language is None else Bip39Wordlist.get(language)
         try:
-            sid, fingerprint = self.cc.seedkeeper_import_secret(secret_dic)
-        except UnexpectedSW12Error as ex:
-            if "0x9c01" in str(ex):  # no memory left
-                raise ValueError("Not enough memory available!")
-            else:
-                raise
+            entropy = wordlist.to_entropy(mnemonic)
+        except (ValueError, LookupError):
+            raise ValueError("Invalid mnemonic")
 
-        # update secret_headers if it is already populated and set flag
-        # if secret_headers is None, we will have to regenerate it completely
-        if self.view.secret_headers is not None:
-            secret_header = {
-                'label': label,
-                'type': secret_type,
-                'subtype': 0x01,
-                'export_rights': export_rights,
-                'id': sid,
-                'fingerprint': fingerprint
-            }
-            self.view.secret_headers = [secret_header] + self.view.secret_headers  # prepend
-            self.view.seedkeeper_secret_headers_need_update = True
-
-        logger.info(f"Masterseed imported successfully with id: {sid} and fingerprint: {fingerprint}")
-        return sid, fingerprint
+        # Generate seed (unless derived beforehand)
+        seed = SeedDerivationPool.result(seed_future, mnemonic, passphrase)
+
+        # Import the secret (SECRET_SUBTYPE_BIP39)
+        logger.debug(f"Mnemonic wordlist: {wordlist.language}")
+        return self.import_secret(
+            label, TYPE_MASTERSEED, seed, wordlist.selector, entropy,
+            passphrase.encode('utf-8') if passphrase else b"", descriptor.encode('utf-8') if descriptor else b"",
+            subtype=0x01, verify_pin=True,
+        )
 
     def import_data(self, label: str, data: str):
         logger.info("import_data start")
@@ -866,52 +774,7 @@ class Controller:
         if not data:
             raise ValueError("Data is required")
 
-        # Prepare the secret data
-        secret_type = TYPE_DATA
-        secret_subtype = 0x00  # SECRET_SUBTYPE_DEFAULT
-        export_rights = 0x01  # SECRET_EXPORT_ALLOWED
-
-        # Encode the data
-        data_bytes = data.encode('utf-8')
-        data_size = len(data_bytes)
-        secret_list = list(data_size.to_bytes(2, byteorder='big')) + list(data_bytes)
-
-        # for v1, secret size is limited to 255 bytes
-        if self.card_status.get('protocol_version') < 2:
-            if len(secret_list) > 255:
-                raise ValueError("Payload is too long for Seedkeeper v1 (max 255 bytes)!")
-
-        # Prepare the secret dictionary
-        secret_dic = {
-            'header': self.cc.make_header(secret_type, export_rights, label, subtype=secret_subtype),
-            'secret_list': secret_list
-        }
-
-        # Import the secret
-        try:
-            sid, fingerprint = self.cc.seedkeeper_import_secret(secret_dic)
-        except UnexpectedSW12Error as ex:
-            if "0x9c01" in str(ex):  # no memory left
-                raise ValueError("Not enough memory available!")
-            else:
-                raise
-
-        # update secret_headers if it is already populated and set flag
-        # if secret_headers is None, we will have to regenerate it completely
-        if self.view.secret_headers is not None:
-            secret_header = {
-                'label': label,
-                'type': secret_type,
-                'subtype': secret_subtype,
-                'export_rights': export_rights,
-                'id': sid,
-                'fingerprint': fingerprint
-            }
-            self.view.secret_headers = [secret_header] + self.view.secret_headers  # prepend
-            self.view.seedkeeper_secret_headers_need_update = True
-
-        logger.info(f"Data imported successfully with id: {sid} and fingerprint: {fingerprint}")
-        return sid, fingerprint
+        return self.import_secret(label, TYPE_DATA, data.encode('utf-8'))
 
     def import_wallet_descriptor(self, label: str, wallet_descriptor: str):
         logger.info("Starting import of wallet descriptor")
@@ -922,110 +785,17 @@ class Controller:
         if not wallet_descriptor:
             raise ValueError("Wallet descriptor is required")
 
-        # Prepare the secret data
-        secret_type = TYPE_DESCRIPTOR
-        secret_subtype = 0x00  # SECRET_SUBTYPE_DEFAULT
-        export_rights = 0x01  # SECRET_EXPORT_ALLOWED
-
-        # Encode the wallet descriptor
-        descriptor_bytes = wallet_descriptor.encode('utf-8')
-        descriptor_size = len(descriptor_bytes)
-        secret_list = list(descriptor_size.to_bytes(2, byteorder='big')) + list(descriptor_bytes)
-
-        if descriptor_size > 65535:  # 2^16 - 1, max value for 2 bytes
-            raise ValueError("Wallet descriptor is too long (max 65535 bytes)")
-
-        # for v1, secret size is limited to 255 bytes
-        if self.card_status.get('protocol_version') < 2:
-            if len(secret_list) > 255:
-                raise ValueError("Payload is too long for Seedkeeper v1 (max 255 bytes)!")
-
-        # Prepare the secret dictionary
-        secret_dic = {
-            'header': self.cc.make_header(secret_type, export_rights, label, subtype=secret_subtype),
-            'secret_list': secret_list
-        }
-
-        # Import the secret
-        try:
-            sid, fingerprint = self.cc.seedkeeper_import_secret(secret_dic)
-        except UnexpectedSW12Error as ex:
-            if "0x9c01" in str(ex):  # no memory left
-                raise ValueError("Not enough memory available!")
-            else:
-                raise
-
-        # update secret_headers if it is already populated and set flag
-        if self.view.secret_headers is not None:
-            # if secret_headers is None, we will have to regenerate it completely
-            secret_header = {
-                'label': label,
-                'type': secret_type,  # todo unify 'type' entry (either str or byte)
-                'subtype': secret_subtype,
-                'export_rights': export_rights,
-                'id': sid,
-                'fingerprint': fingerprint
-            }
-            self.view.secret_headers = [secret_header] + self.view.secret_headers  # prepend
-            self.view.seedkeeper_secret_headers_need_update = True
-
-        logger.info(f"Wallet descriptor imported successfully with id: {sid} and fingerprint: {fingerprint}")
-        return id, fingerprint
+        return self.import_secret(label, TYPE_DESCRIPTOR, wallet_descriptor.encode('utf-8'))
 
     def import_pubkey(self, label: str, pubkey_bytes: bytes):
         logger.info("import_pubkey start")
 
         # Validate input
-        if label:
-            if len(label.encode('utf-8')) > 127:
-                raise ValueError("Label is too long (max 127 bytes)!")
-        else:
+        if not label:
             raise ValueError("The label field is mandatory")
-
-        if pubkey_bytes:
-            if len(pubkey_bytes) > 255:
-                raise ValueError("Pubkey is too long (max 255 bytes)!")
-        else:
+        if not pubkey_bytes:
             raise ValueError("Pubkey is required")
 
-        # Prepare the secret data
-        secret_type = TYPE_PUBKEY
-        secret_subtype = 0x00  # SECRET_SUBTYPE_DEFAULT
-        export_rights = 0x01  # SECRET_EXPORT_ALLOWED
-
-        # Encode the pubkey
         # pubkey_bytes should be in uncompressed format
-        secret_encoded = bytes([len(pubkey_bytes)]) + pubkey_bytes
-
-        # Prepare the secret dictionary
-        secret_dic = {
-            'header': self.cc.make_header(secret_type, export_rights, label, subtype=secret_subtype),
-            'secret_list': list(secret_encoded)
-        }
-
-        # Import the secret
-        try:
-            sid, fingerprint = self.cc.seedkeeper_import_secret(secret_dic)
-        except UnexpectedSW12Error as ex:
-            if "0x9c01" in str(ex):  # no memory left
-                raise ValueError("Not enough memory available!")
-            else:
-                raise
-
-        # update secret_headers if it is already populated and set flag
-        # if secret_headers is None, we will have to regenerate it completely
-        if self.view.secret_headers is not None:
-            secret_header = {
-                'label': label,
-                'type': secret_type,
-                'subtype': secret_subtype,
-                'export_rights': export_rights,
-                'id': sid,
-                'fingerprint': fingerprint
-            }
-            self.view.secret_headers = [secret_header] + self.view.secret_headers  # prepend
-            self.view.seedkeeper_secret_headers_need_update = True
-
-        logger.info(f"Pubkey imported successfully with id: {sid} and fingerprint: {fingerprint}")
-        return sid, fingerprint
+        return self.import_secret(label, TYPE_PUBKEY, pubkey_bytes)
 
@@ -0,0 +1,114 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+####################################################################################################################
+""" ERRORS """
+
+
+class ControllerError(Exception):
+    """Operation not possible with the current card"""
+
+
+class InvalidInputError(ControllerError, ValueError):
+    """Value provided by the user is invalid (PIN size, label size, mnemonic...), message can be shown as is"""
+
+
+class CardOperationError(ControllerError):
+    """Card returned an unexpected status word"""
+
+    def __init__(self, msg: str, sw: Optional[int] = None):
+        super().__init__(msg)
+        self.sw = sw
+
+
+class SecretNotFoundError(CardOperationError):
+    """Seedkeeper secret not found (code 0x9C08)"""
+
+
+####################################################################################################################
+""" EVENTS """
+
+# Events are returned by the Controller methods and published on Controller.events
+
+
+@dataclass(frozen=True)
+class CardSetupDone:
+    pass
+
+
+@dataclass(frozen=True)
+class PinChanged:
+    pass
+
+
+@dataclass(frozen=True)
+class LabelChanged:
+    label: str
+
+
+@dataclass(frozen=True)
+class SeedImported:
+    authentikey_hex: str
+
+
+@dataclass(frozen=True)
+class SecretImported:
+    header: Dict[str, Any] = field(hash=False)
+    # Seedkeeper status read after the import (None before v0.2) and CardSession.generation when it was read
+    seedkeeper_status: Optional[Dict[str, Any]] = field(default=None, hash=False)
+    generation: Optional[int] = None
+
+    @property
+    def sid(self) -> int:
+        return self.header['id']
+
+    @property
+    def fingerprint(self) -> str:
+        return self.header['fingerprint']
+
+
+@dataclass(frozen=True)
+class SecretDeleted:
+    sid: int
+    # same as SecretImported
+    seedkeeper_status: Optional[Dict[str, Any]] = field(default=None, hash=False)
+    generation: Optional[int] = None
+
+
+class EventBus:
+    """
+    Observer bus between the Controller and its clients (View, CLI, benchmarks).
+
+    Callbacks are called synchronously in the publishing thread, usually the card worker thread:
+    GUI subscribers must forward the event to the Tk thread (see View.subscribe_controller_events).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._subscribers: List[Tuple[Type, Callable[[Any], None]]] = []
+
+    def subscribe(self, event_type: Type, callback: Callable[[Any], None]):
+        """Call callback(event) for each published event that is an instance of event_type"""
+        with self.lock:
+            self._subscribers.append((event_type, callback))
+
+    def unsubscribe(self, callback: Callable[[Any], None]):
+        with self.lock:
+            self._subscribers = [(t, cb) for (t, cb) in self._subscribers if cb != callback]
+
+    def publish(self, event):
+        logger.debug(f"Event: {event}")
+        with self.lock:
+            subscribers = list(self._subscribers)
+        for event_type, callback in subscribers:
+            if isinstance(event, event_type):
+                try:
+                    callback(event)
+                except Exception as ex:
+                    logger.error(f"Event subscriber failed for {event}: {ex}", exc_info=True)
@@ -2,6 +2,7 @@ import customtkinter
 import logging
 from pysatochip.version import PYSATOCHIP_VERSION
 
+from cardSession import CardSnapshot
 from frameWidgetHeader import FrameWidgetHeader
 from version import VERSION
 
@@ -105,49 +106,54 @@ class FrameCardAbout(customtkinter.CTkFrame):
             # SATODIME specific
             # TODO
 
-            self.update_frame()
+            # card data is fetched in update_frame(), called by master.show_about_frame()
             self.place(relx=1.0, rely=0.5, anchor="e")
 
         except Exception as e:
             logger.error(f"An unexpected error occurred in FrameCardAbout init: {e}", exc_info=True)
 
     def unlock(self):
-        self.master.update_verify_pin()
-        self.update_frame()
+        if self.master.ensure_pin():
+            self.update_frame()
 
     def update_frame(self):
         logger.debug("FrameCardAbout update_frame start")
         if self.master.controller.cc.card_present:
+            snapshot = self.master.controller.session.cached_snapshot()
+            if snapshot is not None:
+                # nothing changed since last fetch, render from memory
+                self.render_card_data(snapshot)
+                return
+            # card data is fetched by the card worker, then rendered on the Tk thread
+            self.master.run_card_job(
+                self.master.controller.fetch_card_snapshot,
+                on_success=self.render_card_data,
+                busy_msg="Reading card information...",
+            )
 
-            # get card data
-            response, sw1, sw2, card_status = self.master.controller.cc.card_get_status()
-            applet_full_version_string = f"{card_status['protocol_major_version']}.{card_status['protocol_minor_version']}-{card_status['applet_major_version']}.{card_status['applet_minor_version']}"
-            protocol_version = card_status['protocol_version']
+    def render_card_data(self, snapshot: CardSnapshot):
+        logger.debug("FrameCardAbout render_card_data start")
+        if snapshot.card_present:
 
             # generic info no pin needed
 
             # applet version
-            self.applet_version.configure(text=f"Applet version: {applet_full_version_string}")
+            self.applet_version.configure(text=f"Applet version: {snapshot.applet_version_string}")
             # nfc
-            if self.master.controller.cc.nfc_policy == 0:
+            if snapshot.nfc_policy == 0:
                 self.nfc.configure(text=f"NFC: [enabled]")
-            elif self.master.controller.cc.nfc_policy == 1:
+            elif snapshot.nfc_policy == 1:
                 self.nfc.configure(text=f"NFC: [disabled]")
             else:
                 self.nfc.configure(text=f"NFC: [blocked]")
 
             # requires PIN (or satodime)
 
-            if self.master.controller.cc.card_type == "Satodime" or self.master.controller.cc.is_pin_set():
-                if self.master.controller.cc.card_type != "Satodime":
-                    self.master.controller.cc.card_verify_PIN_simple()
-
+            if snapshot.is_unlocked:
                 self.unlock_button.place_forget()
 
-                self.card_label.configure(text=f"Label: [{self.master.controller.get_card_label_infos()}]")
-
-                is_authentic, txt_ca, txt_subca, txt_device, txt_error = self.master.controller.cc.card_verify_authenticity()
-                self.card_genuine.configure(text=f"Genuine: [YES]" if is_authentic else "Genuine: [NO]")
+                self.card_label.configure(text=f"Label: [{snapshot.label}]")
+                self.card_genuine.configure(text=f"Genuine: [YES]" if snapshot.is_authentic else "Genuine: [NO]")
             else:
                 # pin needed from user
                 self.card_label.configure(text=f"Label: [PIN required]")
@@ -155,48 +161,46 @@ class FrameCardAbout(customtkinter.CTkFrame):
                 self.unlock_button.place(relx=0.65, rely=self.rely_button, anchor="nw")
 
             # card status
-            if self.master.controller.cc.card_type == "Satodime":
+            if snapshot.card_type == "Satodime":
                 self.card_status.configure(
-                    text="Card setup" if self.master.controller.cc.setup_done else "Card not setup"
+                    text="Card setup" if snapshot.setup_done else "Card not setup"
                 )
             else:
-                if self.master.controller.cc.setup_done:
+                if snapshot.setup_done:
                     self.card_status.configure(
-                        text=f"Card setup, PIN counter: [{card_status['PIN0_remaining_tries']}] tries remaining",
+                        text=f"Card setup, PIN counter: [{snapshot.pin_tries_remaining}] tries remaining",
                     )
                 else:
                     self.card_status.configure(text="Card requires setup")
 
             # Satochip Specific
-            if self.master.controller.cc.card_type == "Satochip":
+            if snapshot.card_type == "Satochip":
                 rely = self.rely
                 self.seedkeeper_memory.place_forget()
                 self.seedkeeper_nb_secrets.place_forget()
                 self.card_configuration.configure(text="Satochip configuration")
                 # seeded
                 self.satochip_seeded.configure(
-                    text=f"Card seeded" if self.master.controller.cc.is_seeded else f"Card not seeded"
+                    text=f"Card seeded" if snapshot.is_seeded else f"Card not seeded"
                 )
                 self.satochip_seeded.place(relx=0.05, rely=rely, anchor="nw")
                 rely += 0.05
                 # 2FA
                 self.satochip_2FA.configure(
-                    text=f"2FA enabled" if self.master.controller.cc.needs_2FA else f"2FA disabled"
+                    text=f"2FA enabled" if snapshot.needs_2FA else f"2FA disabled"
                 )
                 self.satochip_2FA.place(relx=0.05, rely=rely, anchor="nw")
                 rely += 0.05
 
             # Seedkeeper Specific
-            elif self.master.controller.cc.card_type == "SeedKeeper":
+            elif snapshot.card_type == "SeedKeeper":
                 self.satochip_seeded.place_forget()
                 self.satochip_2FA.place_forget()
                 self.card_configuration.configure(text="Seedkeeper configuration")
                 # get seedkeeper status (seedkeeper v0.2+ and PIN required!)
-                if protocol_version >= 2:
-                    if self.master.controller.cc.is_pin_set():
-                        self.master.controller.cc.card_verify_PIN_simple()
-                        response, sw1, sw2, seedkeeper_status = self.master.controller.cc.seedkeeper_get_status()
-                        logger.debug(f"seedkeeper_status: {seedkeeper_status}")
+                if snapshot.protocol_version >= 2:
+                    if snapshot.seedkeeper_status is not None:
+                        seedkeeper_status = snapshot.seedkeeper_status
                         # memory
                         self.seedkeeper_memory.configure(
                             text=f"Memory available:  {seedkeeper_status.get('free_memory')}/{seedkeeper_status.get('total_memory')} bytes"
@@ -208,13 +212,6 @@ class FrameCardAbout(customtkinter.CTkFrame):
                     else:
                         self.seedkeeper_memory.configure(text="Memory available: [PIN required]")
                         self.seedkeeper_nb_secrets.configure(text="Number of secrets: [PIN required]")
-
-                    # # place info fields
-                    # rely = self.rely
-                    # self.seedkeeper_memory.place(relx=0.05, rely=rely, anchor="nw")
-                    # rely += 0.05
-                    # self.seedkeeper_nb_secrets.place(relx=0.05, rely=rely, anchor="nw")
-                    # rely += 0.05
                 else:
                     # no info available for seedkeeper v0.1
                     self.seedkeeper_memory.configure(text="Memory available: [not available on v0.1]")
@@ -227,6 +224,6 @@ class FrameCardAbout(customtkinter.CTkFrame):
                 rely += 0.05
 
             # Satodime Specific
-            if self.master.controller.cc.card_type == "Satodime":
+            if snapshot.card_type == "Satodime":
                 # TODO
                 pass
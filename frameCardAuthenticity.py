@@ -137,32 +137,44 @@ class FrameCardAuthenticity(customtkinter.CTkFrame):
 
         if self.master.controller.cc.card_present:
             logger.info("FrameCardAuthenticity update_frame() Card detected: checking authenticity")
-            is_authentic, self.txt_ca, self.txt_subca, self.txt_device, self.txt_error = self.master.controller.cc.card_verify_authenticity()
-            if self.txt_error != "":
-                self.txt_device = self.txt_error + "\n------------------\n" + self.txt_device
-
-            if is_authentic:
-                icon_image = Image.open("./pictures_db/genuine_card.jpg")
-                icon = customtkinter.CTkImage(light_image=icon_image, size=(30, 30))
-                self.icon_label.configure(
-                    require_redraw=True,
-                    image=icon,
-                    text=f"Your card is authentic. ",
-                )
-                self.text_box.configure(require_redraw=True, height= 228)
-            else:
-                icon_image = Image.open("./pictures_db/not_genuine_card.jpg")
-                icon = customtkinter.CTkImage(light_image=icon_image, size=(30, 30))
-                self.icon_label.configure(
-                    require_redraw=True,
-                    image=icon,
-                    text="Your card is not authentic. ",
-                )
-                self.text_box.configure(require_redraw=True, height=150)
-                self.text_warning1.configure(text="Warning!")
-                self.text_warning2.configure(text="We could not authenticate the issuer of this card.")
-                self.text_warning3.configure(text="If you did not load the card applet by yourself, be extremely careful!")
-                self.text_warning4.configure(text="Contact support@satochip.io to report any suspicious device.")
-
-            # update text_box content
-            self.update_radio_selection()
+
+            def verify_authenticity():
+                self.master.controller.verify_cached_pin()
+                return self.master.controller.session.get_authenticity()
+
+            self.master.run_card_job(
+                verify_authenticity,
+                on_success=self.render_authenticity,
+                busy_msg="Checking card authenticity...",
+            )
+
+    def render_authenticity(self, result):
+        is_authentic, self.txt_ca, self.txt_subca, self.txt_device, self.txt_error = result
+        if self.txt_error != "":
+            self.txt_device = self.txt_error + "\n------------------\n" + self.txt_device
+
+        if is_authentic:
+            icon_image = Image.open("./pictures_db/genuine_card.jpg")
+            icon = customtkinter.CTkImage(light_image=icon_image, size=(30, 30))
+            self.icon_label.configure(
+                require_redraw=True,
+                image=icon,
+                text=f"Your card is authentic. ",
+            )
+            self.text_box.configure(require_redraw=True, height= 228)
+        else:
+            icon_image = Image.open("./pictures_db/not_genuine_card.jpg")
+            icon = customtkinter.CTkImage(light_image=icon_image, size=(30, 30))
+            self.icon_label.configure(
+                require_redraw=True,
+                image=icon,
+                text="Your card is not authentic. ",
+            )
+            self.text_box.configure(require_redraw=True, height=150)
+            self.text_warning1.configure(text="Warning!")
+            self.text_warning2.configure(text="We could not authenticate the issuer of this card.")
+            self.text_warning3.configure(text="If you did not load the card applet by yourself, be extremely careful!")
+            self.text_warning4.configure(text="Contact support@satochip.io to report any suspicious device.")
+
+        # update text_box content
+        self.update_radio_selection()
@@ -83,19 +83,27 @@ class FrameCardChangePin(customtkinter.CTkFrame):
             # todo: check PIN format, show error msg
             self.finish_button = master.create_button(
                 "Change PIN",
-                lambda: master.controller.change_card_pin(
-                    self.current_pin_entry.get(), self.new_pin_entry.get(), self.confirm_new_pin_entry.get()
-                ),
+                lambda: self.change_pin(),
                 frame=self
             )
             self.finish_button.place(relx=0.8, rely=0.9, anchor="w")
-            self.bind('<Return>', lambda event: master.controller.change_card_pin(
-                self.current_pin_entry.get(),
-                self.new_pin_entry.get(),
-                self.confirm_new_pin_entry.get())
-            )
+            self.bind('<Return>', lambda event: self.change_pin())
 
             self.place(relx=1.0, rely=0.5, anchor="e")
 
         except Exception as e:
-            logger.error(f"An unexpected error occurred in FrameCardChangePin init: {e}", exc_info=True)
\ No newline at end of file
+            logger.error(f"An unexpected error occurred in FrameCardChangePin init: {e}", exc_info=True)
+
+    def change_pin(self):
+        def on_pin_changed(event):
+            self.master.show("SUCCESS", "PIN changed successfully!", 'Ok',
+                             None, "./pictures_db/change_pin_popup.jpg")
+            self.master.show_start_frame()
+
+        self.master.run_card_job(
+            self.master.controller.change_card_pin,
+            self.current_pin_entry.get(), self.new_pin_entry.get(), self.confirm_new_pin_entry.get(),
+            on_success=on_pin_changed,
+            on_error=self.master.error_popup("Failed to change PIN.", "./pictures_db/change_pin_popup.jpg"),
+            busy_msg="Changing PIN...",
+        )
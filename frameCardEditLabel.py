@@ -79,5 +79,14 @@ class FrameCardEditLabel(customtkinter.CTkFrame):
             logger.error(f"An unexpected error occurred in FrameCardEditLabel init: {e}", exc_info=True)
 
     def change_label(self, new_label):
-        self.master.update_verify_pin()
-        self.master.controller.edit_label(new_label)
\ No newline at end of file
+        def on_label_changed(event):
+            self.master.show("SUCCESS", f"New label set successfully", "Ok",
+                             self.master.show_start_frame, "./pictures_db/edit_label_popup.jpg")
+
+        if self.master.ensure_pin():
+            self.master.run_card_job(
+                self.master.controller.edit_label, new_label,
+                on_success=on_label_changed,
+                on_error=self.master.error_popup("Failed to edit label:", "./pictures_db/edit_label_popup.jpg"),
+                busy_msg="Setting label...",
+            )
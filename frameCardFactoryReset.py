@@ -114,10 +114,12 @@ class FrameCardFactoryReset(customtkinter.CTkFrame):
                 if master.controller.cc.card_present:
 
                     # reset cached list of headers since card state will change
-                    self.master.secret_headers = None
+                    self.master.reset_secret_headers()
+                    self.master.controller.header_cache.invalidate()
+                    self.master.controller.delete_saved_headers()
 
                     # get card version
-                    response, sw1, sw2, card_status = self.master.controller.cc.card_get_status()
+                    card_status = master.controller.worker.run_sync(master.controller.session.get_card_status)
                     applet_version = card_status['protocol_major_version']*256 + card_status['protocol_minor_version']
 
                     if master.controller.cc.card_type == "SeedKeeper":
@@ -171,12 +173,13 @@ class FrameCardFactoryReset(customtkinter.CTkFrame):
             try:
                 logger.info("click_reset_button attempting to reset the card (V1)")
 
-                (response, sw1, sw2) = self.master.controller.cc.card_reset_factory_signal()
+                (response, sw1, sw2) = self.master.controller.worker.run_sync(
+                    self.master.controller.cc.card_reset_factory_signal)
                 logger.info(f"card_reset_factory response: {hex(256 * sw1 + sw2)}")
                 if sw1 == 0xFF and sw2 == 0x00:
                     logger.info("Factory reset successful. Disconnecting the card.")
                     self.master.controller.cc.set_mode_factory_reset(False)
-                    self.master.controller.cc.card_disconnect()
+                    self.master.controller.worker.run_sync(self.master.controller.cc.card_disconnect)
                     msg = 'The card has been reset to factory\nRemaining counter: 0'
                     self.master.show('SUCCESS', msg, "Ok", lambda: self.master.restart_app(),
                               "./pictures_db/reset_popup.jpg")
@@ -216,7 +219,8 @@ class FrameCardFactoryReset(customtkinter.CTkFrame):
 
                 pin = urandom(6) # random pin
                 try:
-                    (response, sw1, sw2) = self.master.controller.cc.card_verify_PIN_simple(pin)
+                    (response, sw1, sw2) = self.master.controller.worker.run_sync(
+                        self.master.controller.cc.card_verify_PIN_simple, pin)
                     if sw1 == 0x90 and sw2 == 0x00:
                         logger.debug("correct PIN entered, factory reset is aborted")
                 except PinBlockedError as ex:
@@ -240,14 +244,17 @@ class FrameCardFactoryReset(customtkinter.CTkFrame):
                     import traceback
                     print(traceback.format_exc())
 
-                response, sw1, sw2, card_status = self.master.controller.cc.card_get_status()
+                # PIN counter has changed, refresh status
+                card_status = self.master.controller.worker.run_sync(
+                    lambda: self.master.controller.session.get_card_status(refresh=True))
                 if card_status["PIN0_remaining_tries"] == 0:
                     # at this point, pin is blocked, now block the puk
                     while True:
                         puk = urandom(16)  # random puk
                         puk_list = list(puk)
                         try:
-                            (response, sw1, sw2) = self.master.controller.cc.card_unblock_PIN(0, puk_list)
+                            (response, sw1, sw2) = self.master.controller.worker.run_sync(
+                                self.master.controller.cc.card_unblock_PIN, 0, puk_list)
                         except WrongPinError as ex:
                             logger.debug(f"Wrong PUK! {ex.pin_left} tries remaining!")
                         except PinBlockedError as ex:
@@ -256,6 +263,7 @@ class FrameCardFactoryReset(customtkinter.CTkFrame):
                             # Card reset to factory
                             logger.debug(f"CARD RESET TO FACTORY!")
                             self.master.controller.cc.setup_done = False  # force update cc state
+                            self.master.controller.session.clear()
                             self.master.appMode = ApplicationMode.Normal
                             self.master.show(
                                 'SUCCESS',
@@ -1,8 +1,10 @@
 import customtkinter
 import logging
 
+from bip39Wordlist import MNEMONIC_LENGTHS
 from constants import BUTTON_COLOR
 from frameWidgetHeader import FrameWidgetHeader
+from frameWidgetMnemonicFeedback import FrameWidgetMnemonicFeedback
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -59,13 +61,12 @@ class FrameCardImportSeed(customtkinter.CTkFrame):
                     self.text_box.delete("1.0", "end")
 
             def update_radio_mnemonic_length():
-                if self.radio_value_mnemonic.get() == "generate_12":
-                    self.mnemonic_length = 12
-                elif self.radio_value_mnemonic.get() == "generate_24":
-                    self.mnemonic_length = 24
+                # radio values are "generate_12", "generate_15"... "generate_24"
+                self.mnemonic_length = int(self.radio_value_mnemonic.get().split("_")[1])
 
                 mnemonic = master.controller.generate_random_seed(self.mnemonic_length)
                 master.update_textbox(self.text_box, mnemonic)
+                self.mnemonic_feedback.update_frame()  # starts the seed derivation
 
             def update_radio_selection():
                 if self.radio_value.get() == "import":
@@ -74,8 +75,8 @@ class FrameCardImportSeed(customtkinter.CTkFrame):
                     self.cancel_button.place(relx=0.6, rely=0.9, anchor="w")
                     self.radio_button_generate_seed.place_forget()
                     self.radio_button_import_seed.place_forget()
-                    self.radio_button_generate_12_words.place_forget()
-                    self.radio_button_generate_24_words.place_forget()
+                    for radio_button in self.radio_buttons_generate_words.values():
+                        radio_button.place_forget()
                     self.text_box.place_forget()
                     self.warning_label.place_forget()
                     self.radio_button_import_seed.place(relx=0.05, rely=0.35, anchor="w")
@@ -84,6 +85,8 @@ class FrameCardImportSeed(customtkinter.CTkFrame):
                     self.text_box.insert(text="Type your existing seedphrase here", index=1.0)
                     self.text_box.bind("<FocusIn>", on_text_box_click)
                     self.text_box.place(relx=0.13, rely=0.45, anchor="w")
+                    self.mnemonic_feedback.reset()
+                    self.mnemonic_feedback.place(relx=0.14, rely=0.535, anchor="w")
                     self.checkbox_passphrase.place(relx=0.13, rely=0.58, anchor="w")
                     update_checkbox_passphrase()
                     self.radio_button_generate_seed.place(relx=0.05, rely=0.75, anchor="w")
@@ -99,10 +102,12 @@ class FrameCardImportSeed(customtkinter.CTkFrame):
                     self.text_box.delete(1.0, "end")
                     self.text_box.place_forget()
                     self.warning_label.place_forget()
+                    self.mnemonic_feedback.reset()
+                    self.mnemonic_feedback.place_forget()
                     self.radio_button_import_seed.place(relx=0.05, rely=0.35, anchor="w")
                     self.radio_button_generate_seed.place(relx=0.05, rely=0.41, anchor="w")
-                    self.radio_button_generate_12_words.place(relx=0.17, rely=0.47, anchor="w")
-                    self.radio_button_generate_24_words.place(relx=0.37, rely=0.47, anchor="w")
+                    for index, radio_button in enumerate(self.radio_buttons_generate_words.values()):
+                        radio_button.place(relx=0.17 + 0.14 * index, rely=0.47, anchor="w")
                     self.text_box.configure(width=550, height=96) #height=80
                     self.text_box.place(relx=0.16, rely=0.58, anchor="w")
                     self.warning_label.place(relx=0.36, rely=0.69, anchor="w") # rely=0.64
@@ -118,6 +123,7 @@ class FrameCardImportSeed(customtkinter.CTkFrame):
                         self.passphrase_entry.configure(placeholder_text="Type your passphrase here")
                     else:
                         self.passphrase_entry.place_forget()
+                    self.mnemonic_feedback.prepare_seed()
 
                 elif self.radio_value.get() == "generate":
                     if self.checkbox_passphrase_value.get() == "on":
@@ -127,6 +133,7 @@ class FrameCardImportSeed(customtkinter.CTkFrame):
                         self.passphrase_entry.configure(placeholder_text="Type your passphrase here")
                     else:
                         self.passphrase_entry.place_forget()
+                    self.mnemonic_feedback.prepare_seed()
 
             # Setting up radio buttons and entry fields
             self.radio_button_import_seed = customtkinter.CTkRadioButton(
@@ -150,26 +157,19 @@ class FrameCardImportSeed(customtkinter.CTkFrame):
             )
             self.radio_button_generate_seed.place(relx=0.05, rely=0.42, anchor="w")
 
-            self.radio_button_generate_12_words = customtkinter.CTkRadioButton(
-                self,
-                text="12 words",
-                variable=self.radio_value_mnemonic,
-                value="generate_12",
-                font=customtkinter.CTkFont(family="Outfit", size=14, weight="normal"),
-                bg_color="whitesmoke", fg_color="green",
-                hover_color="green",
-                command=update_radio_mnemonic_length
-            )
-            self.radio_button_generate_24_words = customtkinter.CTkRadioButton(
-                self,
-                text="24 words",
-                variable=self.radio_value_mnemonic,
-                value="generate_24",
-                font=customtkinter.CTkFont(family="Outfit", size=14, weight="normal"),
-                bg_color="whitesmoke", fg_color="green",
-                hover_color="green",
-                command=update_radio_mnemonic_length
-            )
+            # one radio button per mnemonic length (12, 15, 18, 21 or 24 words)
+            self.radio_buttons_generate_words = {}
+            for mnemonic_length in MNEMONIC_LENGTHS:
+                self.radio_buttons_generate_words[mnemonic_length] = customtkinter.CTkRadioButton(
+                    self,
+                    text=f"{mnemonic_length} words",
+                    variable=self.radio_value_mnemonic,
+                    value=f"generate_{mnemonic_length}",
+                    font=customtkinter.CTkFont(family="Outfit", size=14, weight="normal"),
+                    bg_color="whitesmoke", fg_color="green",
+                    hover_color="green",
+                    command=update_radio_mnemonic_length
+                )
 
             self.checkbox_passphrase = customtkinter.CTkCheckBox(
                 self,
@@ -181,6 +181,7 @@ class FrameCardImportSeed(customtkinter.CTkFrame):
             )
 
             self.passphrase_entry = master.create_entry(frame=self)
+            self.passphrase_entry.bind("<KeyRelease>", lambda event: self.mnemonic_feedback.prepare_seed())
 
             self.text_box = customtkinter.CTkTextbox(
                 self, corner_radius=20,
@@ -191,6 +192,12 @@ class FrameCardImportSeed(customtkinter.CTkFrame):
                 font=customtkinter.CTkFont(family="Outfit", size=13, weight="normal")
             )
 
+            # live validation of the seedphrase typed (shown in import mode only), the seed is derived
+            # as soon as the seedphrase is valid
+            self.mnemonic_feedback = FrameWidgetMnemonicFeedback(
+                self, self.text_box, placeholder="Type your existing seedphrase here",
+                get_seed_args=self.get_seed_args)
+
             self.warning_label = customtkinter.CTkLabel(
                 self,
                 text="Your mnemonic is important, be sure to save it in a safe place!",
@@ -207,16 +214,33 @@ class FrameCardImportSeed(customtkinter.CTkFrame):
 
             self.finish_button = master.create_button(  # will be placed after mnemonic is generated
                 "Import",
-                command=lambda: [
-                    master.controller.import_seed(
-                        self.text_box.get(1.0, "end-1c"),
-                        self.passphrase_entry.get() if (self.checkbox_passphrase_value.get() == "on") else None,
-                    ),
-                ],
+                command=lambda: self.import_seed(),
                 frame=self
             )
 
             self.place(relx=1.0, rely=0.5, anchor="e")
 
         except Exception as e:
-            logger.error(f"An unexpected error occurred in FrameCardImportSeed init: {e}", exc_info=True)
\ No newline at end of file
+            logger.error(f"An unexpected error occurred in FrameCardImportSeed init: {e}", exc_info=True)
+
+    def get_seed_args(self):
+        """Seedphrase and passphrase as imported by import_seed()"""
+        mnemonic = self.text_box.get(1.0, "end-1c")
+        passphrase = self.passphrase_entry.get() if (self.checkbox_passphrase_value.get() == "on") else None
+        return mnemonic, passphrase
+
+    def import_seed(self):
+        def on_seed_imported(event):
+            self.mnemonic_feedback.cancel_seed()
+            self.master.show('SUCCESS', 'Your card is now seeded!', 'Ok',
+                             lambda: None, "./pictures_db/seed_popup.jpg")
+
+        if self.master.ensure_pin():
+            mnemonic, passphrase = self.get_seed_args()
+            self.master.run_card_job(
+                self.master.controller.import_seed,
+                mnemonic, passphrase, self.mnemonic_feedback.get_seed_future(mnemonic, passphrase),
+                on_success=on_seed_imported,
+                on_error=self.master.error_popup("Failed to import seed.", "./pictures_db/seed_popup.jpg"),
+                busy_msg="Importing seed to card...",
+            )
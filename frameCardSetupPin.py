@@ -75,9 +75,7 @@ class FrameCardSetupPin(customtkinter.CTkFrame):
             # todo: check PIN format, show error msg
             self.finish_button = master.create_button(
                 "Save PIN",
-                lambda: [
-                    master.controller.setup_card_pin(self.new_pin_entry.get(), self.confirm_new_pin_entry.get()),
-                ],
+                lambda: self.setup_pin(),
                 frame=self
             )
             self.finish_button.place(relx=0.8, rely=0.9, anchor="w")
@@ -90,3 +88,15 @@ class FrameCardSetupPin(customtkinter.CTkFrame):
 
         except Exception as e:
             logger.error(f"An unexpected error occurred in FrameCardSetupPin init: {e}", exc_info=True)
+
+    def setup_pin(self):
+        def on_card_setup(event):
+            self.master.show('SUCCESS', 'Your card is now setup!', 'Ok',
+                             lambda: None, "./pictures_db/home_popup.jpg")
+
+        self.master.run_card_job(
+            self.master.controller.setup_card_pin, self.new_pin_entry.get(), self.confirm_new_pin_entry.get(),
+            on_success=on_card_setup,
+            on_error=self.master.error_popup("Unable to set up applet!", "./pictures_db/change_pin_popup.jpg"),
+            busy_msg="Setting up card...",
+        )
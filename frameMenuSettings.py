@@ -121,20 +121,22 @@ class FrameMenuSettings(customtkinter.CTkFrame):
 
     def update_frame(self, require_redraw: bool = True):
         logger.debug("FrameMenuSetting update_frame() start")
-        logger.debug(f"FrameMenuSetting update_frame() card_present: {self.master.controller.cc.card_present}")
-        logger.debug(f"FrameMenuSetting update_frame() card_type: {self.master.controller.cc.card_type}")
-        logger.debug(f"FrameMenuSetting update_frame() setup_done: {self.master.controller.cc.setup_done}")
-        logger.debug(f"FrameMenuSetting update_frame() is_seeded: {self.master.controller.cc.is_seeded}")
-
-        if self.master.controller.cc.card_present:
-            if self.master.controller.cc.card_type == "Satochip":
+        # render from memory, see Controller.fetch_card_snapshot()
+        snapshot = self.master.controller.get_card_snapshot()
+        logger.debug(f"FrameMenuSetting update_frame() card_present: {snapshot.card_present}")
+        logger.debug(f"FrameMenuSetting update_frame() card_type: {snapshot.card_type}")
+        logger.debug(f"FrameMenuSetting update_frame() setup_done: {snapshot.setup_done}")
+        logger.debug(f"FrameMenuSetting update_frame() is_seeded: {snapshot.is_seeded}")
+
+        if snapshot.card_present:
+            if snapshot.card_type == "Satochip":
                 self.button_factory_reset.configure(state="normal")
-                if self.master.controller.cc.setup_done:
+                if snapshot.setup_done:
                     self.button_change_pin.configure(state="normal")
                     self.button_edit_label.configure(state="normal")
                     self.button_check_auth.configure(state="normal")
                     self.button_about.configure(state="normal")
-                    if self.master.controller.cc.is_seeded:
+                    if snapshot.is_seeded:
                         photo_image = self.master.convert_name_to_photo_image("setup_done.jpg")
                         self.button_status.configure(
                             require_redraw,
@@ -163,9 +165,9 @@ class FrameMenuSettings(customtkinter.CTkFrame):
                     self.button_check_auth.configure(state="disabled")
                     self.button_about.configure(state="disabled")
 
-            if self.master.controller.cc.card_type == "SeedKeeper":
+            if snapshot.card_type == "SeedKeeper":
                 self.button_factory_reset.configure(state="normal")
-                if self.master.controller.cc.setup_done:
+                if snapshot.setup_done:
                     photo_image = self.master.convert_name_to_photo_image("setup_done.jpg")
                     self.button_status.configure(
                         require_redraw,
@@ -190,8 +192,8 @@ class FrameMenuSettings(customtkinter.CTkFrame):
                     self.button_check_auth.configure(state="disabled")
                     self.button_about.configure(state="disabled")
 
-            if self.master.controller.cc.card_type == "Satodime":
-                if self.master.controller.cc.setup_done:
+            if snapshot.card_type == "Satodime":
+                if snapshot.setup_done:
                     photo_image = self.master.convert_name_to_photo_image("setup_done.jpg")
                     self.button_status.configure(
                         require_redraw,
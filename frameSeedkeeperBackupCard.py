@@ -6,6 +6,7 @@ from framePopup import FramePopup
 from frameWidgetHeader import FrameWidgetHeader
 from utils import get_fingerprint_from_authentikey_bytes
 from constants import BG_MAIN_MENU, BG_HOVER_BUTTON
+from secretHeaderStore import SecretHeaderStore
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -91,7 +92,7 @@ class FrameSeedkeeperBackupCard(customtkinter.CTkFrame):
 
         # reset state
         self.reset_backup_state()
-        self.master.secret_headers = None  # reset cached list of headers since multiple cards will be inserted/removed
+        self.master.reset_secret_headers()  # reset cached list of headers since multiple cards will be inserted/removed
 
         def on_next_button():
             self.master_pairing()
@@ -109,22 +110,30 @@ class FrameSeedkeeperBackupCard(customtkinter.CTkFrame):
         self.label_instruction.configure(text_color=BG_MAIN_MENU)
         self.next_button.configure(text="Next")
 
-        def on_next_button():
+        def pair_master_card():
             # verify PIN
-            self.master.update_verify_pin()
+            self.master.controller.verify_cached_pin()
             # hack: recover master pin from cc
             self.master_pin = bytes(self.master.controller.cc.pin)
 
             # get authentikey
-            self.master_authentikey = self.master.controller.cc.card_bip32_get_authentikey()
+            self.master_authentikey = self.master.controller.session.get_authentikey()
             logger.debug(f"master_authentikey: {self.master_authentikey.get_public_key_hex(compressed=False)}")
 
             # get list of secret headers
-            self.master_secret_headers = self.master.controller.cc.seedkeeper_list_secret_headers()
+            self.master_secret_headers = SecretHeaderStore(self.master.controller.cc.seedkeeper_list_secret_headers())
             logger.debug(f"Fetched {len(self.master_secret_headers)} headers from card")
 
-            # proceed to next screen
-            self.backup_pairing()
+        def on_next_button():
+            if not self.master.ensure_pin():
+                return
+            # proceed to next screen once master card is paired
+            self.master.run_card_job(
+                pair_master_card,
+                on_success=lambda result: self.backup_pairing(),
+                on_error=self.on_step_error,
+                busy_msg="Pairing master card...",
+            )
 
         self.next_button.configure(command=lambda: on_next_button())
 
@@ -138,80 +147,39 @@ class FrameSeedkeeperBackupCard(customtkinter.CTkFrame):
         self.label_instruction.configure(text_color=BG_HOVER_BUTTON)
         self.next_button.configure(text="Next")
 
-        def on_next_button():
-
-            # check card is already setup:
-            def on_setup_required_button():
-                self.master.appMode = ApplicationMode.Normal  # reset application mode
-                self.reset_backup_state()  # reset state
-                self.master.show_setup_card_frame()
-                self.master.show_menu_frame()
-                #self.master.show_start_frame()
-
-            if self.master.controller.cc.card_present:
-                if not self.master.controller.cc.setup_done:
-                    FramePopup(
-                        self.master,
-                        'ERROR',
-                        'This card has not been setup. \nExit backup process, setup the card then start again!',
-                        'Ok',
-                        lambda: on_setup_required_button(),
-                        "./pictures_db/change_pin_popup.jpg"
-                    )
-                    return
-            else:
-                FramePopup(
-                    self.master,
-                    'ERROR',
-                    'No card found! \nPlease insert backup card then try again.',
-                    'Ok',
-                    None,
-                    "./pictures_db/change_pin_popup.jpg"
-                )
-                return
-
-            # verify PIN
-            self.master.controller.PIN_dialog(f'Enter the PIN of your BACKUP card')
-            # hack: recover master pin from cc
+        def pair_backup_card():
+            # hack: recover backup pin from cc
             self.backup_pin = bytes(self.master.controller.cc.pin)
 
             # get authentikey
-            self.backup_authentikey = self.master.controller.cc.card_bip32_get_authentikey()
+            self.backup_authentikey = self.master.controller.session.get_authentikey()
             logger.debug(f"backup_authentikey: {self.backup_authentikey.get_public_key_hex(compressed=False)}")
 
             # check it is different from master
             if (self.backup_authentikey.get_public_key_bytes(compressed=False) ==
                     self.master_authentikey.get_public_key_bytes(compressed=False)):
-                self.master.show(
-                    'ERROR',
-                    'This is your MASTER card.\nPlease insert your BACKUP card and try again!',
-                    'Ok',
-                    None,
-                    "./pictures_db/change_pin_popup.jpg"
-                )
-                return
+                raise ValueError('This is your MASTER card.\nPlease insert your BACKUP card and try again!')
 
             # get list of headers from backup
-            self.backup_secret_headers = self.master.controller.cc.seedkeeper_list_secret_headers()
+            self.backup_secret_headers = SecretHeaderStore(self.master.controller.cc.seedkeeper_list_secret_headers())
             logger.debug(f"Fetched {len(self.backup_secret_headers)} headers from backup card")
 
             # find secrets that are on master but not yet on backup, based on fingerprint
             self.secret_headers_to_backup = []
-            logger.debug(f"backup self.master_secret_headers: {self.master_secret_headers}")
+            logger.debug(f"backup self.master_secret_headers: {self.master_secret_headers.to_list()}")
             for header in self.master_secret_headers:
                 # check if already in backup
                 logger.debug(f"backup pairing header from master_secret_headers: {header}")
                 secret_fingerprint = header['fingerprint']
-                if not any(d['fingerprint'] == secret_fingerprint for d in self.backup_secret_headers):
+                if not self.backup_secret_headers.has_fingerprint(secret_fingerprint):
                     # does not exist!
                     self.secret_headers_to_backup.append(header)
             logger.debug(f"Fetched {len(self.secret_headers_to_backup)} headers to backup")
 
             # check if master authentikey is already in backup or import it
             master_authentikey_fingerprint = get_fingerprint_from_authentikey_bytes(self.master_authentikey.get_public_key_bytes(compressed=False))
-            authentikey_found = next((item for item in self.backup_secret_headers if item['fingerprint'] == master_authentikey_fingerprint), None)
+            authentikey_found = self.backup_secret_headers.get_by_fingerprint(master_authentikey_fingerprint)
 
-            #if not any(d['fingerprint'] == master_authentikey_fingerprint for d in self.backup_secret_headers):
             if authentikey_found is None:
                 # does not exist in backup=> import it
                 self.master_authentikey_id, fingerprint = self.master.controller.import_pubkey(
@@ -225,8 +193,50 @@ class FrameSeedkeeperBackupCard(customtkinter.CTkFrame):
                 logger.debug(f"master authentikey already imported to backup")
                 self.master_authentikey_id = authentikey_found['id']
 
-            # proceed to next screen
-            self.master_export_secrets()
+        def on_next_button():
+
+            # check card is already setup:
+            def on_setup_required_button():
+                self.master.appMode = ApplicationMode.Normal  # reset application mode
+                self.reset_backup_state()  # reset state
+                self.master.show_setup_card_frame()
+                self.master.show_menu_frame()
+                #self.master.show_start_frame()
+
+            if self.master.controller.cc.card_present:
+                if not self.master.controller.cc.setup_done:
+                    FramePopup(
+                        self.master,
+                        'ERROR',
+                        'This card has not been setup. \nExit backup process, setup the card then start again!',
+                        'Ok',
+                        lambda: on_setup_required_button(),
+                        "./pictures_db/change_pin_popup.jpg"
+                    )
+                    return
+            else:
+                FramePopup(
+                    self.master,
+                    'ERROR',
+                    'No card found! \nPlease insert backup card then try again.',
+                    'Ok',
+                    None,
+                    "./pictures_db/change_pin_popup.jpg"
+                )
+                return
+
+            # verify PIN
+            self.master.controller.PIN_dialog(f'Enter the PIN of your BACKUP card')
+            if not self.master.controller.cc.is_pin_set():
+                return
+
+            # proceed to next screen once backup card is paired
+            self.master.run_card_job(
+                pair_backup_card,
+                on_success=lambda result: self.master_export_secrets(),
+                on_error=self.on_step_error,
+                busy_msg="Pairing backup card...",
+            )
 
         self.next_button.configure(command=lambda: on_next_button())
 
@@ -240,77 +250,64 @@ class FrameSeedkeeperBackupCard(customtkinter.CTkFrame):
         self.label_instruction.configure(text_color=BG_MAIN_MENU)
         self.next_button.configure(text="Next")
 
-        def on_next_button():
-            try:
-                # verify PIN with cached pin
-                self.master.controller.cc.card_verify_PIN_simple(self.master_pin)
-
-                # check authentikey match
-                authentikey = self.master.controller.cc.card_bip32_get_authentikey()
-                if (authentikey.get_public_key_bytes(compressed=False) !=
-                        self.master_authentikey.get_public_key_bytes(compressed=False)):
-                    self.master.show(
-                        'ERROR',
-                        'Wrong card!\nPlease insert your MASTER card and try again.',
-                        'Ok',
-                        None,
-                        "./pictures_db/change_pin_popup.jpg"
-                    )
-                    return
+        def export_secrets_from_master():
+            # verify PIN with cached pin
+            self.master.controller.session.verify_pin(self.master_pin)
 
-                # check if backup authentikey is already in master, or import it
-                backup_authentikey_fingerprint = get_fingerprint_from_authentikey_bytes(
-                    self.backup_authentikey.get_public_key_bytes(compressed=False))
-                authentikey_found = next((item for item in self.master_secret_headers if
-                                          item['fingerprint'] == backup_authentikey_fingerprint), None)
-                if authentikey_found is None:
-                    # does not exist in master=> import it
-                    self.backup_authentikey_id, fingerprint = self.master.controller.import_pubkey(
-                        label=f"backup authentikey #{backup_authentikey_fingerprint}",
-                        pubkey_bytes=self.backup_authentikey.get_public_key_bytes(compressed=False)
-                    )
-                    logger.debug(f"imported backup authentikey to master")
-                    logger.debug(f"imported backup authentikey id: {self.backup_authentikey_id}")
-                    logger.debug(f"imported backup authentikey fingerprint: {fingerprint}")
-                else:
-                    logger.debug(f"backup authentikey already imported to backup")
-                    self.backup_authentikey_id = authentikey_found['id']
-
-                # export encrypted secret using backup authentikey for pairing
-                for header in self.secret_headers_to_backup:
-                    try:
-                        secret = self.master.controller.cc.seedkeeper_export_secret(
-                            sid=header['id'],
-                            sid_pubkey=self.backup_authentikey_id,
-                        )
-                        self.secrets_to_backup += [secret]
-                        logger.debug(f"exported secret with label: {secret['label']} and id: {secret['id']}")
-                        logger.debug(f"exported secret using self.backup_authentikey_id: {self.backup_authentikey_id}")
-                        logger.debug(f"exported secret: {secret}")
-                    except Exception as e:
-                        logger.error(f"Error during secret export: {e}", exc_info=True)
-                        self.is_backup_error = True
-                        error_dic = {
-                            'msg': 'str(e)',
-                            'id': header['id'],
-                            'label': header['label']
-                        }
-                        self.backup_logs += [error_dic]
+            # check authentikey match
+            authentikey = self.master.controller.session.get_authentikey()
+            if (authentikey.get_public_key_bytes(compressed=False) !=
+                    self.master_authentikey.get_public_key_bytes(compressed=False)):
+                raise ValueError('Wrong card!\nPlease insert your MASTER card and try again.')
 
-                logger.debug(f"exported {len(self.secrets_to_backup)} secrets")
+            # check if backup authentikey is already in master, or import it
+            backup_authentikey_fingerprint = get_fingerprint_from_authentikey_bytes(
+                self.backup_authentikey.get_public_key_bytes(compressed=False))
+            authentikey_found = self.master_secret_headers.get_by_fingerprint(backup_authentikey_fingerprint)
+            if authentikey_found is None:
+                # does not exist in master=> import it
+                self.backup_authentikey_id, fingerprint = self.master.controller.import_pubkey(
+                    label=f"backup authentikey #{backup_authentikey_fingerprint}",
+                    pubkey_bytes=self.backup_authentikey.get_public_key_bytes(compressed=False)
+                )
+                logger.debug(f"imported backup authentikey to master")
+                logger.debug(f"imported backup authentikey id: {self.backup_authentikey_id}")
+                logger.debug(f"imported backup authentikey fingerprint: {fingerprint}")
+            else:
+                logger.debug(f"backup authentikey already imported to backup")
+                self.backup_authentikey_id = authentikey_found['id']
 
-                # proceed to next screen
-                self.backup_import_secrets()
+            # export encrypted secret using backup authentikey for pairing
+            for header in self.secret_headers_to_backup:
+                try:
+                    secret = self.master.controller.cc.seedkeeper_export_secret(
+                        sid=header['id'],
+                        sid_pubkey=self.backup_authentikey_id,
+                    )
+                    self.secrets_to_backup += [secret]
+                    logger.debug(f"exported secret with label: {secret['label']} and id: {secret['id']}")
+                    logger.debug(f"exported secret using self.backup_authentikey_id: {self.backup_authentikey_id}")
+                    logger.debug(f"exported secret: {secret}")
+                except Exception as e:
+                    logger.error(f"Error during secret export: {e}", exc_info=True)
+                    self.is_backup_error = True
+                    error_dic = {
+                        'msg': 'str(e)',
+                        'id': header['id'],
+                        'label': header['label']
+                    }
+                    self.backup_logs += [error_dic]
 
-            except Exception as e:
-                logger.error(f"Init error : {e}", exc_info=True)
-                self.master.show(
-                    'ERROR',
-                    str(e),
-                    'Ok',
-                    None,
-                    "./pictures_db/change_pin_popup.jpg"
-                )
+            logger.debug(f"exported {len(self.secrets_to_backup)} secrets")
+
+        def on_next_button():
+            # proceed to next screen once secrets are exported
+            self.master.run_card_job(
+                export_secrets_from_master,
+                on_success=lambda result: self.backup_import_secrets(),
+                on_error=self.on_step_error,
+                busy_msg="Exporting secrets from master card...",
+            )
 
         self.next_button.configure(command=lambda: on_next_button())
 
@@ -324,22 +321,15 @@ class FrameSeedkeeperBackupCard(customtkinter.CTkFrame):
         self.label_instruction.configure(text_color=BG_HOVER_BUTTON)
         self.next_button.configure(text="Next")
 
-        def on_next_button():
+        def import_secrets_to_backup():
             # verify backup PIN with cached pin
-            self.master.controller.cc.card_verify_PIN_simple(self.backup_pin)
+            self.master.controller.session.verify_pin(self.backup_pin)
 
             # check authentikey match
-            authentikey = self.master.controller.cc.card_bip32_get_authentikey()
+            authentikey = self.master.controller.session.get_authentikey()
             if (authentikey.get_public_key_bytes(compressed=False) !=
                     self.backup_authentikey.get_public_key_bytes(compressed=False)):
-                self.master.show(
-                    'ERROR',
-                    'Wrong card!\nPlease insert your BACKUP card and try again.',
-                    'Ok',
-                    None,
-                    "./pictures_db/change_pin_popup.jpg"
-                )
-                return
+                raise ValueError('Wrong card!\nPlease insert your BACKUP card and try again.')
 
             # import encrypted secret using master authentikey for pairing
             for secret in self.secrets_to_backup:
@@ -379,6 +369,7 @@ class FrameSeedkeeperBackupCard(customtkinter.CTkFrame):
                     }
                     self.backup_logs += [error_dic]
 
+        def on_secrets_imported(result):
             # reset state
             is_backup_error = self.is_backup_error
             backup_logs = self.backup_logs
@@ -388,8 +379,26 @@ class FrameSeedkeeperBackupCard(customtkinter.CTkFrame):
             # proceed to result screen according to backup result
             self.master.show_backup_result(is_backup_error, backup_logs)
 
+        def on_next_button():
+            self.master.run_card_job(
+                import_secrets_to_backup,
+                on_success=on_secrets_imported,
+                on_error=self.on_step_error,
+                busy_msg="Importing secrets to backup card...",
+            )
+
         self.next_button.configure(command=lambda: on_next_button())
 
+    def on_step_error(self, ex):
+        logger.error(f"Backup step failed: {ex}", exc_info=True)
+        self.master.show(
+            'ERROR',
+            str(ex),
+            'Ok',
+            None,
+            "./pictures_db/change_pin_popup.jpg"
+        )
+
     def reset_backup_state(self):
         # backup state
         self.master_pin = None
@@ -1,7 +1,10 @@
 import customtkinter
+import functools
 import logging
 
+from bip39Wordlist import MNEMONIC_LENGTHS
 from frameWidgetHeader import FrameWidgetHeader
+from frameWidgetMnemonicFeedback import FrameWidgetMnemonicFeedback
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -46,6 +49,7 @@ class FrameSeedkeeperGenerateMnemonic(customtkinter.CTkFrame):
                     #self.mnemonic_textbox.configure(state='normal')
                     self.mnemonic_textbox.delete("1.0", customtkinter.END)
                     self.mnemonic_textbox.insert("1.0", mnemonic)
+                    self.mnemonic_feedback.update_frame()
                     #self.mnemonic_textbox.configure(state='disabled') # also disable copy-paste on some linux distro
                 except Exception as e:
                     logger.error(f"Error generating mnemonic: {e}", exc_info=True)
@@ -53,33 +57,38 @@ class FrameSeedkeeperGenerateMnemonic(customtkinter.CTkFrame):
             self.radio_value = customtkinter.StringVar(value="12")
             self.use_passphrase = customtkinter.BooleanVar(value=False)
 
-            self.radio_12 = customtkinter.CTkRadioButton(
-                self,
-                text="12 words",
-                variable=self.radio_value,
-                value="12",
-                command=lambda: update_mnemonic()
-            )
-            self.radio_12.place(relx=0.05, rely=0.34, anchor="nw")
-
-            self.radio_24 = customtkinter.CTkRadioButton(
-                self,
-                text="24 words",
-                variable=self.radio_value,
-                value="24",
-                command=lambda: update_mnemonic()
-            )
-            self.radio_24.place(relx=0.2, rely=0.34, anchor="nw")
+            # one radio button per mnemonic length (12, 15, 18, 21 or 24 words)
+            self.radio_buttons = {}
+            for index, mnemonic_length in enumerate(MNEMONIC_LENGTHS):
+                radio_button = customtkinter.CTkRadioButton(
+                    self,
+                    text=f"{mnemonic_length} words",
+                    variable=self.radio_value,
+                    value=str(mnemonic_length),
+                    command=lambda: update_mnemonic()
+                )
+                radio_button.place(relx=0.05 + 0.15 * index, rely=0.34, anchor="nw")
+                self.radio_buttons[mnemonic_length] = radio_button
 
             self.mnemonic_textbox = master.create_textbox(frame=self)
             self.mnemonic_textbox.place(relx=0.05, rely=0.40, relheight=0.1, anchor="nw")
 
+            def get_seed_args():
+                # mnemonic and passphrase as imported by import_mnemonic_on_card()
+                mnemonic = self.mnemonic_textbox.get("1.0", "end").strip()
+                passphrase = self.passphrase_entry.get() if self.use_passphrase.get() else None
+                return mnemonic, passphrase
+
+            self.mnemonic_feedback = FrameWidgetMnemonicFeedback(self, self.mnemonic_textbox, get_seed_args=get_seed_args)
+            self.mnemonic_feedback.place(relx=0.05, rely=0.505, anchor="nw")
+
             # use passphrase
             def toggle_passphrase():
                 if self.use_passphrase.get():
                     self.passphrase_entry.place(relx=0.05, rely=0.60, anchor="nw")
                 else:
                     self.passphrase_entry.place_forget()
+                self.mnemonic_feedback.prepare_seed()
 
             self.passphrase_checkbox = customtkinter.CTkCheckBox(
                 self,
@@ -91,6 +100,7 @@ class FrameSeedkeeperGenerateMnemonic(customtkinter.CTkFrame):
 
             self.passphrase_entry = master.create_entry(frame=self)
             self.passphrase_entry.configure(placeholder_text="Enter passphrase (optional)")
+            self.passphrase_entry.bind("<KeyRelease>", lambda event: self.mnemonic_feedback.prepare_seed())
 
             # use descriptor
             def toggle_descriptor():
@@ -112,15 +122,14 @@ class FrameSeedkeeperGenerateMnemonic(customtkinter.CTkFrame):
             # action buttons
 
             def import_mnemonic_on_card():
-                try:
-                    logger.info("Saving mnemonic to card")
-                    label = self.label_entry.get()
-                    mnemonic = self.mnemonic_textbox.get("1.0", "end").strip()
-                    passphrase = self.passphrase_entry.get() if self.use_passphrase.get() else None
-                    descriptor = self.descriptor_textbox.get("1.0", "end") if self.use_descriptor.get() else None
-
-                    # import
-                    sid, fingerprint = master.controller.import_masterseed_mnemonic(label, mnemonic, passphrase, descriptor)
+                logger.info("Saving mnemonic to card")
+                label = self.label_entry.get()
+                mnemonic, passphrase = get_seed_args()
+                descriptor = self.descriptor_textbox.get("1.0", "end") if self.use_descriptor.get() else None
+
+                def on_mnemonic_imported(result):
+                    sid, fingerprint = result
+                    self.mnemonic_feedback.cancel_seed()
                     master.show(
                         "SUCCESS",
                         f"Mnemonic saved successfully with id: {sid}",
@@ -129,7 +138,7 @@ class FrameSeedkeeperGenerateMnemonic(customtkinter.CTkFrame):
                         "./pictures_db/generate_popup.png"
                     )
 
-                except Exception as ex:
+                def on_import_error(ex):
                     logger.error(f"Failed to import mnemonic to card: {ex}", exc_info=True)
                     master.show(
                         "Error",
@@ -138,6 +147,18 @@ class FrameSeedkeeperGenerateMnemonic(customtkinter.CTkFrame):
                         "./pictures_db/about_popup.jpg"  # todo change icon
                     )
 
+                # import
+                if master.ensure_pin():
+                    # seed derived since the mnemonic is valid, unless the mnemonic or passphrase changed since
+                    seed_future = self.mnemonic_feedback.get_seed_future(mnemonic, passphrase)
+                    master.run_card_job(
+                        functools.partial(master.controller.import_masterseed_mnemonic, seed_future=seed_future),
+                        label, mnemonic, passphrase, descriptor,
+                        on_success=on_mnemonic_imported,
+                        on_error=on_import_error,
+                        busy_msg="Importing mnemonic to card...",
+                    )
+
             self.save_button = master.create_button(
                 "Save on card",
                 command=lambda: import_mnemonic_on_card(),
@@ -211,20 +211,19 @@ class FrameSeedkeeperGeneratePassword(customtkinter.CTkFrame):
 
             # password import to card
             def _save_password_to_card():
-                try:
-                    logger.info("Saving login/password to card")
-                    label = self.label_entry.get()
-                    login = self.login_entry.get()
-                    url = self.url_entry.get()
-                    password = self.password_textbox.get("1.0", "end").strip()
-
-                    # import
-                    sid, fingerprint = master.controller.import_password(label, password, login, url)
+                logger.info("Saving login/password to card")
+                label = self.label_entry.get()
+                login = self.login_entry.get()
+                url = self.url_entry.get()
+                password = self.password_textbox.get("1.0", "end").strip()
+
+                def on_password_imported(result):
+                    sid, fingerprint = result
                     master.show("SUCCESS",
                               f"Password saved successfully with id: {sid}",
                               "Ok", master.show_seedkeeper_list_secrets, "./pictures_db/generate_popup.png")
 
-                except Exception as e:
+                def on_import_error(e):
                     logger.error(f"Failed to save password to card: {e}", exc_info=True)
                     master.show(
                         "Error",
@@ -233,6 +232,15 @@ class FrameSeedkeeperGeneratePassword(customtkinter.CTkFrame):
                         "./pictures_db/about_popup.jpg"  # todo change icon
                     )
 
+                # import
+                if master.ensure_pin():
+                    master.run_card_job(
+                        master.controller.import_password, label, password, login, url,
+                        on_success=on_password_imported,
+                        on_error=on_import_error,
+                        busy_msg="Importing password to card...",
+                    )
+
             self.save_button = master.create_button(
                 "Import to card",
                 command=_save_password_to_card,
@@ -1,7 +1,9 @@
 import customtkinter
+import functools
 import logging
 
 from frameWidgetHeader import FrameWidgetHeader
+from frameWidgetMnemonicFeedback import FrameWidgetMnemonicFeedback
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -42,12 +44,22 @@ class FrameSeedkeeperImportMnemonic(customtkinter.CTkFrame):
             self.mnemonic_textbox = master.create_textbox(frame=self)
             self.mnemonic_textbox.place(relx=0.05, rely=0.33, relheight=0.15, anchor="nw")
 
+            def get_seed_args():
+                # mnemonic and passphrase as imported by import_mnemonic_on_card()
+                mnemonic = self.mnemonic_textbox.get("1.0", "end").strip()
+                passphrase = self.passphrase_entry.get() if self.use_passphrase.get() else None
+                return mnemonic, passphrase
+
+            self.mnemonic_feedback = FrameWidgetMnemonicFeedback(self, self.mnemonic_textbox, get_seed_args=get_seed_args)
+            self.mnemonic_feedback.place(relx=0.05, rely=0.485, anchor="nw")
+
             # use passphrase
             def toggle_passphrase():
                 if self.use_passphrase.get():
                     self.passphrase_entry.place(relx=0.05, rely=0.58, anchor="nw")
                 else:
                     self.passphrase_entry.place_forget()
+                self.mnemonic_feedback.prepare_seed()
 
             self.use_passphrase = customtkinter.BooleanVar(value=False)
             self.passphrase_checkbox = customtkinter.CTkCheckBox(
@@ -60,6 +72,7 @@ class FrameSeedkeeperImportMnemonic(customtkinter.CTkFrame):
 
             self.passphrase_entry = master.create_entry(frame=self)
             self.passphrase_entry.configure(placeholder_text="Enter passphrase (optional)")
+            self.passphrase_entry.bind("<KeyRelease>", lambda event: self.mnemonic_feedback.prepare_seed())
 
             # use descriptor
             def toggle_descriptor():
@@ -81,15 +94,14 @@ class FrameSeedkeeperImportMnemonic(customtkinter.CTkFrame):
             # action buttons
 
             def import_mnemonic_on_card():
-                try:
-                    logger.info("Saving mnemonic to card")
-                    label = self.label_entry.get()
-                    mnemonic = self.mnemonic_textbox.get("1.0", "end").strip()
-                    passphrase = self.passphrase_entry.get() if self.use_passphrase.get() else None
-                    descriptor = self.descriptor_textbox.get("1.0", "end") if self.use_descriptor.get() else None
-
-                    # import
-                    sid, fingerprint = master.controller.import_masterseed_mnemonic(label, mnemonic, passphrase, descriptor)
+                logger.info("Saving mnemonic to card")
+                label = self.label_entry.get()
+                mnemonic, passphrase = get_seed_args()
+                descriptor = self.descriptor_textbox.get("1.0", "end") if self.use_descriptor.get() else None
+
+                def on_mnemonic_imported(result):
+                    sid, fingerprint = result
+                    self.mnemonic_feedback.cancel_seed()
                     master.show(
                         "SUCCESS",
                         f"Mnemonic saved successfully with id: {sid}",
@@ -98,7 +110,7 @@ class FrameSeedkeeperImportMnemonic(customtkinter.CTkFrame):
                         "./pictures_db/generate_popup.png"
                     )
 
-                except Exception as ex:
+                def on_import_error(ex):
                     logger.error(f"Failed to import mnemonic to card: {ex}", exc_info=True)
                     master.show(
                         "Error",
@@ -107,6 +119,18 @@ class FrameSeedkeeperImportMnemonic(customtkinter.CTkFrame):
                         "./pictures_db/about_popup.jpg"  # todo change icon
                     )
 
+                # import
+                if master.ensure_pin():
+                    # seed derived since the mnemonic is valid, unless the mnemonic or passphrase changed since
+                    seed_future = self.mnemonic_feedback.get_seed_future(mnemonic, passphrase)
+                    master.run_card_job(
+                        functools.partial(master.controller.import_masterseed_mnemonic, seed_future=seed_future),
+                        label, mnemonic, passphrase, descriptor,
+                        on_success=on_mnemonic_imported,
+                        on_error=on_import_error,
+                        busy_msg="Importing mnemonic to card...",
+                    )
+
             self.save_button = master.create_button(
                 "Save on card",
                 command=lambda: import_mnemonic_on_card(),
@@ -56,11 +56,30 @@ class FrameSeedkeeperImportSimpleSecret(customtkinter.CTkFrame):
             # action buttons
             # password import to card
             def _save_secret_to_card():
-                try:
-                    logger.info(f"Saving {secret_type} to card")
-                    label = self.label_entry.get()
-                    secret = self.secret_textbox.get("1.0", "end").strip()
+                logger.info(f"Saving {secret_type} to card")
+                label = self.label_entry.get()
+                secret = self.secret_textbox.get("1.0", "end").strip()
+
+                def on_import_error(ex):
+                    logger.error(f"Failed to save {secret_type} to card: {ex}", exc_info=True)
+                    master.show(
+                        "Error",
+                        f"Failed to import secret: \n{ex}",
+                        "Ok", None,
+                        "./pictures_db/about_popup.jpg"  # todo change icon
+                    )
+
+                def on_secret_imported(result):
+                    sid, fingerprint = result
+                    master.show(
+                        "SUCCESS",
+                        f"Secret imported successfully\nID: {sid}",
+                        "Ok",
+                        master.show_seedkeeper_list_secrets,
+                        "./pictures_db/generate_popup.png"  # todo change icon
+                    )
 
+                try:
                     if label:
                         if len(label.encode('utf-8')) > 127:
                             raise ValueError("Label is too long (max 127 bytes)!")
@@ -71,35 +90,26 @@ class FrameSeedkeeperImportSimpleSecret(customtkinter.CTkFrame):
                         if len(secret.encode('utf-8')) > 65535:
                             raise ValueError("Secret is too long (max 65535 bytes)!")
 
-                        # verify PIN
-                        master.update_verify_pin()
-                        # import
-                        sid = 0
                         if secret_type == "descriptor":
-                            sid, fingerprint = master.controller.import_wallet_descriptor(label, secret)
+                            import_secret = master.controller.import_wallet_descriptor
                         elif secret_type == "data":
-                            sid, fingerprint = master.controller.import_data(label, secret)
+                            import_secret = master.controller.import_data
                         else:
                             raise ValueError(f"Unsupported secret for import: {secret_type}")
 
-                        master.show(
-                            "SUCCESS",
-                            f"Secret imported successfully\nID: {sid}",
-                            "Ok",
-                            master.show_seedkeeper_list_secrets,
-                            "./pictures_db/generate_popup.png"  # todo change icon
-                        )
+                        # verify PIN then import
+                        if master.ensure_pin():
+                            master.run_card_job(
+                                import_secret, label, secret,
+                                on_success=on_secret_imported,
+                                on_error=on_import_error,
+                                busy_msg="Importing secret to card...",
+                            )
                     else:
                         raise ValueError("No secret provided")
 
                 except Exception as ex:
-                    logger.error(f"Failed to save {secret_type} to card: {ex}", exc_info=True)
-                    master.show(
-                        "Error",
-                        f"Failed to import secret: \n{ex}",
-                        "Ok", None,
-                        "./pictures_db/about_popup.jpg"  # todo change icon
-                    )
+                    on_import_error(ex)
 
             self.save_button = master.create_button(
                 "Import to card",
@@ -4,8 +4,10 @@ import customtkinter
 import logging
 
 from constants import (DEFAULT_BG_COLOR, BG_MAIN_MENU, BG_HOVER_BUTTON,
-                       TEXT_COLOR, BUTTON_TEXT_COLOR, HIGHLIGHT_COLOR, TYPE_MASTERSEED, TYPE_DIC)
+                       TEXT_COLOR, BUTTON_TEXT_COLOR, HIGHLIGHT_COLOR, TYPE_DIC, EXPORT_RIGHTS_DIC)
+import secretTypes
 from frameWidgetHeader import FrameWidgetHeader
+from secretHeaderStore import SORT_CARD, SORT_LABEL, SORT_TYPE
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -16,6 +18,7 @@ class FrameSeedkeeperListSecrets(customtkinter.CTkFrame):
          This class manages to:
              - Show a list of all secrets stored on the card.
              - Select and display details about each secret from the list.
+             - Filter the list by label (search box), type and export rights, sort it by clicking on a column header.
              - Include specific widgets and buttons according to the secret type/subtype.
              - This method is built using a structural encapsulation approach, meaning that each function within it contains everything necessary for its operation, ensuring modularity and self-sufficiency.
     """
@@ -45,6 +48,25 @@ class FrameSeedkeeperListSecrets(customtkinter.CTkFrame):
             self.label_text = master.create_label(text="Click on a secret to manage it:", frame=self)
             self.label_text.place(relx=0.05, rely=0.15, anchor="nw")
 
+            # Filters, applied on each keystroke using the label index of the store (see SecretHeaderStore.search())
+            self.search_entry = master.create_entry(width=150, height=30, frame=self)
+            self.search_entry.configure(placeholder_text="Search label...")
+            self.search_entry.place(x=250, rely=0.15, anchor="nw")
+            self.search_entry.bind("<KeyRelease>", lambda event: self._on_filter_changed())
+            self.type_filters = {"All types": None}
+            self.type_filters.update({name: secret_type for secret_type, name in TYPE_DIC.items()})
+            self.type_filter, self.type_filter_menu = master.create_option_list(
+                self, list(self.type_filters), width=110)
+            self.type_filter_menu.configure(command=lambda value: self._on_filter_changed())
+            self.type_filter_menu.place(x=410, rely=0.15, anchor="nw")
+            self.export_filters = {"All exports": None}
+            self.export_filters.update({name: export_rights for export_rights, name in EXPORT_RIGHTS_DIC.items()})
+            self.export_filter, self.export_filter_menu = master.create_option_list(
+                self, list(self.export_filters), width=110)
+            self.export_filter_menu.configure(command=lambda value: self._on_filter_changed())
+            self.export_filter_menu.place(x=530, rely=0.15, anchor="nw")
+            self.sort = SORT_CARD
+
             # Define headers
             self.headers = ["Id", "Type of secret", "Label"]
             rely = 0.3
@@ -57,12 +79,14 @@ class FrameSeedkeeperListSecrets(customtkinter.CTkFrame):
             # self.header_frame.place(relx=0.05, rely=rely, relwidth=0.9, anchor="w")
 
             self.header_widths = [50, 200, 350]  # Define specific widths for each header
-            for col, width in zip(self.headers, self.header_widths):
+            header_sorts = [SORT_CARD, SORT_TYPE, SORT_LABEL]  # click on a header to sort by this column
+            for col, width, sort in zip(self.headers, self.header_widths, header_sorts):
                 self.header_button = customtkinter.CTkButton(
                     self, text=col,
                     font=customtkinter.CTkFont(size=14, family='Outfit', weight="bold"),
-                    corner_radius=0, state='disabled', text_color='white',
-                    fg_color=BG_MAIN_MENU, width=width
+                    corner_radius=0, text_color='white',
+                    fg_color=BG_MAIN_MENU, hover_color=BG_HOVER_BUTTON, width=width,
+                    command=lambda sort=sort: self._on_sort_changed(sort)
                 )
                 #self.header_button.pack(side="left", expand=True, fill="both")
                 #self.header_button.place(relx=0.05, rely=rely, anchor="w")
@@ -73,7 +97,12 @@ class FrameSeedkeeperListSecrets(customtkinter.CTkFrame):
                 self, width=600, height=400, x=33.5, y=175
             )
 
-            self.secret_rows = []
+            # rendered rows by secret id, in display order (only changed rows are rendered again)
+            self.secret_rows = {}
+            self.rendered_headers = {}
+            self.rendered_version = None  # SecretHeaderStore.version of the rows
+            self.secret_headers = None  # rendered store
+            self.loading_count = None  # headers received so far while streaming
 
             self.place(relx=1.0, rely=0.5, anchor="e")
 
@@ -91,55 +120,131 @@ class FrameSeedkeeperListSecrets(customtkinter.CTkFrame):
         #     for button in buttons:
         #         button.configure(fg_color=button.default_color)
 
-        # clear rows
-        if len(self.secret_rows)>0:
-            for i, row in enumerate(self.secret_rows):
-                self.secret_rows[i].destroy()
-            self.secret_rows=[]
-
-        # Create rows of labels with alternating colors
-        #rely = 0.3
-        for i, secret in enumerate(secret_headers):
-            try:
-                #rely += 0.06
-                row_frame = customtkinter.CTkFrame(
-                    self.table_frame, width=750,
-                    bg_color=DEFAULT_BG_COLOR,
-                    fg_color=DEFAULT_BG_COLOR
-                )
+        # nothing to do if the headers did not change since the last rendering
+        if secret_headers.version == self.rendered_version:
+            return
+        self.secret_headers = secret_headers
+
+        # remove rows of deleted, modified or filtered out secrets
+        headers = {secret['id']: secret for secret in self._get_visible_headers(secret_headers)}
+        for sid in list(self.secret_rows):
+            if headers.get(sid) != self.rendered_headers[sid]:
+                self.secret_rows.pop(sid).destroy()
+                del self.rendered_headers[sid]
+
+        # create missing rows, then restore display order if needed
+        order_changed = list(self.secret_rows) != [sid for sid in headers if sid in self.secret_rows]
+        rows = {}
+        for i, (sid, secret) in enumerate(headers.items()):
+            row_frame = self.secret_rows.get(sid)
+            if row_frame is None:
+                try:
+                    row_frame = self._create_row(secret)
+                    order_changed = True
+                except Exception as e:
+                    logger.error(f"017 Error creating row for secret {secret['id']}: {str(e)}")
+                    continue
+            self._set_row_colors(row_frame, i)
+            rows[sid] = row_frame
+        if order_changed:
+            for row_frame in rows.values():
+                row_frame.pack_forget()
+            for row_frame in rows.values():
                 row_frame.pack(pady=2, fill="x")
-
-                fg_color = DEFAULT_BG_COLOR if i % 2 == 0 else BG_HOVER_BUTTON
-                text_color = TEXT_COLOR if i % 2 == 0 else BUTTON_TEXT_COLOR
-
-                #buttons = []
-                secret_type = None
-                if secret['type'] == TYPE_MASTERSEED and secret['subtype'] == 0x01:
-                    secret_type = "Mnemonic"
-                else:
-                    secret_type = TYPE_DIC.get(secret['type'], "Unknown type")
-                values = [secret['id'], secret_type, secret['label']]
-                for value, width in zip(values, self.header_widths):
-                    cell_button = customtkinter.CTkButton(
-                        row_frame, text=value,
-                        text_color=text_color, fg_color=fg_color,
-                        font=customtkinter.CTkFont(size=14, family='Outfit'),
-                        hover_color=HIGHLIGHT_COLOR, corner_radius=0, width=width
-                    )
-                    cell_button.default_color = fg_color  # Store the default color
-                    cell_button.pack(side='left', expand=True, fill="both")
-                    #cell_button.bind("<Enter>", lambda event, btns=buttons: _on_mouse_on_secret(event, btns))
-                    #cell_button.bind("<Leave>", lambda event, btns=buttons: _on_mouse_out_secret(event, btns))
-                    cell_button.configure(command=lambda s=secret: self.master.show_seedkeeper_secret(s))
-                    #buttons.append(cell_button)
-
-                # add row to list (keep ref to destroy them on card removal)
-                self.secret_rows += [row_frame]
-
-                logger.debug(f"016 Row created for secret ID: {secret['id']}")
+        self.secret_rows = rows
+        self.rendered_headers = {sid: headers[sid] for sid in rows}
+
+        # update rendered version
+        self.rendered_version = secret_headers.version
+
+    def _get_visible_headers(self, secret_headers):
+        text = self.search_entry.get().strip()
+        secret_type = self.type_filters.get(self.type_filter.get())
+        export_rights = self.export_filters.get(self.export_filter.get())
+        if not text and secret_type is None and export_rights is None and self.sort == SORT_CARD:
+            return secret_headers
+        return secret_headers.search(text, secret_type=secret_type, export_rights=export_rights, sort=self.sort)
+
+    def _on_filter_changed(self):
+        # while headers are streamed, filters are applied once the listing completes
+        if self.secret_headers is None or self.loading_count is not None:
+            return
+        self.rendered_version = None
+        self.update_frame(self.secret_headers)
+
+    def _on_sort_changed(self, sort):
+        self.sort = sort
+        self._on_filter_changed()
+
+    def reset_filters(self):
+        self.search_entry.delete(0, "end")
+        self.type_filter.set(list(self.type_filters)[0])
+        self.export_filter.set(list(self.export_filters)[0])
+        self.sort = SORT_CARD
+
+    def append_rows(self, secrets):
+        """Append rows while headers are streamed from the card, see View._list_secret_headers().
+        update_frame() is called once the listing completes, rows already rendered are kept."""
+        for secret in secrets:
+            if secret['id'] in self.secret_rows:
+                continue
+            try:
+                row_frame = self._create_row(secret)
             except Exception as e:
                 logger.error(f"017 Error creating row for secret {secret['id']}: {str(e)}")
-
-        # update status flag
-        # todo detect changes in secret_headers to update list when needed
-        self.master.seedkeeper_secret_headers_need_update = False
+                continue
+            self._set_row_colors(row_frame, len(self.secret_rows))
+            row_frame.pack(pady=2, fill="x")
+            self.secret_rows[secret['id']] = row_frame
+            self.rendered_headers[secret['id']] = secret
+        self.rendered_version = None
+        if self.loading_count is not None:
+            self.set_loading(len(self.secret_rows))
+
+    def set_loading(self, count):
+        """Show the number of headers received so far, None once the listing is done"""
+        self.loading_count = count
+        if count is None:
+            self.label_text.configure(text="Click on a secret to manage it:")
+        else:
+            self.label_text.configure(text=f"Loading secrets... ({count})")
+
+    def _create_row(self, secret):
+        row_frame = customtkinter.CTkFrame(
+            self.table_frame, width=750,
+            bg_color=DEFAULT_BG_COLOR,
+            fg_color=DEFAULT_BG_COLOR
+        )
+
+        #buttons = []
+        secret_type = secretTypes.get_secret_type(secret['type'], secret['subtype']).name
+        values = [secret['id'], secret_type, secret['label']]
+        row_frame.cells = []
+        row_frame.parity = None
+        for value, width in zip(values, self.header_widths):
+            cell_button = customtkinter.CTkButton(
+                row_frame, text=value,
+                font=customtkinter.CTkFont(size=14, family='Outfit'),
+                hover_color=HIGHLIGHT_COLOR, corner_radius=0, width=width
+            )
+            cell_button.pack(side='left', expand=True, fill="both")
+            #cell_button.bind("<Enter>", lambda event, btns=buttons: _on_mouse_on_secret(event, btns))
+            #cell_button.bind("<Leave>", lambda event, btns=buttons: _on_mouse_out_secret(event, btns))
+            cell_button.configure(command=lambda s=secret: self.master.show_seedkeeper_secret(s))
+            row_frame.cells.append(cell_button)
+
+        logger.debug(f"016 Row created for secret ID: {secret['id']}")
+        return row_frame
+
+    @staticmethod
+    def _set_row_colors(row_frame, index):
+        # alternating colors, only reconfigured when the row moves to a row of the other parity
+        parity = index % 2
+        if row_frame.parity == parity:
+            return
+        row_frame.parity = parity
+        fg_color = DEFAULT_BG_COLOR if parity == 0 else BG_HOVER_BUTTON
+        text_color = TEXT_COLOR if parity == 0 else BUTTON_TEXT_COLOR
+        for cell_button in row_frame.cells:
+            cell_button.configure(text_color=text_color, fg_color=fg_color)
+            cell_button.default_color = fg_color  # Store the default color
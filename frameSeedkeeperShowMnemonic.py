@@ -135,13 +135,7 @@ class FrameSeedkeeperShowMnemonic(customtkinter.CTkFrame):
         if secret['export_rights'] == 0x02:
             secret['mnemonic'] = 'Export failed: export not allowed by SeedKeeper policy.'
         else:
-            if secret.get('type') == TYPE_MASTERSEED:
-                if secret.get('subtype') == 0x00:
-                    secret = self.master.controller.decode_masterseed(secret)  # should not happen here
-                else:
-                    secret = self.master.controller.decode_masterseed_mnemonic(secret)
-            else:
-                secret = self.master.controller.decode_mnemonic(secret)
+            secret = self.master.controller.decode_secret(secret)
         # update passphrase
         passphrase = secret.get('passphrase', "")
         if passphrase == "":
@@ -196,7 +190,7 @@ class FrameSeedkeeperShowMnemonic(customtkinter.CTkFrame):
                     "WARNING",
                     "Do you really want to delete this secret? \nThis operation is irreversible!",
                     "Yes",
-                    lambda sid=secret['id']: self.master.controller.seedkeeper_reset_secret(sid),
+                    lambda sid=secret['id']: self.master.delete_seedkeeper_secret(sid),
                     './pictures_db/secrets_popup.png',
                     button2_txt="Cancel",
                     cmd2=lambda: None,
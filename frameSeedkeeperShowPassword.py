@@ -1,6 +1,7 @@
 import customtkinter
 import logging
 
+from constants import TYPE_DIC
 from framePopup import FramePopup
 from frameWidgetHeader import FrameWidgetHeader
 from utils import toggle_entry_visibility, show_qr_code, reset_qr_code
@@ -102,11 +103,14 @@ class FrameSeedkeeperShowPasswordSecret(customtkinter.CTkFrame):
             logger.error(f"init error: {e}", exc_info=True)
 
     def update_frame(self, secret):
+        # update header (password or master password)
+        self.header.button.configure(text=f"   {TYPE_DIC.get(secret.get('type'), 'Password')} details")
+
         # Decode secret (if export allowed)
         if secret['export_rights'] == 0x02:
             secret['password'] = 'Export failed: export not allowed by SeedKeeper policy.'
         else:
-            secret = self.master.controller.decode_password(secret)
+            secret = self.master.controller.decode_secret(secret)  # password or master password
 
         # update label
         label = secret.get('label', "")
@@ -160,7 +164,7 @@ class FrameSeedkeeperShowPasswordSecret(customtkinter.CTkFrame):
                     "WARNING",
                     "Do you really want to delete this secret? \nThis operation is irreversible!",
                     "Yes",
-                    lambda sid=secret['id']: self.master.controller.seedkeeper_reset_secret(sid),
+                    lambda sid=secret['id']: self.master.delete_seedkeeper_secret(sid),
                     './pictures_db/secrets_popup.png',
                     button2_txt="Cancel",
                     cmd2=lambda: None,
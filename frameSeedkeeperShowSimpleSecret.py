@@ -123,7 +123,7 @@ class FrameSeedkeeperShowSecret(customtkinter.CTkFrame):
                     "WARNING",
                     "Do you really want to delete this secret? \nThis operation is irreversible!",
                     "Yes",
-                    lambda sid=secret['id']: self.master.controller.seedkeeper_reset_secret(sid),
+                    lambda sid=secret['id']: self.master.delete_seedkeeper_secret(sid),
                     './pictures_db/secrets_popup.png',
                     button2_txt="Cancel",
                     cmd2=lambda: None,
@@ -55,21 +55,23 @@ class FrameStart(customtkinter.CTkFrame):
 
     def update_frame(self):
         logger.debug("FrameStart update_frame() start")
-        if self.master.controller.cc.card_present:
-            logger.info(f"card type: {self.master.controller.cc.card_type}")
-            self.label1.configure(text=f"Your {self.master.controller.cc.card_type} is connected.")
+        # render from memory, see Controller.fetch_card_snapshot()
+        snapshot = self.master.controller.get_card_snapshot()
+        if snapshot.card_present:
+            logger.info(f"card type: {snapshot.card_type}")
+            self.label1.configure(text=f"Your {snapshot.card_type} is connected.")
             self.label2.configure(text="Select on the menu the action you wish to perform.")
-            if self.master.controller.cc.card_type == "Satochip":
+            if snapshot.card_type == "Satochip":
                 self.background_photo = self.master.create_background_photo("./pictures_db/card_satochip.png")
                 self.canvas.create_image(0, 0, image=self.background_photo, anchor="nw")
                 # update menu
                 #self.master.show_settings_menu()
-            elif self.master.controller.cc.card_type == "SeedKeeper":
+            elif snapshot.card_type == "SeedKeeper":
                 self.background_photo = self.master.create_background_photo("./pictures_db/card_seedkeeper.png")
                 self.canvas.create_image(0, 0, image=self.background_photo, anchor="nw")
                 # update menu
                 #self.master.show_seedkeeper_menu()
-            elif self.master.controller.cc.card_type == "Satodime":
+            elif snapshot.card_type == "Satodime":
                 self.background_photo = self.master.create_background_photo("./pictures_db/card_satodime.png")
                 self.canvas.create_image(0, 0, image=self.background_photo, anchor="nw")
                 # update menu
@@ -0,0 +1,139 @@
+import customtkinter
+import logging
+from concurrent.futures import Future
+from typing import Callable, Optional, Tuple
+
+from mnemonicValidator import MnemonicValidator, WORD_INVALID
+from seedDerivation import SeedDerivationPool
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+INVALID_WORD_TAG = "invalid_word"
+
+
+class FrameWidgetMnemonicFeedback(customtkinter.CTkFrame):
+    """
+    Live validation of the mnemonic typed in a textbox (see mnemonicValidator.MnemonicValidator).
+
+    On each keystroke, unknown words are shown in red and the feedback label shows the word count,
+    the completion of the word being edited (accepted with Tab) and the checksum once the word count is valid.
+
+    If get_seed_args is set, it returns the (mnemonic, passphrase) that the frame will import: the seed
+    derivation starts (see SeedDerivationPool) as soon as the mnemonic is valid, and the frame passes
+    get_seed_future() to the import. Frames call prepare_seed() when the passphrase changes and
+    cancel_seed() when they are left.
+    """
+
+    def __init__(self, master, textbox, placeholder: str = None, language: str = None,
+                 get_seed_args: Optional[Callable[[], Tuple[str, Optional[str]]]] = None):
+        super().__init__(master)
+        try:
+            logger.debug("FrameWidgetMnemonicFeedback init")
+            self.textbox = textbox
+            self.placeholder = placeholder
+            self.validator = MnemonicValidator(language)
+            self.status = None
+            self.get_seed_args = get_seed_args
+            self._seed_args: Optional[Tuple[str, Optional[str]]] = None
+            self._seed_future: Optional[Future] = None
+
+            self.configure(
+                width=555, height=20,
+                bg_color="whitesmoke", fg_color="whitesmoke"
+            )
+
+            self.label = customtkinter.CTkLabel(
+                self,
+                text="",
+                text_color="grey",
+                bg_color="whitesmoke",
+                fg_color="whitesmoke",
+                font=customtkinter.CTkFont(family="Outfit", size=12, weight="normal")
+            )
+            self.label.place(relx=0, rely=0.5, anchor="w")
+
+            self.textbox.tag_config(INVALID_WORD_TAG, foreground="red")
+            self.textbox.bind("<KeyRelease>", lambda event: self.update_frame())
+            self.textbox.bind("<ButtonRelease-1>", lambda event: self.update_frame())  # word being edited
+            self.textbox.bind("<Tab>", self._complete_word)
+
+        except Exception as e:
+            logger.error(f"An unexpected error occurred in init: {e}", exc_info=True)
+
+    def update_frame(self):
+        """Validate the content of the textbox, also called after the content is set (e.g. generated mnemonic)"""
+        try:
+            text = self.textbox.get("1.0", "end-1c")
+            if text == self.placeholder:
+                text = ""
+            cursor = len(self.textbox.get("1.0", "insert"))
+            self.status = self.validator.update(text, cursor)
+            self._show_invalid_words(text)
+
+            if self.status.checksum is True:
+                text_color = "green"
+            elif self.status.checksum is False or self.status.invalid_words:
+                text_color = "red"
+            else:
+                text_color = "grey"
+            self.label.configure(text=self.status.message, text_color=text_color)
+            self.prepare_seed()
+        except Exception as e:
+            logger.error(f"An unexpected error occurred in update_frame: {e}", exc_info=True)
+
+    def reset(self):
+        self.validator.reset()
+        self.status = None
+        self.cancel_seed()
+        self.textbox.tag_remove(INVALID_WORD_TAG, "1.0", "end")
+        self.label.configure(text="")
+
+    def prepare_seed(self):
+        """Start the derivation of the seed once the mnemonic is valid, again if the mnemonic or passphrase changed"""
+        if self.get_seed_args is None:
+            return
+        if self.status is None or not self.status.is_valid:
+            self.cancel_seed()
+            return
+        seed_args = self.get_seed_args()
+        if seed_args == self._seed_args:
+            return
+        self.cancel_seed()
+        self._seed_args = seed_args
+        self._seed_future = SeedDerivationPool.get().submit(*seed_args)
+
+    def get_seed_future(self, mnemonic: str, passphrase: Optional[str] = None) -> Optional[Future]:
+        """Derivation started for this mnemonic and passphrase, None if there is none (derived during the import)"""
+        if (mnemonic, passphrase) != self._seed_args:
+            return None
+        return self._seed_future
+
+    def cancel_seed(self):
+        """Cancel the derivation if it has not started yet, and drop the seed"""
+        if self._seed_future is not None:
+            SeedDerivationPool.get().cancel([self._seed_future])
+        self._seed_args = self._seed_future = None
+
+    def _show_invalid_words(self, text: str):
+        self.textbox.tag_remove(INVALID_WORD_TAG, "1.0", "end")
+        invalid_words = set(self.status.invalid_words)
+        if not invalid_words:
+            return
+        start = 0
+        for index, word in enumerate(text.split()):
+            start = text.index(word, start)
+            if index in invalid_words:
+                self.textbox.tag_add(INVALID_WORD_TAG, f"1.0+{start}c", f"1.0+{start + len(word)}c")
+            start += len(word)
+
+    def _complete_word(self, event):
+        """Replace the word being edited by its completion, Tab is not inserted"""
+        if self.status is None or self.status.completion is None:
+            return None  # default Tab behaviour
+        before = self.textbox.get("1.0", "insert")
+        prefix = before.split()[-1]
+        self.textbox.delete(f"insert-{len(prefix)}c", "insert")
+        self.textbox.insert("insert", self.status.completion + " ")
+        self.update_frame()
+        return "break"
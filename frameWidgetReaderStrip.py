@@ -0,0 +1,87 @@
+import customtkinter
+import logging
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+MAIN_MENU_COLOR = "#202738"
+BUTTON_COLOR = "#e1e1e0"
+HOVER_COLOR = "grey"
+BUSY_COLOR = "#f0ad4e"
+ERROR_COLOR = "#d9534f"
+OK_COLOR = "#5cb85c"
+
+READER_STRIP_HEIGHT = 40
+
+
+class FrameWidgetReaderStrip(customtkinter.CTkFrame):
+    """
+    Multi-reader mode: one button per reader, showing the card, busy state and last result.
+    Clicking a button selects the reader used by the main window (View.select_reader).
+    """
+
+    def __init__(self, master, reader_manager):
+        super().__init__(master)
+        try:
+            logger.debug("FrameWidgetReaderStrip init")
+            self.master = master
+            self.reader_manager = reader_manager
+            self.buttons = {}
+
+            self.configure(
+                width=1000, height=READER_STRIP_HEIGHT,
+                bg_color=MAIN_MENU_COLOR, fg_color=MAIN_MENU_COLOR, corner_radius=0
+            )
+            self.place(relx=0.5, rely=1, anchor="s")
+            self.update_frame()
+
+        except Exception as e:
+            logger.error(f"An unexpected error occurred in init: {e}", exc_info=True)
+
+    def update_frame(self):
+        try:
+            states = self.reader_manager.get_reader_states()
+            width = int(1000 / max(len(states), 1)) - 10
+            active_reader = self.master.controller.reader
+            for state in states:
+                button = self.buttons.get(state.reader)
+                if button is None:
+                    button = customtkinter.CTkButton(
+                        self, height=READER_STRIP_HEIGHT - 10, corner_radius=5,
+                        font=customtkinter.CTkFont(family="Outfit", size=12, weight="normal"),
+                        text_color="black", hover_color=HOVER_COLOR,
+                        command=lambda reader=state.reader: self.master.select_reader(reader)
+                    )
+                    self.buttons[state.reader] = button
+                button.configure(
+                    width=width,
+                    text=self._get_text(state),
+                    fg_color=self._get_color(state),
+                    border_width=(2 if state.reader == active_reader else 0),
+                    border_color="white",
+                )
+                button.place(x=5 + state.index * (width + 10), rely=0.5, anchor="w")
+        except Exception as e:
+            logger.error(f"An unexpected error occurred in update_frame: {e}", exc_info=True)
+
+    @staticmethod
+    def _get_text(state) -> str:
+        if not state.card_present:
+            text = f"{state.short_name} no card"
+        else:
+            text = f"{state.short_name} {state.card_type}"
+        if state.is_busy:
+            text += " - busy..."
+        elif state.last_result:
+            text += f" - {state.last_result}"
+        return text[:60]
+
+    @staticmethod
+    def _get_color(state) -> str:
+        if state.is_busy:
+            return BUSY_COLOR
+        if state.last_result.startswith("Error"):
+            return ERROR_COLOR
+        if state.last_result:
+            return OK_COLOR
+        return BUTTON_COLOR
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+try:
+    import keyring  # optional, only needed for --cache-headers
+except ImportError:
+    keyring = None
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+KEYRING_SERVICE = "satochip-utils"
+
+
+class HeaderDiskCache:
+    """
+    Optional on-disk copy of the Seedkeeper secret headers (see --cache-headers), one file per card.
+
+    Files are named after the authentikey fingerprint and encrypted with AES-GCM, using a random key per card
+    kept in the OS keyring (requires the keyring package, see is_available()). The key is not derived from
+    the PIN: a copied file would allow an offline brute force of the PIN, without the PIN try counter of the card.
+    The Seedkeeper status (number of secrets, free memory) is saved along with the headers, so that the
+    copy can be revalidated against the card (see Controller.sync_headers()).
+    """
+
+    FORMAT_VERSION = 2
+
+    def __init__(self, path: str, loglevel=logging.DEBUG):
+        logger.setLevel(loglevel)
+        self.path = path
+        self.lock = threading.Lock()
+        # keys read from the keyring, dropped on card removal and logout (see forget_keys())
+        self._keys: Dict[str, bytes] = {}
+
+    @staticmethod
+    def is_available() -> bool:
+        return keyring is not None
+
+    @staticmethod
+    def get_fingerprint(authentikey: bytes) -> str:
+        return hashlib.sha256(authentikey).hexdigest()[0:16]
+
+    def _get_file(self, fingerprint: str) -> str:
+        return os.path.join(self.path, f"headers_{fingerprint}.json")
+
+    @staticmethod
+    def _get_keyring_name(fingerprint: str) -> str:
+        return f"headers_{fingerprint}"
+
+    def _get_key(self, fingerprint: str, create: bool = False) -> Optional[bytes]:
+        """Key of a card, a new random key is saved in the keyring if create is set and there is none"""
+        with self.lock:
+            key = self._keys.get(fingerprint)
+        if key is not None:
+            return key
+        key_hex = keyring.get_password(KEYRING_SERVICE, self._get_keyring_name(fingerprint))
+        if key_hex is not None:
+            key = bytes.fromhex(key_hex)
+        elif create:
+            key = AESGCM.generate_key(bit_length=256)
+            keyring.set_password(KEYRING_SERVICE, self._get_keyring_name(fingerprint), key.hex())
+        else:
+            return None
+        with self.lock:
+            self._keys[fingerprint] = key
+        return key
+
+    def load(self, authentikey: bytes) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+        """Return (headers, seedkeeper_status) saved for this card, None if not found or not readable"""
+        fingerprint = self.get_fingerprint(authentikey)
+        filename = self._get_file(fingerprint)
+        if not os.path.isfile(filename):
+            return None
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+            if content.get('version') != self.FORMAT_VERSION:
+                return None
+            key = self._get_key(fingerprint)
+            if key is None:
+                logger.info(f"No key for {filename} in the keyring, ignoring it")
+                return None
+            plaintext = AESGCM(key).decrypt(
+                bytes.fromhex(content['nonce']), bytes.fromhex(content['ciphertext']), fingerprint.encode('utf-8'))
+            data = json.loads(plaintext.decode('utf-8'))
+            logger.debug(f"Loaded {len(data['headers'])} headers from {filename}")
+            return data['headers'], data['seedkeeper_status']
+        except InvalidTag:
+            # key replaced since the file was saved
+            logger.info(f"Cannot decrypt {filename}, ignoring it")
+            return None
+        except (OSError, ValueError, KeyError, keyring.errors.KeyringError) as ex:
+            logger.warning(f"Failed to load header cache from {filename}: {ex}")
+            return None
+
+    def save(self, authentikey: bytes, headers: List[Dict[str, Any]], seedkeeper_status: Dict[str, Any]):
+        fingerprint = self.get_fingerprint(authentikey)
+        filename = self._get_file(fingerprint)
+        try:
+            key = self._get_key(fingerprint, create=True)
+        except keyring.errors.KeyringError as ex:
+            logger.warning(f"Failed to get the header cache key from the keyring: {ex}")
+            return
+        nonce = os.urandom(12)
+        plaintext = json.dumps({'headers': headers, 'seedkeeper_status': seedkeeper_status}).encode('utf-8')
+        content = {
+            'version': self.FORMAT_VERSION,
+            'nonce': nonce.hex(),
+            'ciphertext': AESGCM(key).encrypt(nonce, plaintext, fingerprint.encode('utf-8')).hex(),
+        }
+        try:
+            os.makedirs(self.path, mode=0o700, exist_ok=True)
+            tmp_path = filename + ".tmp"
+            with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as f:
+                json.dump(content, f)
+            os.replace(tmp_path, filename)
+            logger.debug(f"Saved {len(headers)} headers to {filename}")
+        except OSError as ex:
+            logger.warning(f"Failed to save header cache to {filename}: {ex}")
+
+    def forget_keys(self, authentikey: Optional[bytes] = None):
+        """Drop the keys read from the keyring, of a card (of all cards by default)"""
+        with self.lock:
+            if authentikey is None:
+                self._keys.clear()
+            else:
+                self._keys.pop(self.get_fingerprint(authentikey), None)
+
+    def delete(self, authentikey: bytes):
+        """Delete the copy of a card, e.g. after a PIN change or before a factory reset"""
+        fingerprint = self.get_fingerprint(authentikey)
+        filename = self._get_file(fingerprint)
+        self.forget_keys(authentikey)
+        try:
+            if os.path.isfile(filename):
+                os.remove(filename)
+            if keyring.get_password(KEYRING_SERVICE, self._get_keyring_name(fingerprint)) is not None:
+                keyring.delete_password(KEYRING_SERVICE, self._get_keyring_name(fingerprint))
+        except (OSError, keyring.errors.KeyringError) as ex:
+            logger.warning(f"Failed to delete header cache {filename}: {ex}")
@@ -0,0 +1,130 @@
+import logging
+from typing import List, NamedTuple, Optional
+
+from bip39Wordlist import Bip39Wordlist, MNEMONIC_LENGTHS, normalize_string
+from constants import BIP39_WORDLIST_DIC
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+# status of each word
+WORD_VALID = "valid"
+WORD_PREFIX = "prefix"  # start of a word of the wordlist (only for the word being edited)
+WORD_INVALID = "invalid"
+
+
+class MnemonicStatus(NamedTuple):
+    """Result of MnemonicValidator.update()"""
+    words: List[str]
+    statuses: List[str]  # WORD_VALID, WORD_PREFIX or WORD_INVALID, for each word
+    language: Optional[str]  # active wordlist, None if no wordlist matches the words
+    current: Optional[int]  # index of the word being edited
+    completion: Optional[str]  # only word of the wordlist starting with the word being edited
+    checksum: Optional[bool]  # None until the number of words is valid and all words are valid
+    message: str
+
+    @property
+    def is_valid(self) -> bool:
+        return self.checksum is True
+
+    @property
+    def invalid_words(self) -> List[int]:
+        return [index for index, status in enumerate(self.statuses) if status == WORD_INVALID]
+
+
+class MnemonicValidator:
+    """
+    Validation of a mnemonic while it is typed, with a prefix trie of the active wordlist (see WordTrie).
+
+    update() is called on each keystroke with the whole text: words are compared with the previous call, so
+    that only the words that changed (usually the word being edited) are checked against the trie.
+    The checksum is verified once the number of words is valid and all words are valid.
+    If language is None, the active wordlist is the first of constants.BIP39_WORDLIST_DIC (english first)
+    containing all the words typed so far, the other wordlists are only loaded if needed.
+    """
+
+    def __init__(self, language: Optional[str] = None, loglevel=logging.DEBUG):
+        logger.setLevel(loglevel)
+        self.language = language
+        self.wordlist: Optional[Bip39Wordlist] = Bip39Wordlist.get(language or "english")
+        self._words: List[str] = []
+        self._statuses: List[str] = []
+        self._current: Optional[int] = None
+
+    def reset(self):
+        self._words = []
+        self._statuses = []
+        self._current = None
+        if self.language is None:
+            self.wordlist = Bip39Wordlist.get("english")
+
+    def update(self, text: str, cursor: Optional[int] = None) -> MnemonicStatus:
+        """Validate text, cursor is the position of the insertion cursor in text (end of text by default)"""
+        if cursor is None:
+            cursor = len(text)
+        words = normalize_string(text).split()
+        # the word being edited is the word under (or just before) the cursor, none after a space
+        current = None
+        if text[:cursor] and not text[:cursor][-1].isspace():
+            current = len(text[:cursor].split()) - 1
+
+        statuses = [
+            self._statuses[index] if index < len(self._words) and word == self._words[index]
+            and (index == current) == (index == self._current) else None
+            for index, word in enumerate(words)
+        ]
+        changed = [index for index, status in enumerate(statuses) if status is None]
+        for index in changed:
+            statuses[index] = self._check_word(words[index], index == current)
+
+        if self.language is None and WORD_INVALID in statuses:
+            # a word is not in the active wordlist: look for another wordlist containing all the words
+            wordlist = self._detect(words, current)
+            if wordlist is not None and wordlist is not self.wordlist:
+                logger.debug(f"MnemonicValidator switched to {wordlist.language} wordlist")
+                self.wordlist = wordlist
+                statuses = [self._check_word(word, index == current) for index, word in enumerate(words)]
+
+        self._words, self._statuses, self._current = words, statuses, current
+        return self._get_status(words, statuses, current)
+
+    def _check_word(self, word: str, is_current: bool) -> str:
+        if word in self.wordlist:
+            return WORD_VALID
+        if is_current and self.wordlist.trie.is_prefix(word):
+            return WORD_PREFIX
+        return WORD_INVALID
+
+    def _detect(self, words: List[str], current: Optional[int]) -> Optional[Bip39Wordlist]:
+        for language in BIP39_WORDLIST_DIC.values():
+            try:
+                wordlist = Bip39Wordlist.get(language)
+            except ValueError:
+                continue
+            if all(word in wordlist or (index == current and wordlist.trie.is_prefix(word))
+                   for index, word in enumerate(words)):
+                return wordlist
+        return None
+
+    def _get_status(self, words: List[str], statuses: List[str], current: Optional[int]) -> MnemonicStatus:
+        language = self.wordlist.language if WORD_INVALID not in statuses else None
+        completion = None
+        if current is not None and statuses[current] != WORD_INVALID:
+            completion = self.wordlist.trie.complete(words[current])
+            if completion == words[current]:
+                completion = None
+
+        checksum = None
+        invalid = [index + 1 for index, status in enumerate(statuses) if status == WORD_INVALID]
+        if not words:
+            message = ""
+        elif invalid:
+            message = f"Unknown word{'s' if len(invalid) > 1 else ''} at position {', '.join(map(str, invalid))}"
+        elif len(words) not in MNEMONIC_LENGTHS or WORD_PREFIX in statuses:
+            message = f"{len(words)} words"
+            if completion is not None:
+                message += f" - press Tab to complete '{completion}'"
+        else:
+            checksum = self.wordlist.check(words)
+            message = f"Valid {len(words)}-word mnemonic" if checksum else f"Invalid checksum ({len(words)} words)"
+        return MnemonicStatus(words, statuses, language, current, completion, checksum, message)
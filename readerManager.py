@@ -0,0 +1,192 @@
+import functools
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from smartcard.System import readers as list_pcsc_readers
+
+from controller import Controller, WorkerCardConnector
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+class ReaderCardConnector(WorkerCardConnector):
+    """CardConnector bound to a single PC/SC reader: the card monitor only reports cards from this reader"""
+
+    def __init__(self, client=None, loglevel=logging.WARNING, card_filter=None, reader: str = ""):
+        self.reader = reader  # used by the card observer, added to the card monitor in CardConnector.__init__()
+        super().__init__(client, loglevel, card_filter)
+        # CardConnector.__init__() also picks the first card found in any reader: only keep a card of this reader
+        # (cards already inserted in this reader are connected when the observer is added)
+        if getattr(self.cardservice, 'reader', None) != reader:
+            self.cardservice = None
+            self.card_present = False
+
+
+@dataclass(frozen=True)
+class ReaderState:
+    """State of a reader as shown in the reader status strip"""
+    reader: str
+    index: int
+    card_present: bool
+    card_type: Optional[str]
+    is_busy: bool
+    last_result: str = ""
+
+    @property
+    def short_name(self) -> str:
+        return f"#{self.index + 1}"
+
+
+class ReaderManager:
+    """
+    One Controller per PC/SC reader, each with its own CardConnector, CardWorker and CardSession,
+    so that cards in different readers are set up, seeded or verified in parallel.
+
+    The view displays the controller of the selected reader (view.controller); card events from
+    the other readers only update the reader status strip (see Controller.request).
+    New readers are picked up by refresh_readers().
+    """
+
+    def __init__(self, view, loglevel=logging.DEBUG, trace_apdu: Optional[str] = None,
+                 readers: Optional[List[str]] = None, header_cache_dir: Optional[str] = None,
+                 secret_cache_ttl: Optional[float] = None):
+        logger.setLevel(loglevel)
+        self.view = view
+        self.loglevel = loglevel
+        self.trace_apdu = trace_apdu
+        self.header_cache_dir = header_cache_dir
+        self.secret_cache_ttl = secret_cache_ttl
+        self.lock = threading.Lock()
+        self.controllers: Dict[str, Controller] = {}
+        self.last_results: Dict[str, str] = {}
+        for reader in (readers if readers is not None else self.list_readers()):
+            self.add_reader(reader)
+
+    @staticmethod
+    def list_readers() -> List[str]:
+        try:
+            return [str(reader) for reader in list_pcsc_readers()]
+        except Exception as ex:
+            logger.warning(f"Failed to list PC/SC readers: {ex}")
+            return []
+
+    def _get_trace_path(self, index: int) -> Optional[str]:
+        # one trace file per reader
+        if not self.trace_apdu:
+            return None
+        root, ext = os.path.splitext(self.trace_apdu)
+        return f"{root}_reader{index + 1}{ext}"
+
+    def add_reader(self, reader: str) -> Controller:
+        with self.lock:
+            if reader in self.controllers:
+                return self.controllers[reader]
+            index = len(self.controllers)
+        logger.info(f"Adding reader #{index + 1}: {reader}")
+        controller = Controller(
+            self.view, loglevel=self.loglevel, trace_apdu=self._get_trace_path(index),
+            connector_class=functools.partial(ReaderCardConnector, reader=reader), reader=reader,
+            header_cache_dir=self.header_cache_dir, secret_cache_ttl=self.secret_cache_ttl)
+        with self.lock:
+            self.controllers[reader] = controller
+        return controller
+
+    def refresh_readers(self) -> List[str]:
+        """Add the readers plugged since the last call, return their names"""
+        new_readers = [reader for reader in self.list_readers() if reader not in self.controllers]
+        for reader in new_readers:
+            self.add_reader(reader)
+        return new_readers
+
+    @property
+    def readers(self) -> List[str]:
+        with self.lock:
+            return list(self.controllers)
+
+    def get_controller(self, reader: str) -> Controller:
+        return self.controllers[reader]
+
+    ####################################################################################################################
+    """ OPERATIONS """
+
+    def submit(
+            self,
+            reader: str,
+            func: Callable,
+            *args,
+            on_success: Optional[Callable[[Any], None]] = None,
+            on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        """Run func(controller, *args) on the worker of the given reader.
+        Callbacks are called on the Tk thread, and the result is shown in the reader status strip."""
+        controller = self.controllers[reader]
+
+        def _on_success(result):
+            self.set_last_result(reader, "OK")
+            if on_success is not None:
+                on_success(result)
+
+        def _on_error(ex):
+            self.set_last_result(reader, f"Error: {ex}")
+            if on_error is not None:
+                on_error(ex)
+
+        controller.worker.submit(func, controller, *args, on_success=_on_success, on_error=_on_error)
+        self.set_last_result(reader, "")
+
+    def submit_all(
+            self,
+            func: Callable,
+            *args,
+            on_success: Optional[Callable[[str, Any], None]] = None,
+            on_error: Optional[Callable[[str, Exception], None]] = None,
+    ) -> List[str]:
+        """Run func(controller, *args) in parallel on every reader holding a card.
+        Callbacks receive the reader name first. Returns the readers used."""
+        used = []
+        for reader, controller in list(self.controllers.items()):
+            if not controller.cc.card_present:
+                continue
+            self.submit(
+                reader, func, *args,
+                on_success=(functools.partial(on_success, reader) if on_success is not None else None),
+                on_error=(functools.partial(on_error, reader) if on_error is not None else None),
+            )
+            used.append(reader)
+        return used
+
+    def set_last_result(self, reader: str, result: str):
+        self.last_results[reader] = result
+        self.view.update_reader_strip()
+
+    def get_reader_states(self) -> List[ReaderState]:
+        states = []
+        for index, (reader, controller) in enumerate(list(self.controllers.items())):
+            cc = controller.cc
+            states.append(ReaderState(
+                reader=reader,
+                index=index,
+                card_present=cc.card_present,
+                card_type=cc.card_type if cc.card_present else None,
+                is_busy=controller.worker.is_busy(),
+                last_result=self.last_results.get(reader, ""),
+            ))
+        return states
+
+    def close(self):
+        """Stop the workers, then logout and disconnect every card"""
+        for controller in self.controllers.values():
+            controller.worker.stop()
+        for reader, controller in self.controllers.items():
+            try:
+                controller.worker.run_sync(controller.card_logout)
+                controller.worker.run_sync(controller.cc.card_disconnect)
+                controller.cc.close()
+            except Exception as ex:
+                logger.warning(f"Failed to close reader {reader}: {ex}")
+            if controller.apdu_tracer is not None:
+                controller.apdu_tracer.close()
@@ -1,8 +1,10 @@
 import logging
 import sys
 import os
+import time
 import tkinter
 
+from constants import DATA_DIR, HEADER_CACHE_DIR, SECRET_CACHE_TTL
 from view import View
 
 
@@ -29,7 +31,21 @@ def configure_view(view: View) -> None:
         logger.warning(f"Icon file not found: {icon_path}")
 
 
-if (len(sys.argv) >= 2) and (sys.argv[1] in ['-v', '--verbose']):
+def get_trace_apdu_path() -> str:
+    """Return the APDU trace file from the --trace-apdu[=path] option, or None if not set."""
+    for arg in sys.argv[1:]:
+        if arg == '--trace-apdu':
+            os.makedirs(DATA_DIR, exist_ok=True)
+            return os.path.join(DATA_DIR, time.strftime("apdu_trace_%Y%m%d_%H%M%S.jsonl"))
+        if arg.startswith('--trace-apdu='):
+            return os.path.abspath(arg.split('=', 1)[1])
+    return None
+
+
+# resolve before changing working directory
+trace_apdu_path = get_trace_apdu_path()
+
+if any(arg in ['-v', '--verbose'] for arg in sys.argv[1:]):
     logging.basicConfig(level=logging.DEBUG,
                         format='%(asctime)s - [%(filename)s:%(lineno)d] - %(levelname)s - %(name)s - %(funcName)s() - %(message)s',
                         datefmt='%Y-%m-%d %H:%M:%S')
@@ -69,7 +85,15 @@ else:
             logger.warning(f"Expected cert file not found: {cert_path}")
 
 if __name__ == '__main__':
-    view = View(logger.getEffectiveLevel())
+    # --multi-reader: one card per reader, operations target the reader selected in the status strip
+    multi_reader = '--multi-reader' in sys.argv[1:]
+    # --cache-headers: keep an encrypted copy of the Seedkeeper secret headers, shown before listing the card
+    # (key kept in the OS keyring, requires the keyring package)
+    header_cache_dir = HEADER_CACHE_DIR if '--cache-headers' in sys.argv[1:] else None
+    # --cache-secrets: keep secrets shown recently in memory for a short time, instead of exporting them again
+    secret_cache_ttl = SECRET_CACHE_TTL if '--cache-secrets' in sys.argv[1:] else None
+    view = View(logger.getEffectiveLevel(), trace_apdu=trace_apdu_path, multi_reader=multi_reader,
+                header_cache_dir=header_cache_dir, secret_cache_ttl=secret_cache_ttl)
     view.resizable(False, False)
     configure_view(view)
     view.mainloop()
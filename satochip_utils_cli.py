@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+satochip-utils-cli: headless batch provisioning of Satochip and Seedkeeper cards.
+
+The provisioning recipe is applied to every card inserted, and one json line is printed per card.
+Cards already provisioned during the run are skipped. Stop with Ctrl-C or --count.
+
+Recipe (json file):
+{
+    "pin": "123456",
+    "label": "Seedkeeper {index:03d}",
+    "seed": {"mnemonic": "...", "passphrase": "..."},
+    "secrets": [
+        {"type": "password", "label": "...", "password": "...", "login": "...", "url": "..."},
+        {"type": "mnemonic", "label": "...", "mnemonic": "...", "passphrase": "...", "descriptor": "...",
+         "language": "... (optional, detected by default)"},
+        {"type": "descriptor", "label": "...", "descriptor": "..."},
+        {"type": "data", "label": "...", "data": "..."},
+        {"type": "privkey", "label": "...", "value": "..."},
+        {"type": "generated_mnemonic", "label": "... {n}", "count": 10, "words": 24, "passphrase": "..."}
+    ]
+}
+- pin: set on new cards, used to unlock cards that are already setup.
+- label: optional template, with fields {index} (card count in this run), {uid}, {card_type} and {date}.
+- seed: optional, Satochip only (ignored if the card is already seeded).
+- secrets: optional, Seedkeeper only. Other types of secretTypes (privkey, pubkey, symmetric_key, shamir_share,
+  master_password, certificate) take a single "value", hex encoded for binary types.
+  generated_mnemonic: generate and store "count" new mnemonics of "words" words (12, 15, 18, 21 or 24, default 12)
+  on each card, with optional "language", "passphrase" and "descriptor". {n} in the label is replaced by the
+  number of the mnemonic (1 to count). The mnemonics are not printed, back up the cards.
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import secretTypes
+from bip39Wordlist import MNEMONIC_LENGTHS
+from controller import Controller
+from seedDerivation import SeedDerivationPool
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+GENERATED_MNEMONIC = 'generated_mnemonic'
+SECRET_TYPES = list(dict.fromkeys(entry.key for entry in secretTypes.SECRET_TYPES.values() if entry.key))
+SECRET_TYPES.append(GENERATED_MNEMONIC)
+
+class ProvisioningError(Exception):
+    """A provisioning step failed"""
+
+    def __init__(self, step: str, msg: str):
+        super().__init__(msg)
+        self.step = step
+
+
+class HeadlessView:
+    """
+    Stand-in for view.View, so that Controller runs without customtkinter.
+
+    Provides the Tk-like timer loop used by CardWorker (after/after_cancel/mainloop).
+    Card events are forwarded to the Provisioner, card operations report their results through
+    return values and typed errors (see controllerEvents).
+    """
+
+    def __init__(self, loglevel=logging.INFO):
+        logger.setLevel(loglevel)
+        self.controller = None
+        self.provisioner = None
+        # timers (only used from the main thread)
+        self._timers: List[Tuple[float, int, Callable, tuple]] = []
+        self._timer_id = 0
+        self._cancelled = set()
+        self._stopped = False
+
+    ####################################################################################################################
+    """ TIMER LOOP """
+
+    def after(self, ms: int, func: Callable, *args) -> int:
+        self._timer_id += 1
+        heapq.heappush(self._timers, (time.monotonic() + ms / 1000, self._timer_id, func, args))
+        return self._timer_id
+
+    def after_cancel(self, timer_id: int):
+        self._cancelled.add(timer_id)
+
+    def mainloop(self):
+        while not self._stopped and self._timers:
+            deadline, timer_id, func, args = heapq.heappop(self._timers)
+            if timer_id in self._cancelled:
+                self._cancelled.discard(timer_id)
+                continue
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                func(*args)
+            except Exception as ex:
+                logger.error(f"HeadlessView timer callback failed: {ex}", exc_info=True)
+
+    def quit(self):
+        self._stopped = True
+
+    ####################################################################################################################
+    """ VIEW API USED BY CONTROLLER """
+
+    def update_status(self, isConnected=None):
+        # single reader mode
+        self.provisioner.on_card_event(self.controller, isConnected)
+
+    def update_reader_status(self, controller, isConnected=None):
+        # multi-reader mode (see readerManager.ReaderManager)
+        self.provisioner.on_card_event(controller, isConnected)
+
+    def update_reader_strip(self):
+        pass
+
+    def show_error(self, msg):
+        # sent by pysatochip's card observer, e.g. if the applet of the inserted card cannot be selected
+        print(f"Error: {msg}", file=sys.stderr)
+
+
+class Provisioner:
+    """Apply the provisioning recipe on each card inserted, in the card worker thread of its reader"""
+
+    def __init__(self, view: HeadlessView, recipe: Dict[str, Any], count: Optional[int] = None, out=sys.stdout,
+                 verify: bool = False):
+        self.view = view
+        self.recipe = recipe
+        self.count = count
+        self.verify = verify
+        self.out = out
+        self.index = 0
+        self.nb_results = 0
+        self.provisioned = set()  # UIDs of the cards provisioned during this run
+
+    def on_card_event(self, controller: Controller, isConnected: Optional[bool]):
+        if isConnected is not True:
+            return
+        uid = getattr(controller.cc, 'UID_SHA1', None)
+        if uid is not None and uid in self.provisioned:
+            logger.info(f"Card {uid} already provisioned, skipping")
+            return
+        self.index += 1
+        try:
+            generated = self.generate_mnemonics(controller)
+        except Exception as ex:
+            self.on_result({'index': self.index, 'reader': controller.reader, 'status': 'error',
+                            'step': 'generate_mnemonics', 'error': str(ex)})
+            return
+        # seeds are derived in the background, while the card worker runs the first steps (or other cards)
+        seeds = self.derive_seeds(generated)
+        controller.worker.submit(self.provision, controller, self.index, seeds, generated,
+                                 on_success=self.on_result, on_error=self.on_result)
+
+    def generate_mnemonics(self, controller: Controller) -> Dict[int, List[str]]:
+        """New mnemonics of the generated_mnemonic secrets of the recipe, keyed by position in the recipe secrets"""
+        generated = {}
+        for position, secret in enumerate(self.recipe.get('secrets') or []):
+            if secret.get('type') == GENERATED_MNEMONIC:
+                generated[position] = controller.generate_random_seeds(
+                    secret.get('count', 1), secret.get('words', 12), secret.get('language') or "english")
+        return generated
+
+    def derive_seeds(self, generated: Optional[Dict[int, List[str]]] = None
+                     ) -> Dict[Tuple[str, Optional[str]], Future]:
+        """Start the derivation of the seeds of the recipe (and of the generated mnemonics),
+        keyed by (mnemonic, passphrase)"""
+        mnemonics = []
+        seed = self.recipe.get('seed')
+        if seed:
+            mnemonics.append((seed['mnemonic'], seed.get('passphrase') or None))
+        for position, secret in enumerate(self.recipe.get('secrets') or []):
+            if secret.get('type') == 'mnemonic':
+                mnemonics.append((secret['mnemonic'], secret.get('passphrase') or None))
+            elif generated and position in generated:
+                mnemonics.extend((mnemonic, secret.get('passphrase') or None) for mnemonic in generated[position])
+        pool = SeedDerivationPool.get()
+        return {key: pool.submit(*key) for key in dict.fromkeys(mnemonics)}
+
+    def on_result(self, result: Dict[str, Any]):
+        # provision() never raises, see on_error for unexpected worker failures
+        if isinstance(result, Exception):
+            result = {'status': 'error', 'step': None, 'error': str(result)}
+        if result.get('status') == 'ok' and result.get('uid'):
+            self.provisioned.add(result['uid'])
+        self.out.write(json.dumps(result) + "\n")
+        self.out.flush()
+        self.nb_results += 1
+        if self.count is not None and self.nb_results >= self.count:
+            self.view.quit()
+
+    def provision(self, controller: Controller, index: int,
+                  seeds: Optional[Dict[Tuple[str, Optional[str]], Future]] = None,
+                  generated: Optional[Dict[int, List[str]]] = None) -> Dict[str, Any]:
+        cc = controller.cc
+        result = {
+            'index': index,
+            'reader': controller.reader,
+            'card_type': cc.card_type,
+            'uid': getattr(cc, 'UID_SHA1', None),
+            'steps': {},
+            'status': 'ok',
+            'time': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        start = time.perf_counter()
+        try:
+            self._provision(controller, index, result['steps'], seeds or {}, generated or {})
+        except ProvisioningError as ex:
+            result.update(status='error', step=ex.step, error=str(ex))
+        except Exception as ex:
+            result.update(status='error', step=None, error=str(ex))
+        finally:
+            if seeds:  # derivations not used (failed step)
+                SeedDerivationPool.get().cancel(seeds.values())
+            controller.card_logout()
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        return result
+
+    def _provision(self, controller: Controller, index: int, steps: Dict[str, Any],
+                   seeds: Dict[Tuple[str, Optional[str]], Future], generated: Dict[int, List[str]]):
+        cc = controller.cc
+        if cc.card_type not in ["Satochip", "SeedKeeper"]:
+            raise ProvisioningError('card_type', f"Unsupported card type: {cc.card_type}")
+
+        # PIN
+        pin = self.recipe['pin']
+        if not cc.setup_done:
+            self._run_step('setup_pin', controller.card_setup_native_pin, pin)
+            steps['setup_pin'] = 'done'
+        else:
+            steps['setup_pin'] = 'skipped'
+        cc.set_pin(0, list(pin.encode('utf8')))
+        self._run_step('verify_pin', controller.verify_cached_pin)
+        self._run_step('card_status', controller.get_card_status)
+
+        # label
+        template = self.recipe.get('label')
+        if template:
+            label = template.format(
+                index=index,
+                uid=getattr(cc, 'UID_SHA1', ""),
+                card_type=cc.card_type,
+                date=time.strftime("%Y-%m-%d"),
+            )
+            self._run_step('label', controller.edit_label, label)
+            steps['label'] = label
+
+        # seed (Satochip)
+        seed = self.recipe.get('seed')
+        if seed:
+            if cc.card_type != "Satochip":
+                raise ProvisioningError('seed', f"Seed import is not supported by {cc.card_type}")
+            if cc.is_seeded:
+                steps['seed'] = 'skipped'
+            else:
+                passphrase = seed.get('passphrase') or None
+                self._run_step('seed', controller.import_seed, seed['mnemonic'], passphrase,
+                               seeds.get((seed['mnemonic'], passphrase)))
+                steps['seed'] = 'done'
+
+        # secrets (Seedkeeper)
+        secrets = self.recipe.get('secrets') or []
+        if secrets and cc.card_type != "SeedKeeper":
+            raise ProvisioningError('secrets', f"Secret import is not supported by {cc.card_type}")
+        if secrets:
+            steps['secrets'] = imported = []  # also reported if a later import fails
+            recipes = []  # secret imported for each entry of imported, for verification (not reported)
+            for position, secret in enumerate(secrets):
+                if secret.get('type') == GENERATED_MNEMONIC:
+                    for n, mnemonic in enumerate(generated.get(position) or [], 1):
+                        label = secret['label'].format(n=n)
+                        mnemonic_secret = dict(secret, type='mnemonic', label=label, mnemonic=mnemonic)
+                        sid, fingerprint = self._run_step(
+                            f"secret '{label}'", self.import_secret, controller, mnemonic_secret, seeds)
+                        imported.append({'id': sid, 'fingerprint': fingerprint, 'label': label})
+                        recipes.append(mnemonic_secret)
+                    continue
+                sid, fingerprint = self._run_step(
+                    f"secret '{secret.get('label')}'", self.import_secret, controller, secret, seeds)
+                imported.append({'id': sid, 'fingerprint': fingerprint, 'label': secret.get('label')})
+                recipes.append(secret)
+            if self.verify:
+                errors = self.verify_secrets(controller, imported, recipes)
+                steps['verify'] = errors or 'done'
+                if errors:
+                    raise ProvisioningError('verify', f"{len(errors)} secrets failed verification")
+
+    @staticmethod
+    def verify_secrets(controller: Controller, imported: List[Dict[str, Any]],
+                       recipes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Export the imported secrets in plaintext and check them, return the secrets that failed.
+        The fingerprint of the exported bytes (sha256, first 4 bytes) must match the one returned by the import,
+        and the decoded values must match the recipe secrets (see Controller.decode_secrets())."""
+        exports = [controller.export_secret(secret['id']) for secret in imported]
+        errors = []
+        for secret, export, decoded, recipe in zip(imported, exports, controller.decode_secrets(exports), recipes):
+            error = decoded.error
+            if error is None:
+                fingerprint = hashlib.sha256(bytes.fromhex(export['secret'])).hexdigest()[0:8]
+                if fingerprint != secret['fingerprint']:
+                    error = f"Fingerprint mismatch: {fingerprint} instead of {secret['fingerprint']}"
+            if error is None:
+                fields = Provisioner.get_expected_fields(recipe)
+                mismatches = [key for key, value in fields.items() if decoded.fields.get(key) != value]
+                if mismatches:
+                    error = f"Value mismatch: {', '.join(mismatches)}"
+            if error is not None:
+                errors.append({'id': secret['id'], 'label': secret['label'], 'error': error})
+        return errors
+
+    @staticmethod
+    def get_expected_fields(secret: Dict[str, Any]) -> Dict[str, Any]:
+        """Decoded fields expected for a recipe secret (see import_secret())"""
+        secret_type = secret.get('type')
+        if secret_type == 'password':
+            return {'password': secret['password'], 'login': secret.get('login', ""), 'url': secret.get('url', "")}
+        if secret_type == 'mnemonic':
+            # mnemonics are decoded from their entropy, with single spaces
+            return {'mnemonic': " ".join(secret['mnemonic'].split()), 'passphrase': secret.get('passphrase') or "",
+                    'descriptor': secret.get('descriptor') or ""}
+        if secret_type in ('descriptor', 'data'):
+            return {'secret_decoded': secret[secret_type]}
+        entry = secretTypes.get_secret_type_by_key(secret_type)
+        return {'secret_decoded': secret['value'] if entry.text else bytes.fromhex(secret['value']).hex()}
+
+    @staticmethod
+    def import_secret(controller: Controller, secret: Dict[str, Any],
+                      seeds: Optional[Dict[Tuple[str, Optional[str]], Future]] = None):
+        secret_type = secret.get('type')
+        label = secret.get('label')
+        if secret_type == 'password':
+            return controller.import_password(label, secret['password'], secret.get('login', ""), secret.get('url', ""))
+        if secret_type == 'mnemonic':
+            passphrase = secret.get('passphrase') or None
+            return controller.import_masterseed_mnemonic(
+                label, secret['mnemonic'], passphrase, secret.get('descriptor') or None,
+                secret.get('language') or None, (seeds or {}).get((secret['mnemonic'], passphrase)))
+        if secret_type == 'descriptor':
+            return controller.import_wallet_descriptor(label, secret['descriptor'])
+        if secret_type == 'data':
+            return controller.import_data(label, secret['data'])
+        entry = secretTypes.get_secret_type_by_key(secret_type)
+        if entry is None:
+            raise ValueError(f"Unsupported secret type: {secret_type}")
+        value = secret['value'].encode('utf-8') if entry.text else bytes.fromhex(secret['value'])
+        return controller.import_secret(label, entry.type, value, subtype=entry.subtype, verify_pin=True)
+
+    @staticmethod
+    def _run_step(step: str, func: Callable, *args):
+        """Run a controller method, errors are raised as ProvisioningError"""
+        try:
+            return func(*args)
+        except Exception as ex:
+            raise ProvisioningError(step, str(ex)) from ex
+
+
+def load_recipe(path: str, pin: Optional[str] = None) -> Dict[str, Any]:
+    """Load and validate a recipe, pin overrides the PIN of the recipe (validated the same way)"""
+    with open(path, encoding='utf-8') as f:
+        recipe = json.load(f)
+    if pin:
+        recipe['pin'] = pin
+    if not recipe.get('pin'):
+        raise ValueError("The recipe must provide a PIN")
+    if not 4 <= len(recipe['pin']) <= 16:
+        raise ValueError("PIN must contain between 4 and 16 characters")
+    for secret in recipe.get('secrets') or []:
+        if secret.get('type') not in SECRET_TYPES:
+            raise ValueError(f"Unsupported secret type: {secret.get('type')} (expected one of {SECRET_TYPES})")
+        if not secret.get('label'):
+            raise ValueError("The label field is mandatory for secrets.")
+        if secret.get('type') == GENERATED_MNEMONIC:
+            if not isinstance(secret.get('count', 1), int) or secret.get('count', 1) < 1:
+                raise ValueError("The count of generated mnemonics must be a positive integer")
+            if secret.get('words', 12) not in MNEMONIC_LENGTHS:
+                raise ValueError(f"Number of words must be one of the following: {list(MNEMONIC_LENGTHS)}")
+    return recipe
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="satochip-utils-cli", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recipe", help="provisioning recipe (json)")
+    parser.add_argument("--pin", help="override the PIN of the recipe")
+    parser.add_argument("--verify", action="store_true",
+                        help="export the secrets imported on Seedkeeper cards again and check their fingerprint "
+                             "and decoded values against the recipe")
+    parser.add_argument("--count", type=int, default=None, help="exit after provisioning this number of cards")
+    parser.add_argument("--all-readers", action="store_true",
+                        help="provision the cards of all readers in parallel (one card worker per reader)")
+    parser.add_argument("--trace-apdu", metavar="PATH", default=None, help="record APDUs (see apduTracer)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logs (on stderr)")
+    args = parser.parse_args(argv)
+
+    loglevel = logging.DEBUG if args.verbose else logging.WARNING
+    logging.basicConfig(level=loglevel, stream=sys.stderr,
+                        format='%(asctime)s - [%(filename)s:%(lineno)d] - %(levelname)s - %(name)s - %(funcName)s() - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+    logger.setLevel(loglevel)
+
+    try:
+        recipe = load_recipe(args.recipe, pin=args.pin)
+    except Exception as ex:
+        parser.error(f"Invalid recipe {args.recipe}: {ex}")
+    trace_apdu = os.path.abspath(args.trace_apdu) if args.trace_apdu else None
+
+    view = HeadlessView(loglevel=loglevel)
+    view.provisioner = Provisioner(view, recipe, count=args.count, verify=args.verify)
+    reader_manager = None
+    if args.all_readers:
+        from readerManager import ReaderManager
+        reader_manager = ReaderManager(view, loglevel=loglevel, trace_apdu=trace_apdu)
+        if not reader_manager.readers:
+            parser.error("No card reader found")
+    else:
+        Controller(view, loglevel=loglevel, trace_apdu=trace_apdu)
+
+    print("Insert cards to provision (Ctrl-C to exit)", file=sys.stderr)
+    try:
+        view.mainloop()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        SeedDerivationPool.get().shutdown()
+        if reader_manager is not None:
+            reader_manager.close()
+        else:
+            view.controller.worker.stop()
+            view.controller.worker.run_sync(view.controller.card_logout)
+            view.controller.worker.run_sync(view.controller.cc.card_disconnect)
+            if view.controller.apdu_tracer is not None:
+                view.controller.apdu_tracer.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import binascii
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+# keys of CardConnector.seedkeeper_export_secret() holding the secret (or data containing it), never copied
+SECRET_KEYS = ('secret', 'secret_list', 'full_data', 'full_data_list')
+
+
+class SecretCache:
+    """
+    Opt-in in-memory cache of secrets exported in plaintext (--cache-secrets), so that showing a secret
+    viewed shortly before does not export it again from the card.
+
+    Entries are keyed by secret id and checked against the fingerprint of the header, they expire after
+    ttl seconds and at most max_entries are kept (least recently used are evicted first).
+    Entries are dropped when the cache is cleared (card removal, window blur, see View).
+
+    This only limits how long the cache itself holds secrets, it does not scrub them from memory: the export
+    dict passed to put(), the hex strings returned by get() and the decoded fields are regular (immutable)
+    Python objects, freed by the garbage collector once the secret is no longer shown.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, loglevel=logging.DEBUG):
+        logger.setLevel(loglevel)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        # sid => (expiry, header fields, secret)
+        self._entries: "OrderedDict[int, Tuple[float, Dict[str, Any], bytearray]]" = OrderedDict()
+
+    def __len__(self):
+        with self.lock:
+            return len(self._entries)
+
+    def _remove(self, sid: int):
+        _, _, buffer = self._entries.pop(sid)
+        buffer[:] = bytes(len(buffer))  # the cached copy at least, see class docstring
+
+    def put(self, secret: Dict[str, Any]):
+        """Keep a copy of an export of CardConnector.seedkeeper_export_secret() (before decoding)"""
+        if 'secret' not in secret:
+            return  # encrypted export
+        header = {key: value for key, value in secret.items() if key not in SECRET_KEYS}
+        buffer = bytearray(binascii.unhexlify(secret['secret']))
+        with self.lock:
+            if secret['id'] in self._entries:
+                self._remove(secret['id'])
+            self._entries[secret['id']] = (time.monotonic() + self.ttl, header, buffer)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def get(self, sid: int, fingerprint: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return a new export dict for this secret, or None if not cached, expired or with another fingerprint"""
+        with self.lock:
+            entry = self._entries.get(sid)
+            if entry is None:
+                return None
+            expiry, header, buffer = entry
+            if expiry < time.monotonic() or (fingerprint is not None and header.get('fingerprint') != fingerprint):
+                self._remove(sid)
+                return None
+            self._entries.move_to_end(sid)
+            secret = dict(header)
+            secret['secret'] = buffer.hex()
+        logger.debug(f"SecretCache hit for secret {sid}")
+        return secret
+
+    def remove(self, sid: int):
+        with self.lock:
+            if sid in self._entries:
+                self._remove(sid)
+
+    def purge_expired(self) -> int:
+        """Remove expired entries, return the number of entries removed"""
+        now = time.monotonic()
+        with self.lock:
+            expired = [sid for sid, (expiry, _, _) in self._entries.items() if expiry < now]
+            for sid in expired:
+                self._remove(sid)
+        if expired:
+            logger.debug(f"SecretCache purged {len(expired)} expired secrets")
+        return len(expired)
+
+    def clear(self):
+        with self.lock:
+            count = len(self._entries)
+            for sid in list(self._entries):
+                self._remove(sid)
+        if count:
+            logger.debug(f"SecretCache cleared {count} secrets")
@@ -0,0 +1,220 @@
+import binascii
+from typing import Any, Dict, Optional, Union
+
+# Raw formats of the Seedkeeper secrets (hex 'secret' field of seedkeeper_export_secret()).
+# Each format is a sequence of fields: length-prefixed byte strings (1 or 2 bytes size, big endian),
+# or single byte values. Decoders index the bytes directly and only slice the fields they return, with one
+# bounds check per field (no struct or helper call per field); encoders join the fields in a single allocation.
+# Both are faster than the previous Controller implementations, see benchmarks/bench_secret_codec.py.
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# raw bytes of the hex 'secret' field, the only copy of the whole secret made while decoding
+to_bytes = binascii.unhexlify
+
+
+def _to_str_or_hex(value: Optional[bytes]) -> str:
+    if value is None:
+        return ""
+    try:
+        return value.decode('utf-8')
+    except UnicodeDecodeError:
+        return value.hex()
+
+
+def _check_size(name: str, value: BytesLike, max_size: int = 255) -> int:
+    size = len(value)
+    if size > max_size:
+        raise _too_long(name, max_size)
+    return size
+
+
+def _too_long(name: str, max_size: int = 255) -> ValueError:
+    return ValueError(f"{name} is too long (max {max_size} bytes)!")
+
+
+####################################################################################################################
+""" DECODERS """
+
+# Decoders take the raw secret bytes (see to_bytes()) and add the decoded fields to result,
+# with the same keys as the Controller.decode_* methods. A first field larger than the data is decoded as is,
+# other fields larger than the remaining bytes are decoded as empty (as the previous Controller decoders).
+# An empty secret raises ValueError.
+
+
+NOT_ENOUGH_BYTES = "Failed to decode secret (not enough bytes)"
+
+
+# [password_size(1b) | password_bytes | login_size(1b) | login_bytes | url_size(1b) | url_bytes]
+def decode_password(data: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+    size = len(data)
+    if not size:
+        raise ValueError(NOT_ENOUGH_BYTES)
+    end = 1 + data[0]
+    password = data[1:end]
+    login = url = ""
+    if end < size:
+        start = end + 1
+        end = start + data[end]
+        if end <= size:
+            login = data[start:end].decode('utf-8')
+            if end < size:
+                start = end + 1
+                end = start + data[end]
+                if end <= size:
+                    url = data[start:end].decode('utf-8')
+    result['password_bytes'] = password
+    try:
+        result['password'] = result['secret_decoded'] = password.decode('utf-8')
+    except UnicodeDecodeError:
+        result['password'] = result['secret_decoded'] = f"error during utf8 decoding: {password.hex()}"
+    result['login'] = login
+    result['url'] = url
+    return result
+
+
+# [mnemonic_size(1b) | mnemonic | passphrase_size(1b) | passphrase]
+def decode_mnemonic(data: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+    size = len(data)
+    if not size:
+        raise ValueError(NOT_ENOUGH_BYTES)
+    end = 1 + data[0]
+    result['mnemonic'] = result['secret_decoded'] = data[1:end].decode('utf-8')
+    passphrase = ""
+    if end < size:
+        start = end + 1
+        end = start + data[end]
+        if end <= size:
+            passphrase = data[start:end].decode('utf-8')
+    result['passphrase'] = passphrase
+    return result
+
+
+# [masterseed_size(1b) | masterseed | wordlist_selector(1b) | entropy_size(1b) | entropy |
+#  passphrase_size(1b) | passphrase | descriptor_size(2b) | descriptor]
+def decode_masterseed_mnemonic(data: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Masterseed with its BIP39 entropy, the mnemonic is recovered from 'entropy' by the caller.
+    A truncated entropy is decoded as is."""
+    size = len(data)
+    if not size:
+        raise ValueError(NOT_ENOUGH_BYTES)
+    end = 1 + data[0]
+    masterseed = data[1:end]
+    wordlist_selector = None
+    entropy = b""
+    passphrase = ""
+    descriptor = b""
+    if end < size:
+        wordlist_selector = data[end]
+        end += 1
+        if end < size:
+            start = end + 1
+            end = start + data[end]
+            entropy = data[start:end]
+            if end < size:
+                start = end + 1
+                end = start + data[end]
+                if end <= size:
+                    passphrase = data[start:end].decode('utf-8')
+                    if end + 2 <= size:
+                        start = end + 2
+                        end = start + (data[end] << 8 | data[end + 1])
+                        if end <= size:
+                            descriptor = data[start:end]
+    result['masterseed_bytes'] = masterseed
+    result['masterseed'] = result['secret_decoded'] = masterseed.hex()
+    result['wordlist_selector'] = wordlist_selector
+    result['entropy'] = entropy
+    result['passphrase'] = passphrase
+    try:
+        result['descriptor'] = descriptor.decode('utf-8')
+    except UnicodeDecodeError:
+        result['descriptor'] = descriptor.hex()
+    return result
+
+
+# [secret_size(1b) | secret], e.g. Masterseed, Pubkey, 2FA
+def decode_1byte_secret(data: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+    if not data:
+        raise ValueError(NOT_ENOUGH_BYTES)
+    secret = data[1:1 + data[0]]
+    result['secret_bytes'] = secret
+    result['secret_decoded'] = secret.hex()
+    return result
+
+
+def decode_1byte_text(data: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+    """[secret_size(1b) | secret] where secret is utf-8 text (hex if not), e.g. Master password"""
+    if not data:
+        raise ValueError(NOT_ENOUGH_BYTES)
+    secret = data[1:1 + data[0]]
+    result['secret_bytes'] = secret
+    result['secret_decoded'] = _to_str_or_hex(secret)
+    return result
+
+
+# [secret_size(2b) | secret], e.g. Data, Wallet descriptor
+def decode_2bytes_secret(data: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+    if len(data) < 2:
+        result['secret_decoded'] = "Failed to decode data (not enough bytes)"
+        return result
+    # declared size larger than the data: decode what is available
+    result['secret_decoded'] = _to_str_or_hex(data[2:2 + (data[0] << 8 | data[1])])
+    return result
+
+
+def decode_default(data: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+    result['secret_bytes'] = data
+    result['secret_decoded'] = data.hex()
+    return result
+
+
+####################################################################################################################
+""" ENCODERS """
+
+# Encoders take utf-8 encoded values, so that callers encode each string once (for size checks and encoding).
+# Values exceeding their size prefix raise ValueError.
+
+
+def encode_password(password: bytes, login: Optional[bytes] = None, url: Optional[bytes] = None) -> bytes:
+    """Empty trailing fields are omitted, an empty login is kept if an url is given"""
+    # sizes checked inline, this is the most frequent import
+    if len(password) > 255:
+        raise _too_long("Password")
+    if not login and not url:
+        return bytes((len(password),)) + password
+    login = login or b""
+    if len(login) > 255:
+        raise _too_long("Login")
+    if not url:
+        return b"".join((bytes((len(password),)), password, bytes((len(login),)), login))
+    if len(url) > 255:
+        raise _too_long("Url")
+    return b"".join((bytes((len(password),)), password, bytes((len(login),)), login, bytes((len(url),)), url))
+
+
+def encode_mnemonic(mnemonic: bytes, passphrase: Optional[bytes] = None) -> bytes:
+    passphrase = passphrase or b""
+    return b"".join((bytes((_check_size("Mnemonic", mnemonic),)), mnemonic,
+                     bytes((_check_size("Passphrase", passphrase),)), passphrase))
+
+
+def encode_masterseed_mnemonic(masterseed: bytes, wordlist_selector: int, entropy: bytes,
+                               passphrase: Optional[bytes] = None, descriptor: Optional[bytes] = None) -> bytes:
+    passphrase = passphrase or b""
+    descriptor = descriptor or b""
+    descriptor_size = _check_size("Descriptor", descriptor, 65535)
+    return b"".join((
+        bytes((_check_size("Masterseed", masterseed),)), masterseed,
+        bytes((wordlist_selector, _check_size("Entropy", entropy))), entropy,
+        bytes((_check_size("Passphrase", passphrase),)), passphrase,
+        bytes((descriptor_size >> 8, descriptor_size & 0xFF)), descriptor))
+
+
+def encode_1byte_secret(secret: BytesLike) -> bytes:
+    return bytes((_check_size("Secret", secret),)) + bytes(secret)
+
+
+def encode_2bytes_secret(secret: BytesLike) -> bytes:
+    size = _check_size("Secret", secret, 65535)
+    return bytes((size >> 8, size & 0xFF)) + bytes(secret)
@@ -0,0 +1,354 @@
+import bisect
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+# sort orders of SecretHeaderStore.search()
+SORT_CARD = "card"
+SORT_LABEL = "label"
+SORT_TYPE = "type"
+
+# versions are unique across stores, so that a view can compare versions of different stores
+_versions = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class HeaderSync:
+    """Changes between a SecretHeaderStore and the card, see Controller.sync_headers()"""
+    seedkeeper_status: Optional[Dict[str, Any]] = field(default=None, hash=False)
+    generation: Optional[int] = None  # CardSession.generation when the card was read
+    added: List[Dict[str, Any]] = field(default_factory=list, hash=False)
+    updated: List[Dict[str, Any]] = field(default_factory=list, hash=False)
+    removed: List[int] = field(default_factory=list, hash=False)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+
+class SecretHeaderStore:
+    """
+    Seedkeeper secret headers, indexed by id, fingerprint, type and label.
+
+    Headers are kept in card order (as returned by seedkeeper_list_secret_headers()), except for the
+    headers added with prepend=True (newly imported secrets) that come first, newest first.
+    Lookups are O(1). The label search index (sorted list of case-folded labels, see search()) is kept up to date
+    on each insertion and deletion with bisect (O(log n) search, O(n) list insertion), and built with a single sort
+    by replace_all(). Prefix matches are found by bisection, other substring matches still scan the labels.
+    Each change updates `version` (unique across stores), so that views can detect that the list must
+    be rendered again.
+
+    `is_loaded` is False until the headers are fetched from the card, and after clear().
+    `seedkeeper_status` is the Seedkeeper status when the headers were listed (None before v0.2),
+    used to check that a cached copy is still valid.
+    """
+
+    def __init__(self, headers: Optional[Iterable[Dict[str, Any]]] = None,
+                 seedkeeper_status: Optional[Dict[str, Any]] = None):
+        self.version = next(_versions)
+        self.is_loaded = False
+        self.seedkeeper_status = seedkeeper_status
+        self._clear()
+        if headers is not None:
+            self.replace_all(headers)
+
+    def _clear(self):
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        # ordering: ids are used as ordered sets (dict values are unused)
+        self._front: Dict[int, None] = {}  # prepended, oldest first
+        self._back: Dict[int, None] = {}  # appended
+        # secondary indexes: key -> ordered set of ids
+        self._by_fingerprint: Dict[str, Dict[int, None]] = {}
+        self._by_type: Dict[int, Dict[int, None]] = {}
+        self._by_label: Dict[str, Dict[int, None]] = {}
+        self._by_export_rights: Dict[int, Dict[int, None]] = {}
+        # search index: (casefolded label, id), sorted
+        self._labels: List[Tuple[str, int]] = []
+
+    ####################################################################################################################
+    """ CHANGES """
+
+    def replace_all(self, headers: Iterable[Dict[str, Any]]):
+        """Replace the content of the store with the headers listed from the card"""
+        self._clear()
+        for header in headers:
+            self._add(header, prepend=False, index_label=False)
+        # single sort instead of one insertion per header
+        self._labels = sorted((self._get_search_key(header), sid) for sid, header in self._by_id.items())
+        self.is_loaded = True
+        self.version = next(_versions)
+
+    def clear(self):
+        """Forget all headers, they must be fetched again from the card"""
+        self._clear()
+        self.is_loaded = False
+        self.version = next(_versions)
+
+    def add(self, header: Dict[str, Any], prepend: bool = False):
+        """Add (or replace) a header, prepend=True shows it first"""
+        self._add(header, prepend)
+        self.version = next(_versions)
+
+    def remove(self, sid: int) -> Optional[Dict[str, Any]]:
+        """Remove the header with the given id, return it (None if not found)"""
+        header = self._remove(sid)
+        if header is not None:
+            self.version = next(_versions)
+        return header
+
+    def diff(self, headers: Iterable[Dict[str, Any]]) -> HeaderSync:
+        """Changes needed to match the headers listed from the card"""
+        known = self.snapshot()
+        sync = HeaderSync()
+        for header in headers:
+            current = known.pop(header['id'], None)
+            if current is None:
+                sync.added.append(header)
+            elif current != header:
+                sync.updated.append(header)
+        sync.removed.extend(known)
+        return sync
+
+    def apply_sync(self, sync: HeaderSync) -> bool:
+        """Apply changes computed by diff() or Controller.sync_headers(), headers still present keep their
+        position. The store is then in sync with the card. Return True if any header changed."""
+        for sid in sync.removed:
+            self._remove(sid)
+        for header in sync.updated:
+            if header['id'] in self._by_id:
+                self._replace(header['id'], header)
+            else:
+                self._add(header, prepend=False)
+        for header in sync.added:
+            self._add(header, prepend=False)
+        if sync.seedkeeper_status is not None:
+            self.seedkeeper_status = sync.seedkeeper_status
+        self.is_loaded = True
+        if sync.changed:
+            self.version = next(_versions)
+        return sync.changed
+
+    def apply_imported(self, header: Dict[str, Any], seedkeeper_status: Optional[Dict[str, Any]]) -> bool:
+        """Add the header of a secret imported by this application, shown first. seedkeeper_status is the status
+        read after the import. Return False if the card also changed otherwise, the store must then be synced
+        again (see Controller.sync_headers())."""
+        self.add(header, prepend=True)
+        return self._update_seedkeeper_status(seedkeeper_status, 1)
+
+    def apply_deleted(self, sid: int, seedkeeper_status: Optional[Dict[str, Any]]) -> bool:
+        """Remove the header of a secret deleted by this application, same as apply_imported()"""
+        self.remove(sid)
+        return self._update_seedkeeper_status(seedkeeper_status, -1)
+
+    def _update_seedkeeper_status(self, seedkeeper_status: Optional[Dict[str, Any]], delta: int) -> bool:
+        if seedkeeper_status is None:
+            return True  # before v0.2, nothing to check
+        expected = None if self.seedkeeper_status is None else self.seedkeeper_status['nb_secrets'] + delta
+        if seedkeeper_status['nb_secrets'] != expected:
+            logger.debug(f"SecretHeaderStore out of sync: {self.seedkeeper_status} then {seedkeeper_status}")
+            self.seedkeeper_status = None  # forces a full sync
+            return False
+        self.seedkeeper_status = seedkeeper_status
+        return True
+
+    def patch(self, headers: Iterable[Dict[str, Any]]) -> bool:
+        """Update the store with the headers listed from the card, only changing the headers that differ.
+        Return True if anything changed."""
+        return self.apply_sync(self.diff(headers))
+
+    def _add(self, header: Dict[str, Any], prepend: bool, index_label: bool = True):
+        sid = header['id']
+        if sid in self._by_id:
+            self._remove(sid)
+        self._by_id[sid] = header
+        (self._front if prepend else self._back)[sid] = None
+        self._index_header(header, sid, index_label)
+
+    def _replace(self, sid: int, header: Dict[str, Any]):
+        # same position, indexes updated
+        self._unindex_header(self._by_id[sid], sid)
+        self._by_id[sid] = header
+        self._index_header(header, sid)
+
+    def _remove(self, sid: int) -> Optional[Dict[str, Any]]:
+        header = self._by_id.pop(sid, None)
+        if header is None:
+            return None
+        self._front.pop(sid, None)
+        self._back.pop(sid, None)
+        self._unindex_header(header, sid)
+        return header
+
+    def _index_header(self, header: Dict[str, Any], sid: int, index_label: bool = True):
+        self._index(self._by_fingerprint, header.get('fingerprint'), sid)
+        self._index(self._by_type, header.get('type'), sid)
+        self._index(self._by_label, header.get('label'), sid)
+        self._index(self._by_export_rights, header.get('export_rights'), sid)
+        if index_label:
+            bisect.insort(self._labels, (self._get_search_key(header), sid))
+
+    def _unindex_header(self, header: Dict[str, Any], sid: int):
+        self._unindex(self._by_fingerprint, header.get('fingerprint'), sid)
+        self._unindex(self._by_type, header.get('type'), sid)
+        self._unindex(self._by_label, header.get('label'), sid)
+        self._unindex(self._by_export_rights, header.get('export_rights'), sid)
+        entry = (self._get_search_key(header), sid)
+        index = bisect.bisect_left(self._labels, entry)
+        if index < len(self._labels) and self._labels[index] == entry:
+            del self._labels[index]
+
+    @staticmethod
+    def _get_search_key(header: Dict[str, Any]) -> str:
+        return (header.get('label') or "").casefold()
+
+    @staticmethod
+    def _index(index: Dict[Any, Dict[int, None]], key, sid: int):
+        if key is not None:
+            index.setdefault(key, {})[sid] = None
+
+    @staticmethod
+    def _unindex(index: Dict[Any, Dict[int, None]], key, sid: int):
+        ids = index.get(key)
+        if ids is not None:
+            ids.pop(sid, None)
+            if not ids:
+                del index[key]
+
+    ####################################################################################################################
+    """ LOOKUPS """
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, sid: int) -> bool:
+        return sid in self._by_id
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for sid in reversed(self._front):
+            yield self._by_id[sid]
+        for sid in self._back:
+            yield self._by_id[sid]
+
+    def get(self, sid: int) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(sid)
+
+    def get_by_fingerprint(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """First header with this fingerprint (the same secret can be imported several times)"""
+        ids = self._by_fingerprint.get(fingerprint)
+        if not ids:
+            return None
+        return self._by_id[next(iter(ids))]
+
+    def has_fingerprint(self, fingerprint: str) -> bool:
+        return fingerprint in self._by_fingerprint
+
+    def get_by_type(self, secret_type: int) -> List[Dict[str, Any]]:
+        return [self._by_id[sid] for sid in self._by_type.get(secret_type, ())]
+
+    def get_by_label(self, label: str) -> List[Dict[str, Any]]:
+        return [self._by_id[sid] for sid in self._by_label.get(label, ())]
+
+    def search(self, text: str = "", secret_type: Optional[int] = None, export_rights: Optional[int] = None,
+               sort: str = SORT_CARD) -> List[Dict[str, Any]]:
+        """Headers whose label contains text (case-insensitive), with the given type and export rights.
+        With sort=SORT_CARD, labels starting with text come first, then the other matches."""
+        candidates = None  # None: all ids
+        for index, key in ((self._by_type, secret_type), (self._by_export_rights, export_rights)):
+            if key is not None:
+                ids = index.get(key, {})
+                candidates = ids if candidates is None else {sid: None for sid in candidates if sid in ids}
+
+        text = text.casefold()
+        labels = self._labels
+        if text:
+            # prefix matches are a contiguous range of the sorted labels
+            start = bisect.bisect_left(labels, (text,))
+            end = start
+            while end < len(labels) and labels[end][0].startswith(text):
+                end += 1
+            prefix_ids = {sid for _, sid in labels[start:end]}
+            other_ids = {sid for i, (label, sid) in enumerate(labels)
+                         if (i < start or i >= end) and text in label}
+            if candidates is not None:
+                prefix_ids.intersection_update(candidates)
+                other_ids.intersection_update(candidates)
+        else:
+            prefix_ids = set(self._by_id) if candidates is None else set(candidates)
+            other_ids = set()
+
+        if sort == SORT_LABEL:
+            return [self._by_id[sid] for _, sid in labels if sid in prefix_ids or sid in other_ids]
+        headers = [header for header in self if header['id'] in prefix_ids]
+        headers += [header for header in self if header['id'] in other_ids]
+        if sort == SORT_TYPE:
+            headers.sort(key=lambda header: (header['type'], header['subtype']))  # stable: same order within type
+        return headers
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def snapshot(self) -> Dict[int, Dict[str, Any]]:
+        """Copy of the headers by id, safe to use from the card worker thread"""
+        return dict(self._by_id)
+
+
+class SecretHeaderCache:
+    """
+    In-memory SecretHeaderStore per card, keyed by card id (authentikey, see CardSession.get_card_id()),
+    so that headers are not listed again when the same card is removed and inserted again.
+
+    A cached store is only reused if the Seedkeeper status (number of secrets and free memory) is the
+    same as when it was put: stores must be put again with the new status once secrets are imported or deleted
+    (see Controller.cache_secret_headers()).
+    """
+
+    def __init__(self, max_cards: int = 32):
+        self.max_cards = max_cards
+        self.lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[SecretHeaderStore, Tuple[int, int]]]" = OrderedDict()
+
+    @staticmethod
+    def get_key(seedkeeper_status: Optional[Dict[str, Any]]) -> Optional[Tuple[int, int]]:
+        if not seedkeeper_status:
+            return None
+        return seedkeeper_status['nb_secrets'], seedkeeper_status['free_memory']
+
+    def get(self, card_id: str, seedkeeper_status: Optional[Dict[str, Any]]) -> Optional[SecretHeaderStore]:
+        key = self.get_key(seedkeeper_status)
+        if key is None:
+            return None
+        with self.lock:
+            entry = self._entries.get(card_id)
+            if entry is None:
+                return None
+            store, cached_key = entry
+            if cached_key != key or not store.is_loaded:
+                logger.debug(f"SecretHeaderCache stale entry for {card_id[:16]}: {cached_key} != {key}")
+                del self._entries[card_id]
+                return None
+            self._entries.move_to_end(card_id)
+            return store
+
+    def put(self, card_id: str, store: SecretHeaderStore, seedkeeper_status: Optional[Dict[str, Any]]):
+        key = self.get_key(seedkeeper_status)
+        if key is None:
+            return
+        with self.lock:
+            self._entries[card_id] = (store, key)
+            self._entries.move_to_end(card_id)
+            while len(self._entries) > self.max_cards:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, card_id: Optional[str] = None):
+        """Forget the headers of a card, or of all cards"""
+        with self.lock:
+            if card_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(card_id, None)
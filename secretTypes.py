@@ -0,0 +1,201 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+import secretCodec
+from bip39Wordlist import Bip39Wordlist
+from constants import (TYPE_DIC, TYPE_MASTERSEED, TYPE_BIP39_MNEMONIC, TYPE_ELECTRUM_MNEMONIC,
+                       TYPE_SHAMIR_SECRET_SHARE, TYPE_PRIVKEY, TYPE_PUBKEY, TYPE_SYMMETRIC_KEY, TYPE_PASSWORD,
+                       TYPE_MASTER_PASSWORD, TYPE_CERTIFICATE, TYPE_2FA_SECRET, TYPE_DATA, TYPE_DESCRIPTOR)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+# Registry of the Seedkeeper secret types, keyed by (type, subtype).
+# Each entry provides the decoder and encoder (see secretCodec), the frame used to show the secret (see
+# View.show_seedkeeper_secret()) and the size limits of the encoded fields. New types are registered here only.
+
+# frames used to show a secret, see View._show_seedkeeper_secret_frame()
+FRAME_PASSWORD = "password"
+FRAME_MNEMONIC = "mnemonic"
+FRAME_SIMPLE = "simple"
+
+Decoder = Callable[[bytes, Dict[str, Any]], Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class SecretType:
+    type: int
+    subtype: Optional[int]  # None matches any subtype without a more specific entry
+    name: str
+    decoder: Decoder  # adds decoded fields to the secret dict, from the raw secret bytes
+    encoder: Optional[Callable[..., bytes]]  # fields (bytes or int) to raw secret bytes, None if not supported
+    frame: str = FRAME_SIMPLE
+    # (name, max size in bytes) of each encoder argument, in order (None for values without size)
+    limits: Tuple[Tuple[str, Optional[int]], ...] = ()
+    alias: Optional[str] = None  # key also holding 'secret_decoded', e.g. 'pubkey'
+    defaults: Tuple[str, ...] = ()  # keys set to "" before decoding (fields expected by the frame)
+    key: Optional[str] = None  # type name in provisioning recipes, see satochip_utils_cli
+    text: bool = False  # recipe values are utf-8 text (hex otherwise)
+
+    def check_sizes(self, *values):
+        """Raise ValueError if an encoder argument exceeds its size limit"""
+        for (name, max_size), value in zip(self.limits, values):
+            if max_size is not None and value is not None and len(value) > max_size:
+                raise ValueError(f"{name} is too long (max {max_size} bytes)!")
+
+    def encode(self, *values) -> bytes:
+        if self.encoder is None:
+            raise ValueError(f"Import of {self.name} secrets is not supported")
+        self.check_sizes(*values)
+        return self.encoder(*values)
+
+    def decode(self, secret_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Add decoded fields to secret_dict (export of Controller.cc.seedkeeper_export_secret())"""
+        result = secret_dict
+        for key in self.defaults:
+            result[key] = ''
+        try:
+            self._decode_into(secret_dict['secret'], result)
+        except Exception as e:
+            error_msg = self.decode_error(e)
+            logger.error(error_msg)
+            result['secret_decoded'] = error_msg
+        return result
+
+    def decode_fields(self, secret_hex: str) -> Dict[str, Any]:
+        """Decoded fields only, without copying the export dict (see Controller.decode_secrets()).
+        Raises on malformed secrets."""
+        return self._decode_into(secret_hex, dict.fromkeys(self.defaults, ''))
+
+    def decode_error(self, ex: Exception) -> str:
+        return f"Unexpected error during {self.name} decoding: {str(ex)}"
+
+    def _decode_into(self, secret_hex: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        self.decoder(secretCodec.to_bytes(secret_hex), result)
+        if self.alias is not None:
+            result[self.alias] = result['secret_decoded']
+        return result
+
+
+class DecodedSecret(NamedTuple):
+    """Result of Controller.decode_secrets(), fields only hold the decoded values (see SecretType.decode_fields())"""
+    id: Optional[int]
+    label: Optional[str]
+    fingerprint: Optional[str]
+    secret_type: SecretType
+    fields: Dict[str, Any]
+    error: Optional[str] = None  # decoding error, fields is empty
+
+
+def _decode_masterseed_mnemonic(data: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+    secretCodec.decode_masterseed_mnemonic(data, result)
+    # Mnemonic recovery from entropy, in the language of the wordlist_selector
+    if result['entropy']:
+        try:
+            wordlist = Bip39Wordlist.get_by_selector(result['wordlist_selector'])
+        except ValueError as e:
+            # unknown selector or wordlist not available: the entropy is still shown
+            logger.warning(f"Unable to recover mnemonic: {str(e)}")
+            result['mnemonic'] = f"Wordlist not available ({str(e)}), entropy: {result['entropy'].hex()}"
+            return result
+        result['language'] = wordlist.language
+        result['mnemonic'] = wordlist.to_mnemonic(result['entropy'])
+    return result
+
+
+def _decode_master_password(data: bytes, result: Dict[str, Any]) -> Dict[str, Any]:
+    secretCodec.decode_1byte_text(data, result)
+    result['password'] = result['secret_decoded']
+    return result
+
+
+SECRET_TYPES: Dict[Tuple[int, Optional[int]], SecretType] = {}
+
+DEFAULT_SECRET_TYPE = SecretType(
+    None, None, "Unknown type", secretCodec.decode_default, None,
+)
+
+
+def register(secret_type: SecretType) -> SecretType:
+    SECRET_TYPES[(secret_type.type, secret_type.subtype)] = secret_type
+    return secret_type
+
+
+def get_secret_type(secret_type: int, subtype: Optional[int] = None) -> SecretType:
+    entry = SECRET_TYPES.get((secret_type, subtype))
+    if entry is None:
+        entry = SECRET_TYPES.get((secret_type, None), DEFAULT_SECRET_TYPE)
+    return entry
+
+
+def get_secret_type_by_key(key: str) -> Optional[SecretType]:
+    for entry in SECRET_TYPES.values():
+        if entry.key == key:
+            return entry
+    return None
+
+
+# Masterseed only, [masterseed_size(1b) | masterseed]
+register(SecretType(
+    TYPE_MASTERSEED, 0x00, TYPE_DIC[TYPE_MASTERSEED], secretCodec.decode_1byte_secret,
+    secretCodec.encode_1byte_secret, limits=(("Masterseed", 255),), alias='masterseed',
+))
+# Masterseed with BIP39 mnemonic (SECRET_SUBTYPE_BIP39), see secretCodec.decode_masterseed_mnemonic()
+register(SecretType(
+    TYPE_MASTERSEED, 0x01, "Mnemonic", _decode_masterseed_mnemonic, secretCodec.encode_masterseed_mnemonic,
+    frame=FRAME_MNEMONIC,
+    limits=(("Masterseed", 255), ("Wordlist selector", None), ("Entropy", 255), ("Passphrase", 255),
+            ("Descriptor", 65535)),
+    defaults=('mnemonic', 'passphrase', 'descriptor'), key='mnemonic',
+))
+SECRET_TYPES[(TYPE_MASTERSEED, None)] = SECRET_TYPES[(TYPE_MASTERSEED, 0x01)]  # other subtypes include a mnemonic
+for _type in (TYPE_BIP39_MNEMONIC, TYPE_ELECTRUM_MNEMONIC):
+    register(SecretType(
+        _type, None, TYPE_DIC[_type], secretCodec.decode_mnemonic, secretCodec.encode_mnemonic,
+        frame=FRAME_MNEMONIC, limits=(("Mnemonic", 255), ("Passphrase", 255)), defaults=('mnemonic', 'passphrase'),
+    ))
+register(SecretType(
+    TYPE_SHAMIR_SECRET_SHARE, None, TYPE_DIC[TYPE_SHAMIR_SECRET_SHARE], secretCodec.decode_1byte_secret,
+    secretCodec.encode_1byte_secret, limits=(("Share", 255),), alias='share', key='shamir_share',
+))
+register(SecretType(
+    TYPE_PRIVKEY, None, TYPE_DIC[TYPE_PRIVKEY], secretCodec.decode_1byte_secret, secretCodec.encode_1byte_secret,
+    limits=(("Private key", 255),), alias='privkey', key='privkey',
+))
+register(SecretType(
+    TYPE_PUBKEY, None, TYPE_DIC[TYPE_PUBKEY], secretCodec.decode_1byte_secret, secretCodec.encode_1byte_secret,
+    limits=(("Pubkey", 255),), alias='pubkey', key='pubkey',
+))
+register(SecretType(
+    TYPE_SYMMETRIC_KEY, None, TYPE_DIC[TYPE_SYMMETRIC_KEY], secretCodec.decode_1byte_secret,
+    secretCodec.encode_1byte_secret, limits=(("Symmetric key", 255),), alias='key', key='symmetric_key',
+))
+register(SecretType(
+    TYPE_PASSWORD, None, TYPE_DIC[TYPE_PASSWORD], secretCodec.decode_password, secretCodec.encode_password,
+    frame=FRAME_PASSWORD, limits=(("Password", 255), ("Login", 255), ("Url", 255)),
+    defaults=('password', 'login', 'url'), key='password', text=True,
+))
+register(SecretType(
+    TYPE_MASTER_PASSWORD, None, TYPE_DIC[TYPE_MASTER_PASSWORD], _decode_master_password,
+    secretCodec.encode_1byte_secret, frame=FRAME_PASSWORD, limits=(("Master password", 255),),
+    defaults=('password', 'login', 'url'), key='master_password', text=True,
+))
+register(SecretType(
+    TYPE_CERTIFICATE, None, TYPE_DIC[TYPE_CERTIFICATE], secretCodec.decode_2bytes_secret,
+    secretCodec.encode_2bytes_secret, limits=(("Certificate", 65535),), alias='certificate', key='certificate',
+    text=True,
+))
+register(SecretType(
+    TYPE_2FA_SECRET, None, TYPE_DIC[TYPE_2FA_SECRET], secretCodec.decode_1byte_secret,
+    secretCodec.encode_1byte_secret, limits=(("2FA secret", 255),), alias='secret2fa',
+))
+register(SecretType(
+    TYPE_DATA, None, TYPE_DIC[TYPE_DATA], secretCodec.decode_2bytes_secret, secretCodec.encode_2bytes_secret,
+    limits=(("Data", 65535),), alias='data', key='data', text=True,
+))
+register(SecretType(
+    TYPE_DESCRIPTOR, None, TYPE_DIC[TYPE_DESCRIPTOR], secretCodec.decode_2bytes_secret,
+    secretCodec.encode_2bytes_secret, limits=(("Wallet descriptor", 65535),), alias='descriptor',
+    key='descriptor', text=True,
+))
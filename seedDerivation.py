@@ -0,0 +1,85 @@
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Optional, Set
+
+from bip39Wordlist import normalize_string
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+PBKDF2_ROUNDS = 2048  # BIP39
+
+
+def derive_seed(mnemonic: str, passphrase: Optional[str] = None) -> bytes:
+    """BIP39 seed of a mnemonic (64 bytes), mnemonic and passphrase are NFKD normalized"""
+    salt = "mnemonic" + normalize_string(passphrase or "")
+    return hashlib.pbkdf2_hmac(
+        "sha512", normalize_string(mnemonic).encode("utf-8"), salt.encode("utf-8"), PBKDF2_ROUNDS)
+
+
+class SeedDerivationPool:
+    """
+    Process-wide thread pool deriving BIP39 seeds ahead of their import (see get()).
+
+    hashlib.pbkdf2_hmac releases the GIL, so derivations run in parallel with card I/O of the card workers
+    (e.g. the seeds of the next card are derived while the previous one is provisioned, see satochip_utils_cli).
+    Derivations that have not started yet can be cancelled, a running derivation completes but its result is
+    dropped. Seeds are only held by the returned futures.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "SeedDerivationPool":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = SeedDerivationPool()
+            return cls._instance
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[Future] = set()
+
+    def submit(self, mnemonic: str, passphrase: Optional[str] = None) -> Future:
+        """Start the derivation of a seed, the future result is the seed (bytes)"""
+        with self.lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="seed-derivation")
+            future = self._executor.submit(derive_seed, mnemonic, passphrase)
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future):
+        with self.lock:
+            self._pending.discard(future)
+
+    @staticmethod
+    def result(future: Optional[Future], mnemonic: str, passphrase: Optional[str] = None) -> bytes:
+        """Seed of a future returned by submit(), or derived in the calling thread if there is none
+        (or if it was cancelled)"""
+        if future is not None and not future.cancelled():
+            return future.result()
+        return derive_seed(mnemonic, passphrase)
+
+    def cancel(self, futures: Optional[Iterable[Future]] = None) -> int:
+        """Cancel derivations (all pending derivations by default), return the number of derivations cancelled"""
+        with self.lock:
+            futures = list(self._pending if futures is None else futures)
+        count = sum(1 for future in futures if future.cancel())
+        if count:
+            logger.debug(f"SeedDerivationPool cancelled {count} derivations")
+        return count
+
+    def shutdown(self):
+        self.cancel()
+        with self.lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
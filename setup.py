@@ -37,5 +37,12 @@ setup(
         "Topic :: Software Development :: Libraries :: Python Modules",
     ],
     packages=find_packages(),
+    # headless provisioning, does not require customtkinter (see satochip_utils_cli.py)
+    py_modules=["satochip_utils_cli", "controller", "readerManager", "cardWorker", "cardSession",
+                "authenticityCache", "apduTracer", "controllerEvents", "secretHeaderStore", "headerDiskCache",
+                "secretCodec", "secretTypes", "secretCache", "bip39Wordlist", "seedDerivation", "constants", "version"],
+    entry_points={
+        "console_scripts": ["satochip-utils-cli = satochip_utils_cli:main"],
+    },
     zip_safe=False,
 )
\ No newline at end of file
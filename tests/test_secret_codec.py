@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import secretCodec  # noqa: E402
+
+
+class TestSecretCodec(unittest.TestCase):
+
+    def test_roundtrip(self):
+        data = bytes(secretCodec.encode_password(b"pwd", b"", b"https://satochip.io"))
+        result = secretCodec.decode_password(data, {})
+        self.assertEqual((result['password'], result['login'], result['url']), ("pwd", "", "https://satochip.io"))
+
+        data = bytes(secretCodec.encode_masterseed_mnemonic(b"\x01" * 64, 0x01, b"\x02" * 16, b"pass", b"wpkh()"))
+        result = secretCodec.decode_masterseed_mnemonic(data, {})
+        self.assertEqual(result['masterseed_bytes'], b"\x01" * 64)
+        self.assertEqual(result['wordlist_selector'], 0x01)
+        self.assertEqual(result['entropy'], b"\x02" * 16)
+        self.assertEqual((result['passphrase'], result['descriptor']), ("pass", "wpkh()"))
+
+    def test_truncated_first_field_keeps_partial_bytes(self):
+        # declared size 32, only 3 bytes available: decoded as is (same as the previous Controller decoders)
+        result = secretCodec.decode_1byte_secret(b"\x20abc", {})
+        self.assertEqual(result['secret_bytes'], b"abc")
+        self.assertEqual(result['secret_decoded'], b"abc".hex())
+
+        result = secretCodec.decode_password(b"\x20abc", {})
+        self.assertEqual((result['password'], result['login'], result['url']), ("abc", "", ""))
+
+        result = secretCodec.decode_2bytes_secret(b"\x00\x20abc", {})
+        self.assertEqual(result['secret_decoded'], "abc")
+
+    def test_truncated_trailing_field_is_empty(self):
+        # login declared with 10 bytes, only 2 available
+        result = secretCodec.decode_password(b"\x03pwd\x0aab", {})
+        self.assertEqual((result['password'], result['login'], result['url']), ("pwd", "", ""))
+
+    def test_empty_secret_raises(self):
+        with self.assertRaises(ValueError):
+            secretCodec.decode_1byte_secret(b"", {})
+        with self.assertRaises(ValueError):
+            secretCodec.decode_password(b"", {})
+
+    def test_encode_too_long(self):
+        with self.assertRaises(ValueError):
+            secretCodec.encode_1byte_secret(b"\x00" * 256)
+
+
+if __name__ == '__main__':
+    unittest.main()
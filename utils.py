@@ -1,13 +1,10 @@
-import os
-import sys
 import tkinter
-import unicodedata
 
 import customtkinter
 import logging
 import hashlib
 import pyqrcode
-from mnemonic import Mnemonic
+from bip39Wordlist import Bip39Wordlist
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -90,74 +87,11 @@ static char im_bits[] = {
     label.place()
 
 
-def mnemonic_to_entropy_bytes(mnemonic) -> bytearray:
-    MNEMONIC = Mnemonic("english")
-    if not MNEMONIC.check(mnemonic):
-        raise ValueError("Invalid mnemonic")
-
-    # Generate entropy from mnemonic
-    entropy = MNEMONIC.to_entropy(mnemonic)
-    return entropy
-
-
 def mnemonic_to_entropy_string(mnemonic) -> str:
     try:
-        # get the english wordlist
-        if getattr(sys, 'frozen', False):
-            application_path = sys._MEIPASS
-        else:
-            application_path = os.path.dirname(os.path.abspath(__file__))
-        logging.debug(f"Application path: {application_path}")
-
-        # Construct the path to the wordlist directory
-        wordlist_dir = os.path.join(application_path, 'wordlist')
-        logger.info(f"wordlist directory: {wordlist_dir}")
-
-        # Check if the directory exists
-        wordlist_path = os.path.join(wordlist_dir, "english.txt")
-        logger.info(f"wordlist path: {wordlist_path}")
-
-        # load list from file
-        wordlist = None
-        if os.path.exists(wordlist_path) and os.path.isfile(wordlist_path):
-            with open(wordlist_path, "r", encoding="utf-8") as f:
-                wordlist = [w.strip() for w in f.readlines()]
-
-        # compute standard SeedQR data
-        if isinstance(mnemonic, str):
-            words = mnemonic.split(" ")
-        elif isinstance(mnemonic, list):
-            words = mnemonic
-        else:
-            raise ValueError("Mnemonic should be a string or a list")
-
-        if len(words) not in [12, 15, 18, 21, 24]:
-            raise ValueError(
-                "Number of words must be one of the following: [12, 15, 18, 21, 24], but it is not (%d)."
-                % len(words)
-            )
-        # Look up all the words in the list and construct the
-        # concatenation of the original entropy and the checksum.
-        entropy_int_string = ""
-        for word in words:
-            # Find the words index in the wordlist
-            ndx = wordlist.index(normalize_string(word))
-            if ndx < 0:
-                raise LookupError('Unable to find "%s" in word list.' % word)
-            entropy_int_string += str(ndx).zfill(4)
-
-        return entropy_int_string
+        # compute standard SeedQR data (english wordlist, loaded once, see bip39Wordlist)
+        return Bip39Wordlist.get("english").to_seedqr(mnemonic)
 
     except Exception as ex:
         logger.error(f"Failed to convert mnemonic to entropy: {str(ex)}", exc_info=True)
         return f"Failed to convert mnemonic to entropy: {str(ex)}"
-
-def normalize_string(txt) -> str:
-    if isinstance(txt, bytes):
-        utxt = txt.decode("utf8")
-    elif isinstance(txt, str):
-        utxt = txt
-    else:
-        raise TypeError("String value expected")
-
-    return unicodedata.normalize("NFKD", utxt)
\ No newline at end of file
@@ -10,9 +10,9 @@ from customtkinter import CTkOptionMenu
 
 from FrameSeedkeeperGenerateSecretSelectType import FrameSeedkeeperGenerateSecretSelectType
 from applicationMode import ApplicationMode
-from constants import TYPE_PUBKEY, TYPE_DATA, TYPE_DESCRIPTOR, TYPE_2FA_SECRET, TYPE_ELECTRUM_MNEMONIC, \
-    TYPE_BIP39_MNEMONIC, TYPE_MASTERSEED, TYPE_PASSWORD
 from controller import Controller
+from controllerEvents import (InvalidInputError, SecretNotFoundError, CardSetupDone, SeedImported, SecretImported,
+                              SecretDeleted)
 from frameCardAbout import FrameCardAbout
 from frameCardAuthenticity import FrameCardAuthenticity
 from frameCardChangePin import FrameCardChangePin
@@ -39,6 +39,10 @@ from frameSeedkeeperShowPassword import FrameSeedkeeperShowPasswordSecret
 from frameSeedkeeperShowSimpleSecret import FrameSeedkeeperShowSecret
 from frameStart import FrameStart
 from frameWelcome import FrameWelcome
+from frameWidgetReaderStrip import FrameWidgetReaderStrip, READER_STRIP_HEIGHT
+from readerManager import ReaderManager
+import secretTypes
+from secretHeaderStore import SecretHeaderStore
 
 if (len(sys.argv) >= 2) and (sys.argv[1] in ['-v', '--verbose']):
     logging.basicConfig(level=logging.DEBUG,
@@ -65,10 +69,13 @@ HOVER_COLOR = "grey"
 TEXT_COLOR = "black"
 
 ICON_PATH = "./pictures_db/"
+READER_REFRESH_MS = 2000  # multi-reader mode: polling interval for new readers
+SECRET_CACHE_PURGE_MS = 5000  # --cache-secrets: interval between purges of expired secrets
 
 
 class View(customtkinter.CTk):
-    def __init__(self, loglevel=logging.INFO):
+    def __init__(self, loglevel=logging.INFO, trace_apdu=None, multi_reader=False, header_cache_dir=None,
+                 secret_cache_ttl=None):
         try:
             # logger.setLevel(loglevel)
             logger.setLevel(logging.DEBUG)
@@ -114,15 +121,33 @@ class View(customtkinter.CTk):
             self.seedkeeper_backup_result_frame = None
 
             # state
-            # store seedkeeper secret headers
-            self.secret_headers = None
-            # should we update the list of headers?
-            self.seedkeeper_secret_headers_need_update = True
+            # store seedkeeper secret headers (fetched from card when needed, see SecretHeaderStore.is_loaded)
+            self.secret_headers = SecretHeaderStore()
             # app is in seedbackup mode (inserting/removing card should not trigger start screen!)
             self.appMode = ApplicationMode.Normal
 
             # Initializing controller
-            self.controller = Controller(self, loglevel=loglevel)
+            # multi-reader mode: one controller per reader, self.controller is the selected reader
+            self.reader_manager = None
+            self.reader_strip = None
+            self.reader_label = None
+            if multi_reader:
+                self.reader_manager = ReaderManager(
+                    self, loglevel=loglevel, trace_apdu=trace_apdu, header_cache_dir=header_cache_dir,
+                    secret_cache_ttl=secret_cache_ttl)
+                if self.reader_manager.readers:
+                    self.controller = self.reader_manager.get_controller(self.reader_manager.readers[0])
+                else:
+                    logger.warning("No card reader found, multi-reader mode disabled")
+                    self.reader_manager = None
+            if self.reader_manager is None:
+                self.controller = Controller(
+                    self, loglevel=loglevel, trace_apdu=trace_apdu, header_cache_dir=header_cache_dir,
+                    secret_cache_ttl=secret_cache_ttl)
+                self.subscribe_controller_events(self.controller)
+            else:
+                for controller in self.reader_manager.controllers.values():
+                    self.subscribe_controller_events(controller)
 
             # Initializing main window
             self.main_window()
@@ -132,8 +157,25 @@ class View(customtkinter.CTk):
                                                      fg_color="white")
             self.main_frame.place(relx=0.5, rely=0.5, anchor="center")
 
+            # multi-reader mode: active reader on top, reader status strip at the bottom
+            if self.reader_manager is not None:
+                self.reader_label = customtkinter.CTkLabel(
+                    self, text="", width=1000, height=READER_STRIP_HEIGHT, fg_color=MAIN_MENU_COLOR,
+                    text_color=BUTTON_TEXT_COLOR, font=customtkinter.CTkFont(family="Outfit", size=14, weight="bold"))
+                self.reader_label.place(relx=0.5, rely=0, anchor="n")
+                self.reader_strip = FrameWidgetReaderStrip(self, self.reader_manager)
+                self.update_reader_strip()
+                self.after(READER_REFRESH_MS, self.refresh_readers)
+
+            # --cache-secrets: cached secrets are purged when they expire and when the window loses focus
+            if secret_cache_ttl:
+                self.bind("<FocusOut>", lambda event: self.after_idle(self._clear_secret_cache_if_blurred))
+                self.after(SECRET_CACHE_PURGE_MS, self.purge_secret_cache)
+
             # widgets
             self.show_button = None # popup button called in different contexts todo: refactor
+            self.busy_popup = None  # shown while a card job is running
+            self.busy_count = 0
 
             # Launching initialization starting with welcome view
             self.nocard_menu_frame = FrameMenuNoCard(self)
@@ -154,6 +196,9 @@ class View(customtkinter.CTk):
 
             window_width = 1000
             window_height = 600
+            if self.reader_manager is not None:
+                # room for the active reader label and the reader status strip
+                window_height += 2 * READER_STRIP_HEIGHT
             logger.debug(f"Window dimensions set to width: {window_width}, height: {window_height}")
 
             screen_width = self.winfo_screenwidth()
@@ -173,13 +218,29 @@ class View(customtkinter.CTk):
     def on_close(self):
         logger.info("IN View.on_close : Closing App")
         try:
+            if self.reader_manager is not None:
+                # stop card workers, logout and disconnect the cards in all readers
+                self.reader_manager.close()
+                self.destroy()
+                logger.debug("Main window destroyed")
+                return
+
+            # stop card worker before the mainloop disappears
+            self.controller.worker.stop()
+
             # Destruction de la fenêtre principale
             self.destroy()
             logger.debug("Main window destroyed")
 
+            # do not leave the card unlocked (after the job in progress, if any)
+            self.controller.worker.run_sync(self.controller.card_logout)
+
             # Déconnexion de la carte
-            self.controller.cc.card_disconnect()
+            self.controller.worker.run_sync(self.controller.cc.card_disconnect)
             logger.debug("Card disconnected successfully")
+
+            if self.controller.apdu_tracer is not None:
+                self.controller.apdu_tracer.close()
         except Exception as e:
             logger.error(f"An unexpected error occurred in on_close: {e}", exc_info=True)
         logger.debug("OUT View.on_close")
@@ -548,6 +609,139 @@ class View(customtkinter.CTk):
             logger.error(f"An error occurred in show: {e}", exc_info=True)
             raise
 
+    def show_busy(self, msg: str = "Please wait..."):
+        # nested jobs share the same popup
+        self.busy_count += 1
+        if self.busy_popup is not None:
+            return
+        try:
+            popup = customtkinter.CTkToplevel(self)
+            popup.title("Please wait")
+            popup.configure(fg_color='whitesmoke')
+            popup.protocol("WM_DELETE_WINDOW", lambda: None)  # cannot be closed while card is busy
+
+            popup_width = 300
+            popup_height = 100
+            position_right = int(self.winfo_screenwidth() / 2 - popup_width / 2)
+            position_down = int(self.winfo_screenheight() / 2 - popup_height / 2)
+            popup.geometry(f"{popup_width}x{popup_height}+{position_right}+{position_down}")
+
+            label = customtkinter.CTkLabel(popup, text=msg,
+                                           font=customtkinter.CTkFont(family="Outfit", size=14, weight="normal"))
+            label.pack(pady=(15, 10))
+            progress_bar = customtkinter.CTkProgressBar(popup, mode="indeterminate", width=200,
+                                                        progress_color=MAIN_MENU_COLOR)
+            progress_bar.pack(pady=5)
+            progress_bar.start()
+
+            # modal: no user action on the card while a job is running
+            popup.transient(self)
+            popup.wait_visibility()
+            popup.grab_set()
+            self.busy_popup = popup
+        except Exception as e:
+            logger.error(f"An error occurred in show_busy: {e}", exc_info=True)
+
+    def hide_busy(self):
+        self.busy_count = max(0, self.busy_count - 1)
+        if self.busy_count > 0 or self.busy_popup is None:
+            return
+        try:
+            self.busy_popup.grab_release()
+            self.busy_popup.destroy()
+        except Exception as e:
+            logger.error(f"An error occurred in hide_busy: {e}", exc_info=True)
+        self.busy_popup = None
+
+    def run_card_job(
+            self,
+            func: Callable,
+            *args,
+            on_success: Optional[Callable[[Any], None]] = None,
+            on_error: Optional[Callable[[Exception], None]] = None,
+            busy_msg: Optional[str] = "Please wait...",
+    ):
+        """Run func(*args) on the card worker thread and call back on the Tk thread.
+        A modal progress popup is shown while the job runs, unless busy_msg is None.
+        Without on_error, errors are reported in an error popup.
+
+        In multi-reader mode, the job runs on the worker of the selected reader and its progress is
+        shown in the reader status strip instead, so that other readers can be used meanwhile.
+        If another reader is selected before the job completes, the result is only shown in the strip."""
+        controller = self.controller
+        is_modal = busy_msg is not None and self.reader_manager is None
+        if is_modal:
+            self.show_busy(busy_msg)
+
+        def _on_success(result):
+            if is_modal:
+                self.hide_busy()
+            if self.reader_manager is not None:
+                self.update_reader_strip()
+                if controller is not self.controller:
+                    self.reader_manager.set_last_result(controller.reader, "OK")
+                    return
+            if on_success is not None:
+                on_success(result)
+
+        def _on_error(ex):
+            if is_modal:
+                self.hide_busy()
+            if self.reader_manager is not None:
+                self.update_reader_strip()
+                if controller is not self.controller:
+                    self.reader_manager.set_last_result(controller.reader, f"Error: {ex}")
+                    return
+            if on_error is not None:
+                on_error(ex)
+            else:
+                self.show("ERROR", f"Card operation failed!\n{ex}", "Ok", None,
+                          "./pictures_db/about_popup.jpg")
+
+        controller.worker.submit(func, *args, on_success=_on_success, on_error=_on_error)
+        self.update_reader_strip()
+
+    def error_popup(self, msg: str, icon_path: str) -> Callable[[Exception], None]:
+        """on_error callback for run_card_job(): invalid user input is shown as is, other errors after msg"""
+        def on_error(ex):
+            if isinstance(ex, InvalidInputError):
+                self.show("ERROR", str(ex), "Ok", None, icon_path)
+            else:
+                self.show("ERROR", f"{msg}\n{ex}", "Ok", None, icon_path)
+        return on_error
+
+    ##########################
+    """ CONTROLLER EVENTS """
+
+    def subscribe_controller_events(self, controller):
+        # events are published from the card worker thread, handle them on the Tk thread
+        controller.events.subscribe(
+            object, lambda event: controller.worker.post(self.on_controller_event, controller, event))
+
+    def on_controller_event(self, controller, event):
+        logger.debug(f"View.on_controller_event {event}")
+        if controller is not self.controller:
+            # multi-reader mode: the state of other readers is refreshed when they are selected
+            return
+        if isinstance(event, (SecretImported, SecretDeleted)):
+            # update secret_headers if it is already populated, with the status read after the change
+            # if not loaded, we will have to fetch it completely
+            store = self.secret_headers
+            if not store.is_loaded:
+                return
+            if isinstance(event, SecretImported):
+                is_synced = store.apply_imported(event.header, event.seedkeeper_status)
+            else:
+                is_synced = store.apply_deleted(event.sid, event.seedkeeper_status)
+            if not is_synced:
+                # card also changed behind our back
+                self.sync_secret_headers()
+            elif event.seedkeeper_status is not None:
+                self.cache_secret_headers(store, event.seedkeeper_status, event.generation)
+        elif isinstance(event, (CardSetupDone, SeedImported)):
+            # card state changed: refresh start screen and menu
+            self.update_status(True)
+
     #################
     """ MAIN MENU """
 
@@ -608,27 +802,26 @@ class View(customtkinter.CTk):
             elif self.appMode == ApplicationMode.SeedkeeperBackup:
                 logger.debug("View.update_status start (seedkeeper backup mode)")
                 # get card status (also cached in controller)
-                card_status = self.controller.get_card_status()
+                self.run_card_job(self.controller.get_card_status, busy_msg=None)
 
             else:
                 # normal mode
                 logger.info("View.update_status start (normal mode)")
                 if isConnected is True:
-                    # get card status (also cached in controller)
-                    card_status = self.controller.get_card_status()
-
-                    # show start screen
-                    if self.start_frame is not None:  # do not create frame now as it is not main thread
-                        self.show_start_frame()
+                    # get card snapshot (also cached in controller) then show start screen
+                    def on_card_snapshot(snapshot):
+                        if self.start_frame is not None:  # frame is created by the welcome screen
+                            self.show_start_frame()
 
+                    self.run_card_job(self.controller.fetch_card_snapshot, on_success=on_card_snapshot, busy_msg=None)
 
                 elif isConnected is False:
                     # update state
                     # Seedkeeper: reset secret_headers to force update on reconnection
-                    self.secret_headers = None
-                    self.seedkeeper_secret_headers_need_update = True
+                    # (headers are still cached in the controller for this card)
+                    self.reset_secret_headers()
 
-                    if self.start_frame is not None:  # do not create frame now as it is not main thread
+                    if self.start_frame is not None:  # frame is created by the welcome screen
                         self.show_start_frame()
                         self.show_nocard_menu()
 
@@ -638,13 +831,103 @@ class View(customtkinter.CTk):
         except Exception as e:
             logger.error(f"An unexpected error occurred in update_status method: {e}", exc_info=True)
 
+    ####################
+    """ MULTI-READER """
+
+    def update_reader_status(self, controller, isConnected=None):
+        """Multi-reader mode: card inserted or removed in the reader of the given controller"""
+        self.reader_manager.last_results.pop(controller.reader, None)
+        self.update_reader_strip()
+        if controller is self.controller:
+            self.update_status(isConnected)
+        elif isConnected is True:
+            # prefetch card infos, so that selecting this reader is instant
+            controller.worker.submit(controller.fetch_card_snapshot,
+                                     on_success=lambda snapshot: self.update_reader_strip(),
+                                     on_error=lambda ex: self.update_reader_strip())
+            self.update_reader_strip()
+
+    def update_reader_strip(self):
+        if self.reader_strip is None:
+            return
+        reader = self.controller.reader
+        index = self.reader_manager.readers.index(reader)
+        self.reader_label.configure(text=f"Reader #{index + 1}: {reader}")
+        self.reader_strip.update_frame()
+
+    def refresh_readers(self):
+        """Multi-reader mode: pick up readers plugged after startup"""
+        try:
+            new_readers = self.reader_manager.refresh_readers()
+            for reader in new_readers:
+                self.subscribe_controller_events(self.reader_manager.get_controller(reader))
+            if new_readers:
+                self.update_reader_strip()
+        except Exception as e:
+            logger.error(f"An error occurred in refresh_readers: {e}", exc_info=True)
+        self.after(READER_REFRESH_MS, self.refresh_readers)
+
+    def _get_secret_caches(self):
+        controllers = self.reader_manager.controllers.values() if self.reader_manager else [self.controller]
+        return [controller.secret_cache for controller in controllers if controller.secret_cache is not None]
+
+    def purge_secret_cache(self):
+        """--cache-secrets: remove expired secrets from memory, even if they are not requested again"""
+        try:
+            for secret_cache in self._get_secret_caches():
+                secret_cache.purge_expired()
+        except Exception as e:
+            logger.error(f"An error occurred in purge_secret_cache: {e}", exc_info=True)
+        self.after(SECRET_CACHE_PURGE_MS, self.purge_secret_cache)
+
+    def _clear_secret_cache_if_blurred(self):
+        # <FocusOut> is also received when the focus moves between widgets of the window
+        try:
+            focused = self.focus_get()
+        except KeyError:  # focus in a widget unknown to tkinter (e.g. menu of an option list)
+            return
+        if focused is None:
+            logger.debug("Window lost focus, clearing secret cache")
+            for secret_cache in self._get_secret_caches():
+                secret_cache.clear()
+
+    def select_reader(self, reader: str):
+        """Multi-reader mode: operations from the main window now target the card in this reader"""
+        logger.info(f"View.select_reader {reader}")
+        if self.appMode != ApplicationMode.Normal:
+            logger.warning(f"Cannot select another reader in mode {self.appMode}")
+            return
+        controller = self.reader_manager.get_controller(reader)
+        if controller is self.controller:
+            return
+        self.controller = controller
+        # Seedkeeper: secret headers belong to the previous card
+        self.reset_secret_headers()
+        self.update_reader_strip()
+        if self.start_frame is None:  # frame is created by the welcome screen
+            return
+        if controller.cc.card_present:
+            # cached in the session if the card was prefetched
+            self.run_card_job(controller.fetch_card_snapshot,
+                              on_success=lambda snapshot: self.show_start_frame(), busy_msg=None)
+        else:
+            self.show_start_frame()
+
     def update_verify_pin(self):  # todo: move in controller
         if self.controller.cc.card_type != "Satodime":
             if self.controller.cc.is_pin_set():
-                self.controller.cc.card_verify_PIN_simple()
+                self.controller.worker.run_sync(self.controller.verify_cached_pin)
             else:
                 self.controller.PIN_dialog(f'Enter the PIN of your {self.controller.cc.card_type}')
 
+    def ensure_pin(self) -> bool:
+        """Ask the PIN on the Tk thread if it is not cached yet, before submitting a card job that requires it.
+        Returns False if no PIN is available (dialog cancelled or wrong PIN)."""
+        if self.controller.cc.card_type == "Satodime" or self.controller.cc.is_pin_set():
+            return True
+        self.controller.PIN_dialog(f'Enter the PIN of your {self.controller.cc.card_type}')
+        return self.controller.cc.is_pin_set()
+
     def get_pin(self, msg):
         try:
             logger.info("View.get_pin start")
@@ -725,7 +1008,15 @@ class View(customtkinter.CTk):
     #############
     """ VIEWS """
 
+    def cancel_seed_derivations(self):
+        """Called when another frame is shown: drop the seeds derived ahead of an import by the mnemonic frames"""
+        for frame in (self.seed_import_frame, self.seedkeeper_generate_mnemonic_frame,
+                      self.seedkeeper_import_mnemonic_frame):
+            if frame is not None:
+                frame.mnemonic_feedback.cancel_seed()
+
     def show_start_frame(self):
+        self.cancel_seed_derivations()
         logger.info("IN View.show_start_frame() start")
         if self.start_frame is None:
             self.start_frame = FrameStart(self)
@@ -737,6 +1028,7 @@ class View(customtkinter.CTk):
         self.show_menu_frame()
 
     def show_setup_card_frame(self):
+        self.cancel_seed_derivations()
         if self.setup_card_frame is None:
             self.setup_card_frame = FrameCardSetupPin(self)
         self.setup_card_frame.tkraise()
@@ -747,25 +1039,32 @@ class View(customtkinter.CTk):
         self.seed_import_frame.tkraise()
 
     def show_change_pin_frame(self):
+        self.cancel_seed_derivations()
         if self.change_pin_frame is None:
             self.change_pin_frame = FrameCardChangePin(self)
         self.change_pin_frame.tkraise()
 
     def show_edit_label_frame(self):
+        self.cancel_seed_derivations()
         if self.edit_label_frame is None:
             self.edit_label_frame = FrameCardEditLabel(self)
         self.edit_label_frame.tkraise()
 
     def show_check_authenticity_frame(self):
-        # verify PIN
-        self.update_verify_pin()
+        self.cancel_seed_derivations()
+        # request PIN if needed, it is verified by the card job
+        if not self.ensure_pin():
+            return
 
         if self.authenticity_frame is None:
-            self.authenticity_frame = FrameCardAuthenticity(self)
+            self.authenticity_frame = FrameCardAuthenticity(self)  # also updates frame
+        else:
+            self.authenticity_frame.update_frame()
         self.authenticity_frame.place()
         self.authenticity_frame.tkraise()
 
     def show_factory_reset_frame(self):
+        self.cancel_seed_derivations()
         if self.factory_reset_frame is None:
             self.factory_reset_frame = FrameCardFactoryReset(self)
         self.factory_reset_frame.tkraise()
@@ -777,6 +1076,7 @@ class View(customtkinter.CTk):
         self.show_seedkeeper_backup_menu()
 
     def show_about_frame(self):
+        self.cancel_seed_derivations()
         logger.info("show_about_frame start")
         if self.about_frame is None:
             self.about_frame = FrameCardAbout(self)
@@ -788,72 +1088,166 @@ class View(customtkinter.CTk):
 
     # SEEDKEEPER MENU SELECTION
     def show_seedkeeper_list_secrets(self):
+        self.cancel_seed_derivations()
         try:
             logger.debug("show_view_my_secrets start")
 
-            if self.secret_headers is None:
-                # verify PIN
-                self.update_verify_pin()
-                # get list of secret headers
-                self.secret_headers = self.controller.cc.seedkeeper_list_secret_headers()
-                self.seedkeeper_secret_headers_need_update = True
-                logger.debug(f"Fetched {len(self.secret_headers)} headers from card")
-
-            if self.list_secrets_frame is None:
-                self.list_secrets_frame = FrameSeedkeeperListSecrets(self)
-            if self.seedkeeper_secret_headers_need_update is True:
-                self.list_secrets_frame.update_frame(self.secret_headers)
-            self.list_secrets_frame.tkraise()
+            if not self.secret_headers.is_loaded:
+                # request PIN if needed, it is verified by the card job
+                if not self.ensure_pin():
+                    return
+                if self.controller.header_disk_cache is not None:
+                    # show the copy saved on disk first, if any (--cache-headers)
+                    self.run_card_job(
+                        self.controller.load_saved_secret_headers,
+                        on_success=self._on_saved_secret_headers,
+                        on_error=self._on_list_secrets_error,
+                        busy_msg="Loading secrets...",
+                    )
+                else:
+                    self._list_secret_headers()
+            else:
+                self._show_seedkeeper_list_secrets_frame()
 
         except Exception as ex:
-            logger.error(f"Error in show_secrets: {ex}", exc_info=True)
-            self.show(
-                "ERROR",
-                f"Failed to list secrets!\n{ex}",
-                "Ok",
-                None,
-                "./pictures_db/about_popup.jpg"  # todo change icon
-            )
+            self._on_list_secrets_error(ex)
+
+    def _list_secret_headers(self):
+        # rows are appended as headers are received from the card
+        controller = self.controller
+        store = self.secret_headers
+        self._show_seedkeeper_list_secrets_frame()
+        self.list_secrets_frame.reset_filters()
+        self.list_secrets_frame.set_loading(0)
+
+        def on_header(header):
+            # card worker thread
+            controller.worker.post(on_streamed_header, header)
+
+        def on_streamed_header(header):
+            if self.controller is controller and self.secret_headers is store:
+                self.list_secrets_frame.append_rows([header])
+
+        def on_secret_headers(secret_headers):
+            # cached store if the same card was already listed, see Controller.list_secret_headers()
+            self.secret_headers = secret_headers
+            logger.debug(f"Fetched {len(self.secret_headers)} headers from card")
+            self.list_secrets_frame.set_loading(None)
+            self._show_seedkeeper_list_secrets_frame()
+
+        def on_error(ex):
+            self.list_secrets_frame.set_loading(None)
+            self._on_list_secrets_error(ex)
+
+        # get list of secret headers
+        self.run_card_job(
+            self.controller.list_secret_headers, on_header,
+            on_success=on_secret_headers,
+            on_error=on_error,
+            busy_msg=None,
+        )
+
+    def _on_saved_secret_headers(self, saved_headers):
+        if saved_headers is None:
+            self._list_secret_headers()
+            return
+        self.secret_headers = saved_headers
+        logger.debug(f"Loaded {len(saved_headers)} headers from disk")
+        self._show_seedkeeper_list_secrets_frame()
+
+        # check the copy against the card in the background
+        self.sync_secret_headers(on_error=self._on_list_secrets_error)
+
+    def sync_secret_headers(self, on_error=None):
+        """Bring secret_headers up to date with the card in the background, see Controller.sync_headers().
+        Only the rows that changed are rendered again."""
+        store = self.secret_headers
+
+        def on_sync(sync):
+            if self.secret_headers is not store:
+                return  # card removed meanwhile
+            if store.apply_sync(sync) and self.list_secrets_frame is not None:
+                self.list_secrets_frame.update_frame(store)
+            if sync.seedkeeper_status is not None:
+                self.cache_secret_headers(store, sync.seedkeeper_status, sync.generation)
+
+        def on_sync_error(ex):
+            logger.warning(f"Failed to sync secret headers: {ex}")
+
+        self.run_card_job(
+            self.controller.sync_headers, store,
+            on_success=on_sync,
+            on_error=on_error or on_sync_error,
+            busy_msg=None,
+        )
+
+    def cache_secret_headers(self, store, seedkeeper_status, generation):
+        # once store is up to date, see Controller.cache_secret_headers()
+        self.run_card_job(
+            self.controller.cache_secret_headers, store, store.to_list(), seedkeeper_status, generation,
+            on_error=lambda ex: logger.warning(f"Failed to cache secret headers: {ex}"),
+            busy_msg=None,
+        )
+
+    def reset_secret_headers(self):
+        # new store: the previous one may still be cached by the controller
+        self.secret_headers = SecretHeaderStore()
+
+    def _show_seedkeeper_list_secrets_frame(self):
+        if self.list_secrets_frame is None:
+            self.list_secrets_frame = FrameSeedkeeperListSecrets(self)
+        # rows are only rendered again if secret_headers changed
+        self.list_secrets_frame.update_frame(self.secret_headers)
+        self.list_secrets_frame.tkraise()
+
+    def _on_list_secrets_error(self, ex):
+        logger.error(f"Error in show_secrets: {ex}", exc_info=True)
+        self.show(
+            "ERROR",
+            f"Failed to list secrets!\n{ex}",
+            "Ok",
+            None,
+            "./pictures_db/about_popup.jpg"  # todo change icon
+        )
 
     def show_seedkeeper_secret(self, secret_header):
         logger.debug("show_view_secret start")
         # Managing export rights control
-        secret = {}
         if secret_header['export_rights'] == 0x02:
             logger.warning(f"Export_rights: Not allowed for secret with id {secret_header['id']}")
-            secret = secret_header
+            secret = dict(secret_header)  # the header is still held by the secret header store
             secret['secret'] = 'Export failed: export not allowed by SeedKeeper policy.'
+            self._show_seedkeeper_secret_frame(secret_header, secret)
         else:
             logger.debug(f"Export rights allowed for secret with id {secret_header['id']}")
-            try:
-                secret = self.controller.cc.seedkeeper_export_secret(secret_header['id'])
-            except Exception as ex:
-                secret = secret_header
+
+            # secret shown recently (--cache-secrets): no need to export it again
+            secret = self.controller.get_cached_secret(secret_header)
+            if secret is not None:
+                self._show_seedkeeper_secret_frame(secret_header, secret)
+                return
+
+            def on_export_error(ex):
+                secret = dict(secret_header)
                 secret['secret'] = f"Export failed: {str(ex)}"
+                self._show_seedkeeper_secret_frame(secret_header, secret)
 
-        # show secret according to type
-        if secret_header['type'] == TYPE_PASSWORD:
-            self.show_password_secret(secret)
-        elif secret_header['type'] == TYPE_MASTERSEED:
-            if secret['subtype'] == 0x00:
-                # masterseed only (no mnemonic provided)
-                self.show_simple_secret(secret)
-            else:
-                # masterseed-mnemonic (bip39)
-                self.show_mnemonic_secret(secret)
-        elif secret_header['type'] == TYPE_BIP39_MNEMONIC:
-            self.show_mnemonic_secret(secret)
-        elif secret_header['type'] == TYPE_ELECTRUM_MNEMONIC:
-            self.show_mnemonic_secret(secret)
-        elif (secret_header['type'] == TYPE_DESCRIPTOR or
-              secret_header['type'] == TYPE_DATA or
-              secret_header['type'] == TYPE_2FA_SECRET or
-              secret_header['type'] == TYPE_PUBKEY
-        ):
-            self.show_simple_secret(secret)
-        else:
-            # default for unsupported type is to show raw secret in hex
-            self.show_simple_secret(secret)
+            self.run_card_job(
+                self.controller.export_secret, secret_header['id'],
+                on_success=lambda secret: self._show_seedkeeper_secret_frame(secret_header, secret),
+                on_error=on_export_error,
+                busy_msg="Exporting secret from card...",
+            )
+
+    def _show_seedkeeper_secret_frame(self, secret_header, secret):
+        # show secret according to type and subtype (default for unsupported type is to show raw secret in hex)
+        secret_type = secretTypes.get_secret_type(secret_header['type'], secret_header['subtype'])
+        show_frames = {
+            secretTypes.FRAME_PASSWORD: self.show_password_secret,
+            secretTypes.FRAME_MNEMONIC: self.show_mnemonic_secret,
+            secretTypes.FRAME_SIMPLE: self.show_simple_secret,
+        }
+        show_frames[secret_type.frame](secret)
 
     def show_password_secret(self, secret):
         if self.seedkeeper_show_password_frame is None:
@@ -876,6 +1270,7 @@ class View(customtkinter.CTk):
     """ Generate Secret"""
 
     def show_generate_secret(self):
+        self.cancel_seed_derivations()
         if self.seedkeeper_generate_secret_frame is None:
             self.seedkeeper_generate_secret_frame = FrameSeedkeeperGenerateSecretSelectType(self)
         self.seedkeeper_generate_secret_frame.tkraise()
@@ -893,6 +1288,7 @@ class View(customtkinter.CTk):
     """ Import Secret"""
 
     def show_import_secret(self):
+        self.cancel_seed_derivations()
         if self.seedkeeper_import_secret_frame is None:
             self.seedkeeper_import_secret_frame = FrameSeedkeeperImportSecret(self)
         self.seedkeeper_import_secret_frame.tkraise()
@@ -919,7 +1315,32 @@ class View(customtkinter.CTk):
 
     """ BACKUP CARD"""
 
+    def delete_seedkeeper_secret(self, sid):
+        def on_secret_deleted(event):
+            self.show(
+                "SUCCESS",
+                f"Secret deleted successfully\nID: {sid}",
+                "Ok",
+                self.show_seedkeeper_list_secrets,
+                "./pictures_db/generate_popup.png"  # todo change icon
+            )
+
+        def on_delete_error(ex):
+            logger.error(f"failed to delete secret with sid {sid}: {str(ex)}")
+            msg = str(ex) if isinstance(ex, SecretNotFoundError) else f"Failed to delete secret with sid {sid}.\n{ex}"
+            self.show(
+                "ERROR",
+                msg,
+                "Ok",
+                self.show_seedkeeper_list_secrets,
+                "./pictures_db/generate_popup.png"  # todo change icon
+            )
+
+        self.run_card_job(self.controller.seedkeeper_reset_secret, sid,
+                          on_success=on_secret_deleted, on_error=on_delete_error, busy_msg="Deleting secret...")
+
     def show_backup_card(self):
+        self.cancel_seed_derivations()
         # set application mode to seedkeeper backup (avoid interruption on card insertion/removal)
         self.appMode = ApplicationMode.SeedkeeperBackup
         if self.seedkeeper_backup_card_frame is None:
@@ -941,13 +1362,22 @@ class View(customtkinter.CTk):
     """ CARD LOGS"""
 
     def show_card_logs(self):
+        self.cancel_seed_derivations()
 
-        # verify PIN
-        self.update_verify_pin()
-        # get logs from card
-        total_number_of_logs, total_number_available_logs, logs = self.controller.get_card_logs()
+        # request PIN if needed, it is verified by the card job
+        if not self.ensure_pin():
+            return
+
+        def get_card_logs():
+            self.controller.verify_cached_pin()
+            return self.controller.get_card_logs()
 
-        if self.seedkeeper_card_logs_frame is None:
-            self.seedkeeper_card_logs_frame = FrameSeedkeeperCardLogs(self)
-        self.seedkeeper_card_logs_frame.update_frame(logs)
-        self.seedkeeper_card_logs_frame.tkraise()
+        def on_card_logs(result):
+            total_number_of_logs, total_number_available_logs, logs = result
+            if self.seedkeeper_card_logs_frame is None:
+                self.seedkeeper_card_logs_frame = FrameSeedkeeperCardLogs(self)
+            self.seedkeeper_card_logs_frame.update_frame(logs)
+            self.seedkeeper_card_logs_frame.tkraise()
+
+        # get logs from card
+        self.run_card_job(get_card_logs, on_success=on_card_logs, busy_msg="Fetching logs from card...")
@@ -0,0 +1,760 @@
+import datetime
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.x509.oid import NameOID
+from pysatochip.CardConnector import CardConnector
+from pysatochip.CardDataParser import CardDataParser
+from pysatochip.JCconstants import SIZE_UNLOCK_COUNTER, SIZE_UNLOCK_SECRET
+
+from constants import TYPE_PUBKEY
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+# status words
+SW_OK = 0x9000
+SW_PIN_FAILED = 0x63C0
+SW_NO_MEMORY_LEFT = 0x9C01
+SW_OPERATION_NOT_ALLOWED = 0x9C03
+SW_SETUP_NOT_DONE = 0x9C04
+SW_UNAUTHORIZED = 0x9C06
+SW_SETUP_ALREADY_DONE = 0x9C07
+SW_OBJECT_NOT_FOUND = 0x9C08
+SW_IDENTITY_BLOCKED = 0x9C0C
+SW_INVALID_PARAMETER = 0x9C0F
+SW_INCORRECT_P1 = 0x9C10
+SW_INCORRECT_P2 = 0x9C11
+SW_SEQUENCE_END = 0x9C12
+SW_BIP32_UNINITIALIZED_SEED = 0x9C14
+SW_BIP32_INITIALIZED_SEED = 0x9C17
+SW_EXPORT_NOT_ALLOWED = 0x9C31
+SW_IMPORT_DATA_TOO_LONG = 0x9C32
+SW_WRONG_MAC = 0x9C33
+SW_FILE_NOT_FOUND = 0x6A82
+SW_INS_NOT_SUPPORTED = 0x6D00
+SW_RESET_TO_FACTORY = 0xFF00
+SW_RESET_ABORTED = 0xFFFF
+
+CURVE = ec.SECP256K1()
+# order of the secp256k1 group
+CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+
+def _sha256(*parts: bytes) -> bytes:
+    return hashlib.sha256(b"".join(parts)).digest()
+
+
+def _make_private_key(seed: Optional[bytes], name: str) -> ec.EllipticCurvePrivateKey:
+    """Random key, or key derived from seed so that benchmarks are reproducible"""
+    if seed is None:
+        return ec.generate_private_key(CURVE)
+    secret = int.from_bytes(_sha256(seed, name.encode('utf-8')), 'big') % (CURVE_ORDER - 1) + 1
+    return ec.derive_private_key(secret, CURVE)
+
+
+def _public_key_bytes(private_key: ec.EllipticCurvePrivateKey) -> bytes:
+    """Uncompressed public key (65 bytes)"""
+    return private_key.public_key().public_bytes(
+        serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint)
+
+
+def _u16(value: int) -> List[int]:
+    return [(value >> 8) & 0xFF, value & 0xFF]
+
+
+class VirtualCertificateAuthority:
+    """
+    Test PKI (root CA and sub-CA) used to certify the device keys of virtual cards.
+
+    The chain is generated in memory and is NOT part of the certificates shipped with pysatochip,
+    so virtual cards are reported as not authentic unless the chain is loaded explicitly,
+    e.g. with CertificateChains(cert_dir) after write_cert_dir(cert_dir).
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "VirtualCertificateAuthority":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = VirtualCertificateAuthority()
+            return cls._instance
+
+    def __init__(self, seed: Optional[bytes] = None):
+        self.ca_key = _make_private_key(seed, "ca")
+        self.ca_cert = self._make_certificate(
+            "Virtual card test CA", self.ca_key.public_key(), "Virtual card test CA", self.ca_key, is_ca=True)
+        self.subca_key = _make_private_key(seed, "subca")
+        self.subca_cert = self._make_certificate(
+            "Virtual card test sub-CA", self.subca_key.public_key(), "Virtual card test CA", self.ca_key, is_ca=True)
+
+    @staticmethod
+    def _make_certificate(subject_cn: str, public_key, issuer_cn: str, issuer_key, is_ca: bool) -> x509.Certificate:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        builder = (
+            x509.CertificateBuilder()
+            .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, subject_cn)]))
+            .issuer_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, issuer_cn)]))
+            .public_key(public_key)
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=3650))
+            .add_extension(x509.BasicConstraints(ca=is_ca, path_length=None), critical=True)
+        )
+        return builder.sign(issuer_key, hashes.SHA256())
+
+    def issue_device_certificate(self, uid_sha1: str, device_public_key) -> bytes:
+        """Device certificate (DER), subject CN is the card serial number as checked by the authenticity check"""
+        cert = self._make_certificate(uid_sha1, device_public_key, "Virtual card test sub-CA", self.subca_key, is_ca=False)
+        return cert.public_bytes(serialization.Encoding.DER)
+
+    @property
+    def ca_pem(self) -> str:
+        return self.ca_cert.public_bytes(serialization.Encoding.PEM).decode('ascii')
+
+    @property
+    def subca_pem(self) -> str:
+        return self.subca_cert.public_bytes(serialization.Encoding.PEM).decode('ascii')
+
+    def write_cert_dir(self, path: str):
+        """Write the chain with the same file names as pysatochip's cert folder"""
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "ca.cert"), 'w', encoding='utf-8') as f:
+            f.write(self.ca_pem)
+        for filename in ("subca-seedkeeper.cert", "subca-satochip.cert", "subca-satodime.cert"):
+            with open(os.path.join(path, filename), 'w', encoding='utf-8') as f:
+                f.write(self.subca_pem)
+
+
+class VirtualCard:
+    """
+    In-process simulation of a Satochip or SeedKeeper applet, at the APDU level.
+
+    Implements the subset of commands used by Satochip-Utils: applet selection, status, setup,
+    PIN verification/change/unblock, label, NFC policy, factory reset, authentikey, device certificate
+    and challenge-response, and for SeedKeeper the import/export/listing/reset of secrets and logs.
+    Secure channel is not supported (the card reports that it does not need one).
+
+    Each APDU takes latency + latency_per_byte * (command + response size) seconds, and secrets
+    are stored within memory_size bytes (header + secret), so that throughput benchmarks can model
+    a real card and reader deterministically.
+    """
+
+    APPLETS = {
+        "Satochip": (CardConnector.SATOCHIP_AID, (0, 12, 0, 5)),
+        "SeedKeeper": (CardConnector.SEEDKEEPER_AID, (0, 2, 0, 1)),
+    }
+    DEFAULT_PIN = list(b"Muscle00")
+    CHUNK_SIZE = 128
+    LOG_SIZE = 7
+    MAX_LOGS = 64
+    LOGS_PER_RESPONSE = 8
+    FACTORY_RESET_COUNTER = 4
+
+    def __init__(self, card_type: str = "SeedKeeper", latency: float = 0.0, latency_per_byte: float = 0.0,
+                 memory_size: int = 8192, max_secret_size: int = 4096, seed: Optional[bytes] = None,
+                 certificate_authority: Optional[VirtualCertificateAuthority] = None, loglevel=logging.DEBUG):
+        logger.setLevel(loglevel)
+        if card_type not in self.APPLETS:
+            raise ValueError(f"Unsupported virtual card type: {card_type}")
+        self.card_type = card_type
+        self.aid, self.version = self.APPLETS[card_type]
+        self.latency = latency
+        self.latency_per_byte = latency_per_byte
+        self.memory_size = memory_size
+        self.max_secret_size = max_secret_size
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.apdu_count = 0
+
+        # card identity
+        self.serial = _sha256(seed, b"serial")[:16] if seed is not None else os.urandom(16)
+        self.cplc = [0x9F, 0x7F, 0x2A] + list(self.serial) + 26 * [0x00]
+        self.iin = [0x42, 0x08] + list(self.serial[:8])
+        self.cin = [0x45, 0x08] + list(self.serial[8:])
+        self.uid_sha1 = hashlib.sha1(bytes(self.cplc + self.iin + self.cin)).hexdigest()
+        self.authentikey = _make_private_key(seed, "authentikey")
+        self.device_key = _make_private_key(seed, "device")
+        ca = certificate_authority or VirtualCertificateAuthority.get()
+        self.certificate = list(ca.issue_device_certificate(self.uid_sha1, self.device_key.public_key()))
+
+        self._handlers: Dict[int, Callable[[int, int, List[int]], Tuple[List[int], int]]] = {
+            0x3C: self._get_status,
+            0x2A: self._setup,
+            0x42: self._verify_pin,
+            0x44: self._change_pin,
+            0x46: self._unblock_pin,
+            0x60: self._logout_all,
+            0x3D: self._label,
+            0x3E: self._set_nfc_policy,
+            0x73: self._get_authentikey,
+            0x75: self._set_authentikey_pubkey,
+            0x93: self._export_certificate,
+            0x9A: self._challenge_response,
+            0xFF: self._reset_factory,
+        }
+        if card_type == "Satochip":
+            self._handlers[0x6C] = self._import_seed
+        else:
+            self._handlers.update({
+                0xA1: self._import_secret,
+                0xA2: self._export_secret,
+                0xA5: self._reset_secret,
+                0xA6: self._list_secret_headers,
+                0xA7: self._get_seedkeeper_status,
+                0xA9: self._print_logs,
+            })
+        self._factory_reset()
+
+    def _factory_reset(self):
+        self.setup_done = False
+        self.is_seeded = (self.card_type == "SeedKeeper")  # a SeedKeeper authentikey is always available
+        self.pin: Optional[List[int]] = None
+        self.puk: Optional[List[int]] = None
+        self.pin_tries_max = self.pin_tries = 0
+        self.puk_tries_max = self.puk_tries = 0
+        self.label: List[int] = []
+        self.nfc_policy = 0x00
+        self.secrets: Dict[int, Dict[str, Any]] = {}
+        self.next_id = 1
+        self.logs: List[List[int]] = []  # most recent first
+        self.nb_logs_total = 0
+        self.factory_reset_counter = self.FACTORY_RESET_COUNTER
+        self._reset_connection_state()
+
+    def _reset_connection_state(self):
+        """State lost when the card is removed from the reader"""
+        self.selected = False
+        self.logged_in = False
+        self.factory_reset_signal_sent = False
+        self.list_iterator: List[int] = []
+        self.log_iterator: List[List[int]] = []
+        self.pending_import: Optional[Dict[str, Any]] = None
+        self.pending_export: Optional[Dict[str, Any]] = None
+
+    ####################################################################################################################
+    """ CONNECTION (same interface as a pyscard connection) """
+
+    def transmit(self, apdu: List[int]) -> Tuple[List[int], int, int]:
+        with self.lock:
+            try:
+                response, sw = self._process(list(apdu))
+            except IndexError:
+                # malformed command data
+                response, sw = [], SW_INVALID_PARAMETER
+            self.apdu_count += 1
+        delay = self.latency + self.latency_per_byte * (len(apdu) + len(response) + 2)
+        if delay > 0:
+            time.sleep(delay)
+        return response, sw >> 8, sw & 0xFF
+
+    def getATR(self) -> List[int]:
+        return [0x3B, 0x8C, 0x80, 0x01] + list(self.serial[:8])
+
+    def connect(self):
+        with self.lock:
+            self._reset_connection_state()
+
+    def disconnect(self):
+        with self.lock:
+            self._reset_connection_state()
+
+    ####################################################################################################################
+    """ APDU DISPATCH """
+
+    PIN_NOT_REQUIRED = (0x3C, 0x2A, 0x42, 0x44, 0x46, 0x60, 0x93, 0x9A, 0xFF)
+
+    def _process(self, apdu: List[int]) -> Tuple[List[int], int]:
+        cla, ins, p1, p2 = apdu[0:4]
+        data = apdu[5:] if len(apdu) > 5 else []
+
+        # global platform commands, available without applet selection
+        if cla == 0x80 and ins == 0xCA:
+            return self._get_data(p1, p2)
+        if cla == 0x00 and ins == 0xA4:
+            self.selected = (data == self.aid)
+            self.logged_in = False
+            return [], (SW_OK if self.selected else SW_FILE_NOT_FOUND)
+        if not self.selected:
+            return [], SW_INS_NOT_SUPPORTED
+
+        handler = self._handlers.get(ins)
+        if handler is None:
+            return [], SW_INS_NOT_SUPPORTED
+        if not self.setup_done and ins not in (0x2A, 0x93, 0x9A, 0xFF):
+            return [], SW_SETUP_NOT_DONE
+        if ins not in self.PIN_NOT_REQUIRED and not self.logged_in:
+            return [], SW_UNAUTHORIZED
+        return handler(p1, p2, data)
+
+    def _get_data(self, p1: int, p2: int) -> Tuple[List[int], int]:
+        if (p1, p2) == (0x9F, 0x7F):
+            return list(self.cplc), SW_OK
+        if (p1, p2) == (0x00, 0x42):
+            return list(self.iin), SW_OK
+        if (p1, p2) == (0x00, 0x45):
+            return list(self.cin), SW_OK
+        return [], SW_FILE_NOT_FOUND
+
+    def _log(self, ins: int, id1: int, id2: int, sw: int):
+        if self.card_type != "SeedKeeper":
+            return
+        self.logs.insert(0, [ins] + _u16(id1) + _u16(id2) + _u16(sw))
+        del self.logs[self.MAX_LOGS:]
+        self.nb_logs_total += 1
+
+    ####################################################################################################################
+    """ GENERIC COMMANDS """
+
+    def _get_status(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        response = list(self.version)
+        response += [self.pin_tries, self.puk_tries, 0x00, 0x00]
+        response += [0x00, int(self.is_seeded), int(self.setup_done), 0x00, self.nfc_policy]
+        return response, SW_OK
+
+    def _setup(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if self.setup_done:
+            return [], SW_SETUP_ALREADY_DONE
+        offset = 0
+        size = data[offset]
+        if data[offset + 1:offset + 1 + size] != self.DEFAULT_PIN:
+            return [], SW_PIN_FAILED
+        offset += 1 + size
+        pin_tries, puk_tries = data[offset], data[offset + 1]
+        offset += 2
+        size = data[offset]
+        pin = data[offset + 1:offset + 1 + size]
+        offset += 1 + size
+        size = data[offset]
+        puk = data[offset + 1:offset + 1 + size]
+        if not pin or pin_tries == 0:
+            return [], SW_INVALID_PARAMETER
+        # PIN1 and memory sizes are ignored
+        self.pin, self.puk = pin, puk
+        self.pin_tries_max = self.pin_tries = pin_tries
+        self.puk_tries_max = self.puk_tries = puk_tries
+        self.setup_done = True
+        return [], SW_OK
+
+    def _check_pin(self, pin: List[int]) -> int:
+        if self.pin_tries == 0:
+            return SW_IDENTITY_BLOCKED
+        if hmac.compare_digest(bytes(pin), bytes(self.pin)):
+            self.pin_tries = self.pin_tries_max
+            self.logged_in = True
+            return SW_OK
+        self.pin_tries -= 1
+        self.logged_in = False
+        return SW_PIN_FAILED | self.pin_tries
+
+    def _verify_pin(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        sw = self._check_pin(data)
+        self._log(0x42, 0xFFFF, 0xFFFF, sw)
+        return [], sw
+
+    def _change_pin(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if p1 != 0:
+            return [], SW_INCORRECT_P1
+        old_size = data[0]
+        old_pin = data[1:1 + old_size]
+        new_size = data[1 + old_size]
+        new_pin = data[2 + old_size:2 + old_size + new_size]
+        sw = self._check_pin(old_pin)
+        if sw == SW_OK:
+            if not new_pin:
+                sw = SW_INVALID_PARAMETER
+            else:
+                self.pin = new_pin
+        self._log(0x44, 0xFFFF, 0xFFFF, sw)
+        return [], sw
+
+    def _unblock_pin(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if p1 != 0:
+            return [], SW_INCORRECT_P1
+        if self.puk_tries == 0:
+            return [], SW_IDENTITY_BLOCKED
+        if hmac.compare_digest(bytes(data), bytes(self.puk)):
+            self.puk_tries = self.puk_tries_max
+            self.pin_tries = self.pin_tries_max
+            sw = SW_OK
+        else:
+            self.puk_tries -= 1
+            sw = SW_PIN_FAILED | self.puk_tries
+            if self.puk_tries == 0 and self.card_type == "SeedKeeper":
+                # SeedKeeper v0.2 resets to factory when the PUK is blocked
+                self._factory_reset()
+                self.selected = True
+                return [], SW_RESET_TO_FACTORY
+        self._log(0x46, 0xFFFF, 0xFFFF, sw)
+        return [], sw
+
+    def _logout_all(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        self.logged_in = False
+        return [], SW_OK
+
+    def _label(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if p2 == 0x01:
+            return [len(self.label)] + self.label, SW_OK
+        if p2 == 0x00:
+            self.label = data[1:1 + data[0]]
+            return [], SW_OK
+        return [], SW_INCORRECT_P2
+
+    def _set_nfc_policy(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if p1 > 0x02:
+            return [], SW_INCORRECT_P1
+        self.nfc_policy = p1
+        return [], SW_OK
+
+    def _reset_factory(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        # the card must be removed from the reader between two reset signals
+        if self.factory_reset_signal_sent:
+            self.factory_reset_counter = self.FACTORY_RESET_COUNTER
+            return [], SW_RESET_ABORTED
+        self.factory_reset_signal_sent = True
+        self.factory_reset_counter -= 1
+        if self.factory_reset_counter > 0:
+            return [], 0xFF00 | self.factory_reset_counter
+        self._factory_reset()
+        return [], SW_RESET_TO_FACTORY
+
+    ####################################################################################################################
+    """ AUTHENTIKEY & PKI """
+
+    def _authentikey_response(self) -> List[int]:
+        # [coordx_size(2) | coordx | sig_size(2) | sig], self-signed
+        coordx = list(_public_key_bytes(self.authentikey)[1:33])
+        msg = _u16(len(coordx)) + coordx
+        sig = list(self.authentikey.sign(bytes(msg), ec.ECDSA(hashes.SHA256())))
+        return msg + _u16(len(sig)) + sig
+
+    def _get_authentikey(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if not self.is_seeded:
+            return [], SW_BIP32_UNINITIALIZED_SEED
+        return self._authentikey_response(), SW_OK
+
+    def _set_authentikey_pubkey(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        # the coordy computed by the host is not needed here
+        return [], SW_OK
+
+    def _export_certificate(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if p2 == 0x01:
+            return _u16(len(self.certificate)), SW_OK
+        if p2 == 0x02:
+            offset = (data[0] << 8) + data[1]
+            size = (data[2] << 8) + data[3]
+            return self.certificate[offset:offset + size], SW_OK
+        return [], SW_INCORRECT_P2
+
+    def _challenge_response(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if len(data) != 32:
+            return [], SW_INVALID_PARAMETER
+        challenge_from_device = list(os.urandom(32))
+        challenge = b"Challenge:" + bytes(challenge_from_device) + bytes(data)
+        sig = list(self.device_key.sign(challenge, ec.ECDSA(hashes.SHA256())))
+        return challenge_from_device + _u16(len(sig)) + sig, SW_OK
+
+    ####################################################################################################################
+    """ SATOCHIP """
+
+    def _import_seed(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if self.is_seeded:
+            return [], SW_BIP32_INITIALIZED_SEED
+        if p1 != len(data) or not 16 <= p1 <= 64:
+            return [], SW_INVALID_PARAMETER
+        self.is_seeded = True
+        return self._authentikey_response(), SW_OK
+
+    ####################################################################################################################
+    """ SEEDKEEPER """
+
+    @property
+    def used_memory(self) -> int:
+        return sum(self._secret_footprint(secret) for secret in self.secrets.values())
+
+    @staticmethod
+    def _secret_footprint(secret: Dict[str, Any]) -> int:
+        return 15 + len(secret['label']) + len(secret['secret'])
+
+    def _header(self, sid: int) -> List[int]:
+        secret = self.secrets[sid]
+        return (_u16(sid) + [secret['type'], secret['origin'], secret['export_rights'],
+                             secret['nb_plain'], secret['nb_secure'], 0x00]
+                + secret['fingerprint'] + [secret['subtype'], 0x00, len(secret['label'])] + secret['label'])
+
+    def _get_seedkeeper_status(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        last_log = self.logs[0] if self.logs else self.LOG_SIZE * [0x00]
+        response = _u16(len(self.secrets)) + _u16(self.memory_size)
+        response += _u16(max(0, self.memory_size - self.used_memory))
+        response += _u16(self.nb_logs_total) + _u16(len(self.logs)) + last_log
+        return response, SW_OK
+
+    def _list_secret_headers(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if p2 == 0x01:
+            self.list_iterator = sorted(self.secrets)
+        elif p2 != 0x02:
+            return [], SW_INCORRECT_P2
+        while self.list_iterator:
+            sid = self.list_iterator.pop(0)
+            if sid in self.secrets:
+                return self._header(sid), SW_OK
+        return [], SW_SEQUENCE_END
+
+    def _reset_secret(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        sid = (data[0] << 8) + data[1]
+        sw = SW_OK if self.secrets.pop(sid, None) is not None else SW_OBJECT_NOT_FOUND
+        self._log(0xA5, sid, 0xFFFF, sw)
+        return [], sw
+
+    def _print_logs(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if p2 == 0x01:
+            response = _u16(self.nb_logs_total) + _u16(len(self.logs))
+            if self.logs:
+                response += self.logs[0]
+            self.log_iterator = list(self.logs[1:])
+            return response, SW_OK
+        if p2 == 0x02:
+            chunk = self.log_iterator[:self.LOGS_PER_RESPONSE]
+            del self.log_iterator[:self.LOGS_PER_RESPONSE]
+            return [byte for log in chunk for byte in log], SW_OK
+        return [], SW_INCORRECT_P2
+
+    def _pairing_keys(self, sid_pubkey: int) -> Optional[Tuple[bytes, bytes]]:
+        """AES and HMAC keys shared with the card whose authentikey is stored in secret sid_pubkey"""
+        secret = self.secrets.get(sid_pubkey)
+        if secret is None or secret['type'] != TYPE_PUBKEY:
+            return None
+        pubkey_bytes = bytes(secret['secret'][1:1 + secret['secret'][0]])
+        try:
+            peer_pubkey = ec.EllipticCurvePublicKey.from_encoded_point(CURVE, pubkey_bytes)
+        except ValueError:
+            return None
+        shared_secret = self.authentikey.exchange(ec.ECDH(), peer_pubkey)
+        key = hmac.new(shared_secret, b"sc_key", hashlib.sha1).digest()[:16]
+        mac_key = hmac.new(shared_secret, b"sc_mac", hashlib.sha1).digest()
+        return key, mac_key
+
+    @staticmethod
+    def _mac(mac_key: bytes, secret_type: int, iv: List[int], ciphertext: List[int]) -> List[int]:
+        return list(hmac.new(mac_key, bytes([secret_type] + iv + ciphertext), hashlib.sha1).digest())
+
+    def _import_secret(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if p1 not in (0x01, 0x02):
+            return [], SW_INCORRECT_P1
+        is_secure = (p1 == 0x02)
+
+        # OP_INIT: header without id | (sid_pubkey(2) | iv(16)) | padded_size(2)
+        if p2 == 0x01:
+            self.pending_import = None
+            label_size = data[12]
+            header = data[0:13 + label_size]
+            offset = 13 + label_size
+            pending = {
+                'type': header[0], 'export_rights': header[2], 'subtype': header[10],
+                'label': header[13:], 'is_secure': is_secure, 'data': [],
+            }
+            if is_secure:
+                pending['sid_pubkey'] = (data[offset] << 8) + data[offset + 1]
+                pending['iv'] = data[offset + 2:offset + 18]
+                offset += 18
+            padded_size = (data[offset] << 8) + data[offset + 1]
+            if padded_size > self.max_secret_size or label_size > 127:
+                return [], SW_IMPORT_DATA_TOO_LONG
+            if self.used_memory + 15 + label_size + padded_size > self.memory_size:
+                self._log(0xA1, 0xFFFF, 0xFFFF, SW_NO_MEMORY_LEFT)
+                return [], SW_NO_MEMORY_LEFT
+            if is_secure and self._pairing_keys(pending['sid_pubkey']) is None:
+                return [], SW_INVALID_PARAMETER
+            self.pending_import = pending
+            return [], SW_OK
+
+        pending = self.pending_import
+        if pending is None or pending['is_secure'] != is_secure:
+            return [], SW_OPERATION_NOT_ALLOWED
+        # OP_PROCESS and OP_FINAL: chunk_size(2) | chunk | (hmac_size(1) | hmac)
+        chunk_size = (data[0] << 8) + data[1]
+        pending['data'] += data[2:2 + chunk_size]
+        if len(pending['data']) > self.max_secret_size:
+            self.pending_import = None
+            return [], SW_IMPORT_DATA_TOO_LONG
+        if p2 == 0x02:
+            return [], SW_OK
+        if p2 != 0x03:
+            return [], SW_INCORRECT_P2
+        self.pending_import = None
+
+        id2 = 0xFFFF
+        secret = pending['data']
+        if is_secure:
+            id2 = pending['sid_pubkey']
+            key, mac_key = self._pairing_keys(id2)
+            offset = 2 + chunk_size
+            mac = data[offset + 1:offset + 1 + data[offset]]
+            if not hmac.compare_digest(bytes(mac), bytes(self._mac(mac_key, pending['type'], pending['iv'], secret))):
+                self._log(0xA1, 0xFFFF, id2, SW_WRONG_MAC)
+                return [], SW_WRONG_MAC
+            decryptor = Cipher(algorithms.AES(key), modes.CBC(bytes(pending['iv']))).decryptor()
+            padded = decryptor.update(bytes(secret)) + decryptor.finalize()
+            secret = list(padded[:-padded[-1]])
+        if self.used_memory + 15 + len(pending['label']) + len(secret) > self.memory_size:
+            self._log(0xA1, 0xFFFF, id2, SW_NO_MEMORY_LEFT)
+            return [], SW_NO_MEMORY_LEFT
+
+        sid = self.next_id
+        self.next_id += 1
+        fingerprint = list(_sha256(bytes(secret))[:4])
+        self.secrets[sid] = {
+            'type': pending['type'], 'subtype': pending['subtype'], 'origin': 0x02 if is_secure else 0x01,
+            'export_rights': pending['export_rights'], 'nb_plain': 0, 'nb_secure': 0,
+            'fingerprint': fingerprint, 'label': pending['label'], 'secret': secret,
+        }
+        self._log(0xA1, sid, id2, SW_OK)
+        return _u16(sid) + fingerprint, SW_OK
+
+    def _export_secret(self, p1: int, p2: int, data: List[int]) -> Tuple[List[int], int]:
+        if p1 not in (0x01, 0x02):
+            return [], SW_INCORRECT_P1
+        is_secure = (p1 == 0x02)
+        sid = (data[0] << 8) + data[1]
+        sid_pubkey = ((data[2] << 8) + data[3]) if is_secure else 0xFFFF
+
+        # init: returns the header (| iv)
+        if p2 == 0x01:
+            self.pending_export = None
+            secret = self.secrets.get(sid)
+            if secret is None:
+                self._log(0xA2, sid, sid_pubkey, SW_OBJECT_NOT_FOUND)
+                return [], SW_OBJECT_NOT_FOUND
+            export_rights = secret['export_rights']
+            if export_rights == 0x00 or (not is_secure and export_rights != 0x01):
+                self._log(0xA2, sid, sid_pubkey, SW_EXPORT_NOT_ALLOWED)
+                return [], SW_EXPORT_NOT_ALLOWED
+            if is_secure:
+                keys = self._pairing_keys(sid_pubkey)
+                if keys is None:
+                    self._log(0xA2, sid, sid_pubkey, SW_INVALID_PARAMETER)
+                    return [], SW_INVALID_PARAMETER
+                key, mac_key = keys
+                iv = list(os.urandom(16))
+                pad_size = 16 - len(secret['secret']) % 16
+                encryptor = Cipher(algorithms.AES(key), modes.CBC(bytes(iv))).encryptor()
+                payload = list(encryptor.update(bytes(secret['secret'] + pad_size * [pad_size])) + encryptor.finalize())
+                sign = self._mac(mac_key, secret['type'], iv, payload)
+                secret['nb_secure'] = min(secret['nb_secure'] + 1, 0xFF)
+            else:
+                iv = []
+                payload = list(secret['secret'])
+                secret['nb_plain'] = min(secret['nb_plain'] + 1, 0xFF)
+            header = self._header(sid)
+            if not is_secure:
+                sign = list(self.authentikey.sign(bytes(header + payload), ec.ECDSA(hashes.SHA256())))
+            self.pending_export = {'sid': sid, 'payload': payload, 'offset': 0, 'sign': sign}
+            self._log(0xA2, sid, sid_pubkey, SW_OK)
+            return header + iv, SW_OK
+
+        # update: chunk_size(2) | chunk (| sign_size(2) | sign for the last chunk)
+        if p2 != 0x02:
+            return [], SW_INCORRECT_P2
+        pending = self.pending_export
+        if pending is None or pending['sid'] != sid:
+            return [], SW_OBJECT_NOT_FOUND
+        offset = pending['offset']
+        chunk = pending['payload'][offset:offset + self.CHUNK_SIZE]
+        pending['offset'] += len(chunk)
+        response = _u16(len(chunk)) + chunk
+        if pending['offset'] >= len(pending['payload']):
+            response += _u16(len(pending['sign'])) + pending['sign']
+            self.pending_export = None
+        return response, SW_OK
+
+
+class VirtualCardService:
+    """Stands for the pyscard card service, whose connection is the virtual card itself"""
+
+    def __init__(self, card: VirtualCard):
+        self.connection = card
+
+
+class VirtualCardConnector(CardConnector):
+    """
+    CardConnector bound to VirtualCard objects instead of a PC/SC reader.
+
+    All CardConnector methods work unchanged since they only use cardservice.connection.transmit().
+    Cards are inserted and removed explicitly with insert_card() and remove_card(), which notify
+    the client the same way as the pyscard card monitor.
+    """
+
+    def __init__(self, client=None, loglevel=logging.WARNING, card_filter=None):
+        # same state as CardConnector.__init__(), without reader monitoring
+        logger.setLevel(loglevel)
+        logging.getLogger(CardConnector.__module__).setLevel(loglevel)
+        self.logger = logger
+        self.parser = CardDataParser(loglevel)
+        self.client = client
+        if self.client is not None:
+            self.client.cc = self
+        self.needs_2FA = None
+        self.is_seeded = None
+        self.setup_done = None
+        self.needs_secure_channel = None
+        self.mode_factory_reset = False
+        self.sc = None
+        self.pin_nbr = None
+        self.pin = None
+        self.is_owner = False
+        self.unlock_secret = SIZE_UNLOCK_SECRET * [0x00]
+        self.unlock_counter = SIZE_UNLOCK_COUNTER * [0x00]
+        self.card_filter = card_filter
+        self.card_type = "card"
+        self.cert_pem = None
+        self.protocol_version = 0
+        self.nfc_policy = None
+        self.cardservice = None
+        self.card_present = False
+        self.card: Optional[VirtualCard] = None
+
+    def insert_card(self, card: VirtualCard):
+        """Same sequence as pysatochip's RemovalObserver on card insertion"""
+        if self.card_present:
+            self.remove_card()
+        logger.info(f"+Inserted virtual {card.card_type} {card.uid_sha1}")
+        self.card = card
+        self.card_present = True
+        self.cardservice = VirtualCardService(card)
+        card.connect()
+
+        response_cplc, sw1, sw2 = self.card_get_CPLC()
+        response_iin, sw1, sw2 = self.card_get_IIN()
+        response_cin, sw1, sw2 = self.card_get_CIN()
+        self.UID = response_cplc + response_iin + response_cin
+        self.UID_SHA1 = hashlib.sha1(bytes(self.UID)).hexdigest()
+
+        response, sw1, sw2 = self.card_select()
+        if sw1 != 0x90 or sw2 != 0x00:
+            self.card_disconnect()
+            return
+        if not self.mode_factory_reset:
+            response, sw1, sw2, status = self.card_get_status()
+            if (sw1 != 0x90 or sw2 != 0x00) and (sw1 != 0x9C or sw2 != 0x04):
+                self.card_disconnect()
+                return
+        if self.client is not None:
+            self.client.request('update_status', True)
+
+    def remove_card(self):
+        if not self.card_present:
+            return
+        logger.info(f"-Removed virtual card {self.UID_SHA1}")
+        self.card_disconnect()
+        self.card = None